@@ -285,13 +285,33 @@ def get_airnow_bounded_obs(
     # Read data into CSV
     df = pd.read_csv(url, names=names)
 
-    # Each line is a different time or site or variable so need to parse out
-    sites = df['site_name'].unique()
-    times = df['time'].unique()
-    variables = list(df['parameter'].unique()) + ['AQI', 'category', 'raw_concentration']
-    latitude = [list(df['latitude'].loc[df['site_name'] == s])[0] for s in sites]
-    longitude = [list(df['longitude'].loc[df['site_name'] == s])[0] for s in sites]
-    aqs_id = [list(df['aqs_id'].loc[df['site_name'] == s])[0] for s in sites]
+    return _bounded_obs_to_dataset(df)
+
+
+def _bounded_obs_to_dataset(df):
+    """
+    Converts the AirNow bounded observations DataFrame, where each line is a
+    different time or site or variable, into a Dataset with (time, sites)
+    variables. Uses the first line for each time, site and parameter. Lines
+    without a time or site name can not be placed and are dropped.
+
+    """
+    df = df[df['time'].notna() & df['site_name'].notna()].reset_index(drop=True)
+
+    # Codes for each line give the position of the time and site in the
+    # order they first appear
+    time_codes, times = pd.factorize(df['time'])
+    site_codes, sites = pd.factorize(df['site_name'])
+    parameters = list(df['parameter'].unique())
+    variables = parameters + ['AQI', 'category', 'raw_concentration']
+
+    first_site = ~pd.Series(site_codes).duplicated().values
+    latitude = np.empty(len(sites), dtype=df['latitude'].dtype)
+    latitude[site_codes[first_site]] = df['latitude'].values[first_site]
+    longitude = np.empty(len(sites), dtype=df['longitude'].dtype)
+    longitude[site_codes[first_site]] = df['longitude'].values[first_site]
+    aqs_id = np.empty(len(sites), dtype=df['aqs_id'].dtype)
+    aqs_id[site_codes[first_site]] = df['aqs_id'].values[first_site]
 
     # Set up the dataset ahead of time
     ds = xr.Dataset(
@@ -300,35 +320,37 @@ def get_airnow_bounded_obs(
             'longitude': (['sites'], longitude),
             'aqs_id': (['sites'], aqs_id),
         },
-        coords={'time': (['time'], times), 'sites': (['sites'], sites)},
+        coords={'time': (['time'], np.asarray(times)), 'sites': (['sites'], np.asarray(sites))},
+    )
+
+    codes = pd.DataFrame(
+        {'time': time_codes, 'site': site_codes, 'parameter': df['parameter'].values}
     )
 
-    # Set up emtpy data with nans
-    data = np.empty((len(variables), len(times), len(sites)))
-    data[:] = np.nan
-
-    # For each variable, pull out the data from specific sites and times
-    for v in range(len(variables)):
-        for t in range(len(times)):
-            for s in range(len(sites)):
-                if variables[v] in ['AQI', 'category', 'raw_concentration']:
-                    result = df.loc[(df['time'] == times[t]) & (df['site_name'] == sites[s])]
-                    if len(result[variables[v]]) > 0:
-                        data[v, t, s] = list(result[variables[v]])[0]
-                        atts = {'units': ''}
-                else:
-                    result = df.loc[
-                        (df['time'] == times[t])
-                        & (df['site_name'] == sites[s])
-                        & (df['parameter'] == variables[v])
-                    ]
-                    if len(result['concentration']) > 0:
-                        data[v, t, s] = list(result['concentration'])[0]
-                        atts = {'units': list(result['unit'])[0]}
-
-        # Add variables to the dataset
-        ds[variables[v]] = xr.DataArray(data=data[v, :, :], dims=['time', 'sites'], attrs=atts)
-
-    times = pd.to_datetime(times)
+    # AQI, category and raw concentration come from the first line for each
+    # time and site of any parameter
+    first = ~codes.duplicated(subset=['time', 'site']).values
+    for var_name in ['AQI', 'category', 'raw_concentration']:
+        data = np.full((len(times), len(sites)), np.nan)
+        data[time_codes[first], site_codes[first]] = df[var_name].values[first]
+        ds[var_name] = xr.DataArray(data=data, dims=['time', 'sites'], attrs={'units': ''})
+
+    # Concentrations come from the first line for each time, site and parameter
+    first = ~codes.duplicated(subset=['time', 'site', 'parameter']).values
+    atts = {}
+    for var_name in parameters:
+        index = np.where(first & (codes['parameter'].values == var_name))[0]
+        data = np.full((len(times), len(sites)), np.nan)
+        data[time_codes[index], site_codes[index]] = df['concentration'].values[index]
+        if index.size > 0:
+            # Units of the last time and site with data
+            last = index[np.lexsort((site_codes[index], time_codes[index]))[-1]]
+            atts = {'units': df['unit'].values[last]}
+        ds[var_name] = xr.DataArray(data=data, dims=['time', 'sites'], attrs=atts)
+
+    # Keep the original variable order
+    ds = ds[['latitude', 'longitude', 'aqs_id'] + variables]
+
+    times = pd.to_datetime(np.asarray(times))
     ds = ds.assign_coords({'time': times})
     return ds
@@ -5,6 +5,8 @@ Script for downloading data from ARM's Live Data Webservice
 
 import json
 import os
+import time as _time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 import requests
 import textwrap
@@ -16,8 +18,28 @@ except ImportError:
 
 from act.utils import date_parser
 
+# Base URL of the ARM Live Data Webservice
+ARM_LIVE_URL = 'https://adc.arm.gov/armlive/livedata/'
 
-def download_arm_data(username, token, datastream, startdate, enddate, time=None, output=None):
+HEADERS = {
+    'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/67.0.3396.99 Safari/537.36',
+}
+
+
+def download_arm_data(
+    username,
+    token,
+    datastream,
+    startdate,
+    enddate,
+    time=None,
+    output=None,
+    max_workers=1,
+    chunk_size=1024 * 1024,
+    overwrite=False,
+    return_report=False,
+    timeout=60,
+):
     """
     This tool will help users utilize the ARM Live Data Webservice to download
     ARM data.
@@ -47,11 +69,32 @@ def download_arm_data(username, token, datastream, startdate, enddate, time=None
         The output directory for the data. Set to None to make a folder in the
         current working directory with the same name as *datastream* to place
         the files in.
+    max_workers : int
+        Number of files to download concurrently. All workers share one
+        HTTP session so connections are reused between files.
+    chunk_size : int
+        Number of bytes to read from the response and write to disk at a
+        time. Files are streamed to disk and never held whole in memory.
+    overwrite : bool
+        If False, files already in the output directory with the same size
+        as the file on the server are not downloaded again, and partially
+        downloaded files are resumed. If True, all files are downloaded.
+    return_report : bool
+        If True, also return a dictionary keyed by file name with the
+        download status, number of bytes written and elapsed time in seconds
+        for each file. A file that fails to download has a status of
+        'failed' and the error message under 'error', and does not stop the
+        other downloads.
+    timeout : float
+        Number of seconds to wait for the server to respond or send more
+        data before the request fails.
 
     Returns
     -------
     files : list
         Returns list of files retrieved
+    report : dict
+        Per-file download report. Only returned if return_report is True.
 
     Notes
     -----
@@ -106,18 +149,14 @@ def download_arm_data(username, token, datastream, startdate, enddate, time=None
         end = end_datetime.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
         end = f'&end={end}'
     # build the url to query the web service using the arguments provided
-    query_url = (
-        'https://adc.arm.gov/armlive/livedata/query?' + 'user={0}&ds={1}{2}{3}&wt=json'
-    ).format(':'.join([username, token]), datastream, start, end)
-
-    headers = {
-        'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/67.0.3396.99 Safari/537.36',
-    }
+    query_url = (ARM_LIVE_URL + 'query?' + 'user={0}&ds={1}{2}{3}&wt=json').format(
+        ':'.join([username, token]), datastream, start, end
+    )
 
-    req = Request(query_url, None, headers)
+    req = Request(query_url, None, HEADERS)
     # get url response, read the body of the message,
     # and decode from bytes type to utf-8 string
-    response_body = urlopen(req).read().decode('utf-8')
+    response_body = urlopen(req, timeout=timeout).read().decode('utf-8')
     # if the response is an html doc, then there was an error with the user
     if response_body[1:14] == '!DOCTYPE html':
         raise ConnectionRefusedError('Error with user. Check username or token.')
@@ -137,34 +176,63 @@ def download_arm_data(username, token, datastream, startdate, enddate, time=None
     # not testing, response is successful and files were returned
     if response_body_json is None:
         print('ARM Data Live Webservice does not appear to be functioning')
+        if return_report:
+            return [], {}
         return []
 
     num_files = len(response_body_json['files'])
     file_names = []
+    report = {}
     if response_body_json['status'] == 'success' and num_files > 0:
-        for fname in response_body_json['files']:
-            if time is not None:
-                if time not in fname:
-                    continue
-            # construct link to web service saveData function
-            save_data_url = (
-                'https://adc.arm.gov/armlive/livedata/' + 'saveData?user={0}&file={1}'
-            ).format(':'.join([username, token]), fname)
-            req_save = Request(save_data_url, None, headers)
-            output_file = os.path.join(output_dir, fname)
-            # make directory if it doesn't exist
-            if not os.path.isdir(output_dir):
-                os.makedirs(output_dir)
-            # create file and write bytes to file
-            with open(output_file, 'wb') as open_bytes_file:
-                data = urlopen(req_save).read()
-                if 'This data file is not available' in str(data):
-                    print(fname + ' is not available for download')
-                    continue
-                else:
-                    print(f'[DOWNLOADING] {fname}')
-                    open_bytes_file.write(data)
-            file_names.append(output_file)
+        fnames = response_body_json['files']
+        if time is not None:
+            fnames = [fname for fname in fnames if time in fname]
+
+        # make directory if it doesn't exist
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir)
+
+        with requests.Session() as session:
+            session.headers.update(HEADERS)
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=max(max_workers, 1), pool_maxsize=max(max_workers, 1)
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+
+            def _download(fname):
+                # construct link to web service saveData function
+                save_data_url = (ARM_LIVE_URL + 'saveData?user={0}&file={1}').format(
+                    ':'.join([username, token]), fname
+                )
+                output_file = os.path.join(output_dir, fname)
+                return _download_file(
+                    session,
+                    save_data_url,
+                    output_file,
+                    chunk_size=chunk_size,
+                    overwrite=overwrite,
+                    timeout=timeout,
+                )
+
+            # map() keeps the results in the same order as the query
+            with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+                results = list(executor.map(_download, fnames))
+
+        for fname, result in zip(fnames, results):
+            report[fname] = result
+            if result['status'] == 'unavailable':
+                print(fname + ' is not available for download')
+                continue
+            if result['status'] == 'failed':
+                print(f'[FAILED] {fname}: {result["error"]}')
+                continue
+            if result['status'] == 'skipped':
+                print(f'[SKIPPING] {fname} already downloaded')
+            else:
+                print(f'[DOWNLOADING] {fname}')
+            file_names.append(os.path.join(output_dir, fname))
+
         # Get ARM DOI and print it out
         doi = get_arm_doi(
             datastream, start_datetime.strftime('%Y-%m-%d'), end_datetime.strftime('%Y-%m-%d')
@@ -177,9 +245,112 @@ def download_arm_data(username, token, datastream, startdate, enddate, time=None
             'No files returned or url status error.\n' 'Check datastream name, start, and end date.'
         )
 
+    if return_report:
+        return file_names, report
+
     return file_names
 
 
+def _download_file(session, url, output_file, chunk_size=1024 * 1024, overwrite=False, timeout=60):
+    """
+    Streams a single file from the ARM Live Data Webservice to disk.
+
+    Data is written to a temporary file with a .partial suffix and renamed
+    once the number of bytes written matches the size reported by the server.
+    An existing .partial file is resumed with an HTTP range request.
+
+    Parameters
+    ----------
+    session : requests.Session
+        Session used to make the request.
+    url : str
+        URL of the file to download.
+    output_file : str
+        Full path of the file to write.
+    chunk_size : int
+        Number of bytes to read and write at a time.
+    overwrite : bool
+        If True, ignore any existing complete or partial file.
+    timeout : float
+        Number of seconds to wait for the server to respond or send more data.
+
+    Returns
+    -------
+    result : dict
+        Dictionary with the download status ('downloaded', 'skipped',
+        'unavailable' or 'failed'), number of bytes written and elapsed time
+        in seconds. Failed downloads also include the error message. Data
+        already written to the .partial file is kept so the download can be
+        resumed.
+
+    """
+    start = _time.perf_counter()
+    partial_file = output_file + '.partial'
+    if overwrite:
+        for fname in [output_file, partial_file]:
+            if os.path.isfile(fname):
+                os.remove(fname)
+
+    existing_size = os.path.getsize(output_file) if os.path.isfile(output_file) else None
+    offset = os.path.getsize(partial_file) if os.path.isfile(partial_file) else 0
+
+    headers = {}
+    if existing_size is None and offset > 0:
+        headers['Range'] = f'bytes={offset}-'
+
+    nbytes = 0
+    status = 'downloaded'
+    try:
+        with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+            if response.status_code == 416:
+                # The partial file already holds the whole file
+                response.close()
+            else:
+                response.raise_for_status()
+                content_length = response.headers.get('Content-Length')
+                content_length = int(content_length) if content_length is not None else None
+
+                if existing_size is not None and existing_size == content_length:
+                    status = 'skipped'
+                else:
+                    if response.status_code != 206:
+                        # Server ignored the range request so start from the beginning
+                        offset = 0
+                    expected_size = None
+                    if content_length is not None:
+                        expected_size = offset + content_length
+
+                    chunks = response.iter_content(chunk_size=chunk_size)
+                    first_chunk = next(chunks, b'')
+                    if offset == 0 and b'This data file is not available' in first_chunk:
+                        status = 'unavailable'
+                    else:
+                        with open(partial_file, 'ab' if offset > 0 else 'wb') as open_bytes_file:
+                            open_bytes_file.write(first_chunk)
+                            nbytes += len(first_chunk)
+                            for chunk in chunks:
+                                open_bytes_file.write(chunk)
+                                nbytes += len(chunk)
+
+                        if expected_size is not None and offset + nbytes != expected_size:
+                            raise OSError(
+                                f'Incomplete download of {os.path.basename(output_file)}: '
+                                f'expected {expected_size} bytes, received {offset + nbytes}'
+                            )
+
+        if status == 'downloaded':
+            os.replace(partial_file, output_file)
+    except (requests.exceptions.RequestException, OSError) as error:
+        return {
+            'status': 'failed',
+            'bytes': nbytes,
+            'time': _time.perf_counter() - start,
+            'error': str(error),
+        }
+
+    return {'status': status, 'bytes': nbytes, 'time': _time.perf_counter() - start}
+
+
 def get_arm_doi(datastream, startdate, enddate):
     """
     This function will return a citation with DOI, if available, for specified
@@ -200,9 +371,7 @@ def get_arm_doi(datastream, startdate, enddate):
         Returns the citation as a string
 
     """
-    headers = {
-        'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/67.0.3396.99 Safari/537.36',
-    }
+    headers = HEADERS
     # Get the DOI information
     doi_url = (
         'https://adc.arm.gov/citationservice/citation/datastream?id='
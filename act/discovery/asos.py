@@ -3,22 +3,37 @@ Script for downloading ASOS data from the Iowa Mesonet API
 
 """
 
+import io
 import json
+import os
 import time
 import warnings
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
-from io import StringIO
+import requests
 
-try:
-    from urllib.request import urlopen
-except ImportError:
-    from urllib2 import urlopen
+# Iowa Mesonet ASOS data request service and network GeoJSON URLs
+ASOS_SERVICE_URL = 'http://mesonet.agron.iastate.edu/cgi-bin/request/asos.py?'
+ASOS_NETWORK_URL = 'https://mesonet.agron.iastate.edu/geojson/network/'
 
+# Number of attempts for each request and the initial wait in seconds
+# between attempts, doubled after each failed attempt
+_DOWNLOAD_ATTEMPTS = 6
+_DOWNLOAD_BACKOFF = 1.0
 
-def get_asos_data(time_window, lat_range=None, lon_range=None, station=None, regions=None):
+
+def get_asos_data(
+    time_window,
+    lat_range=None,
+    lon_range=None,
+    station=None,
+    regions=None,
+    max_workers=1,
+    cache_dir=None,
+    cache_max_age=86400,
+):
     """
     Returns all of the station observations from the Iowa Mesonet from either
     a given latitude and longitude window or a given station code.
@@ -37,6 +52,15 @@ def get_asos_data(time_window, lat_range=None, lon_range=None, station=None, reg
     regions: str
         Region that the ASOS is in.  For Alabama, it would be AL
         For more than one region add it to the string with spaces between 'AL MN'
+    max_workers: int
+        Number of threads used to download the network metadata and station
+        data at the same time over a shared HTTP session.
+    cache_dir: str or None
+        Directory to cache the network station metadata in. If None the
+        metadata are downloaded on every call.
+    cache_max_age: int
+        Maximum age in seconds of cached network station metadata before it
+        is downloaded again.
 
     Returns
     -------
@@ -87,80 +111,86 @@ def get_asos_data(time_window, lat_range=None, lon_range=None, station=None, reg
 
     networks = ['AWOS']
     metadata_list = {}
-    if lat_range is not None and lon_range is not None:
-        lon_min, lon_max = lon_range
-        lat_min, lat_max = lat_range
-        for region in regions.split():
-            networks.append(f'{region}_ASOS')
-
-        site_list = []
-        for network in networks:
-            # Get metadata
-            uri = ('https://mesonet.agron.iastate.edu/' 'geojson/network/%s.geojson') % (network,)
-            data = urlopen(uri)
-            jdict = json.load(data)
-            for site in jdict['features']:
-                lat = site['geometry']['coordinates'][1]
-                lon = site['geometry']['coordinates'][0]
-                if lat >= lat_min and lat <= lat_max:
-                    if lon >= lon_min and lon <= lon_max:
-                        station_metadata_dict = {}
-                        station_metadata_dict['site_latitude'] = lat
-                        station_metadata_dict['site_longitude'] = lat
-                        for my_keys in site['properties']:
-                            station_metadata_dict[my_keys] = site['properties'][my_keys]
-                        metadata_list[site['properties']['sid']] = station_metadata_dict
-                        site_list.append(site['properties']['sid'])
-    elif station is not None:
-        site_list = [station]
-        for region in regions.split():
-            networks.append(f'{region}_ASOS')
-        for network in networks:
-            # Get metadata
-            uri = ('https://mesonet.agron.iastate.edu/' 'geojson/network/%s.geojson') % (network,)
-            data = urlopen(uri)
-            jdict = json.load(data)
-            for site in jdict['features']:
-                lat = site['geometry']['coordinates'][1]
-                lon = site['geometry']['coordinates'][0]
-                if site['properties']['sid'] == station:
-                    station_metadata_dict = {}
-                    station_metadata_dict['site_latitude'] = lat
-                    station_metadata_dict['site_longitude'] = lon
-                    for my_keys in site['properties']:
-                        if my_keys == 'elevation':
-                            station_metadata_dict['elevation'] = (
-                                '%f meter' % site['properties'][my_keys]
-                            )
-                        else:
-                            station_metadata_dict[my_keys] = site['properties'][my_keys]
-                    metadata_list[station] = station_metadata_dict
-
-        # Get station metadata
-    else:
+    if (lat_range is None or lon_range is None) and station is None:
         raise ValueError('Either both lat_range and lon_range or station must ' + 'be specified!')
 
+    for region in regions.split():
+        networks.append(f'{region}_ASOS')
+
     # Get the timestamp for each request
     start_time = time_window[0]
     end_time = time_window[1]
 
-    SERVICE = 'http://mesonet.agron.iastate.edu/cgi-bin/request/asos.py?'
-    service = SERVICE + 'data=all&tz=Etc/UTC&format=comma&latlon=yes&'
-
+    service = ASOS_SERVICE_URL + 'data=all&tz=Etc/UTC&format=comma&latlon=yes&'
     service += start_time.strftime('year1=%Y&month1=%m&day1=%d&hour1=%H&minute1=%M&')
     service += end_time.strftime('year2=%Y&month2=%m&day2=%d&hour2=%H&minute2=%M')
-    asos_ds = {}
-    for stations in site_list:
-        uri = f'{service}&station={stations}'
-        print(f'Downloading: {stations}')
-        data = _download_data(uri)
-        buf = StringIO()
-        buf.write(data)
-        buf.seek(0)
 
-        my_df = pd.read_csv(buf, skiprows=5, na_values='M')
+    with requests.Session() as session, ThreadPoolExecutor(
+        max_workers=max(max_workers, 1)
+    ) as executor:
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=max(max_workers, 1), pool_maxsize=max(max_workers, 1)
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        # First query the database for all of the JSON info for every station
+        network_info = executor.map(
+            lambda network: _get_network_metadata(session, network, cache_dir, cache_max_age),
+            networks,
+        )
+
+        if lat_range is not None and lon_range is not None:
+            # Only add stations whose lat/lon are within the Grid's boundaries
+            lon_min, lon_max = lon_range
+            lat_min, lat_max = lat_range
+            site_list = []
+            for jdict in network_info:
+                for site in jdict['features']:
+                    lat = site['geometry']['coordinates'][1]
+                    lon = site['geometry']['coordinates'][0]
+                    if lat >= lat_min and lat <= lat_max:
+                        if lon >= lon_min and lon <= lon_max:
+                            station_metadata_dict = {}
+                            station_metadata_dict['site_latitude'] = lat
+                            station_metadata_dict['site_longitude'] = lat
+                            for my_keys in site['properties']:
+                                station_metadata_dict[my_keys] = site['properties'][my_keys]
+                            metadata_list[site['properties']['sid']] = station_metadata_dict
+                            site_list.append(site['properties']['sid'])
+        else:
+            site_list = [station]
+            for jdict in network_info:
+                for site in jdict['features']:
+                    lat = site['geometry']['coordinates'][1]
+                    lon = site['geometry']['coordinates'][0]
+                    if site['properties']['sid'] == station:
+                        station_metadata_dict = {}
+                        station_metadata_dict['site_latitude'] = lat
+                        station_metadata_dict['site_longitude'] = lon
+                        for my_keys in site['properties']:
+                            if my_keys == 'elevation':
+                                station_metadata_dict['elevation'] = (
+                                    '%f meter' % site['properties'][my_keys]
+                                )
+                            else:
+                                station_metadata_dict[my_keys] = site['properties'][my_keys]
+                        metadata_list[station] = station_metadata_dict
+
+        # A station can be in more than one network so only download it once
+        site_list = list(dict.fromkeys(site_list))
+
+        def _get_station(stations):
+            print(f'Downloading: {stations}')
+            return _download_data(session, f'{service}&station={stations}')
 
-        if len(my_df['lat'].values) == 0:
+        station_data = list(executor.map(_get_station, site_list))
+
+    asos_ds = {}
+    for stations, my_df in zip(site_list, station_data):
+        if my_df is None:
+            warnings.warn(f'Exhausted attempts to download station {stations}')
+        elif len(my_df['lat'].values) == 0:
             warnings.warn(
                 'No data available at station %s between time %s and %s'
                 % (
@@ -170,11 +200,7 @@ def get_asos_data(time_window, lat_range=None, lon_range=None, station=None, reg
                 )
             )
         else:
-
-            def to_datetime(x):
-                return datetime.strptime(x, '%Y-%m-%d %H:%M')
-
-            my_df['time'] = my_df['valid'].apply(to_datetime)
+            my_df['time'] = pd.to_datetime(my_df['valid'], format='%Y-%m-%d %H:%M')
             my_df = my_df.set_index('time')
             my_df = my_df.drop('valid', axis=1)
             my_df = my_df.drop('station', axis=1)
@@ -267,23 +293,64 @@ def get_asos_data(time_window, lat_range=None, lon_range=None, station=None, reg
             my_df['v_peak'].attrs['long_name'] = 'Meridional component of surface wind'
             my_df['metar'].attrs['long_name'] = 'Raw METAR code'
             my_df.attrs['_datastream'] = stations
-            buf.close()
 
             asos_ds[stations] = my_df
     return asos_ds
 
 
-def _download_data(uri):
-    attempt = 0
-    while attempt < 6:
+def _download_data(session, uri):
+    """
+    Downloads the data for one station, streaming the response into
+    pandas.read_csv(). Failed requests and error responses are retried with an
+    increasing wait. Returns None if all attempts fail.
+
+    """
+    for attempt in range(_DOWNLOAD_ATTEMPTS):
         try:
-            data = urlopen(uri, timeout=300).read().decode('utf-8')
-            if data is not None and not data.startswith('ERROR'):
-                return data
+            with session.get(uri, stream=True, timeout=300) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                # Keep the raw response open after the last byte is read so the
+                # buffered reader can still return the data it holds.
+                response.raw.auto_close = False
+                stream = io.BufferedReader(response.raw)
+                if stream.peek(5)[:5] == b'ERROR':
+                    raise ValueError(stream.read().decode('utf-8').strip())
+                return pd.read_csv(stream, skiprows=5, na_values='M')
         except Exception as exp:
             print(f'download_data({uri}) failed with {exp}')
-            time.sleep(5)
-        attempt += 1
+            if attempt < _DOWNLOAD_ATTEMPTS - 1:
+                time.sleep(_DOWNLOAD_BACKOFF * 2**attempt)
+
+    return None
+
+
+def _get_network_metadata(session, network, cache_dir=None, cache_max_age=86400):
+    """
+    Returns the GeoJSON station metadata dictionary for an ASOS network, using
+    the copy cached in cache_dir if it is newer than cache_max_age seconds.
+
+    """
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = os.path.join(cache_dir, f'{network}.geojson')
+        if (
+            os.path.isfile(cache_file)
+            and time.time() - os.path.getmtime(cache_file) < cache_max_age
+        ):
+            with open(cache_file) as fh:
+                return json.load(fh)
+
+    response = session.get(f'{ASOS_NETWORK_URL}{network}.geojson', timeout=300)
+    response.raise_for_status()
+    jdict = response.json()
+
+    if cache_file is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so other processes never read a partial file
+        temp_file = f'{cache_file}.{os.getpid()}.tmp'
+        with open(temp_file, 'w') as fh:
+            json.dump(jdict, fh)
+        os.replace(temp_file, cache_file)
 
-    print('Exhausted attempts to download, returning empty data')
-    return ''
+    return jdict
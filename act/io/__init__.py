@@ -24,6 +24,7 @@ __getattr__, __dir__, __all__ = lazy.attach(
             'WriteDataset',
             'check_arm_standards',
             'create_ds_from_arm_dod',
+            'get_file_info',
             'read_arm_netcdf',
             'check_if_tar_gz_file',
             'read_arm_mmcr',
@@ -7,15 +7,19 @@ Office of Science.
 import copy
 import glob
 import json
+import os
 import re
 import tarfile
 import tempfile
 import urllib
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from itertools import repeat
 from os import PathLike
 from pathlib import Path, PosixPath
 
+import dask.array
 import numpy as np
 import xarray as xr
 from cftime import num2date
@@ -26,6 +30,9 @@ import act.utils as utils
 from act.config import DEFAULT_DATASTREAM_NAME
 from act.utils.io_utils import cleanup_files, is_gunzip_file, unpack_gzip, unpack_tar
 
+# Regular expression to split ARM standard file names into parts
+ARM_FILENAME_REGEX = r'(^[a-zA-Z0-9]+)\.([0-9a-z]{2})\.([\d]{8})\.([\d]{6})\.([a-z]{2,3}$)'
+
 
 def read_arm_netcdf(
     filenames,
@@ -38,6 +45,11 @@ def read_arm_netcdf(
     combine_attrs='override',
     cleanup_qc=False,
     keep_variables=None,
+    lazy=False,
+    start_time=None,
+    end_time=None,
+    max_workers=None,
+    index_file=None,
     **kwargs,
 ):
     """
@@ -84,6 +96,31 @@ def read_arm_netcdf(
         to exclude from reading and passing into open_mfdataset() via drop_variables keyword.
         Still allows use of drop_variables keyword for variables not listed in first file to
         read.
+    lazy : boolean
+        Option to keep all data variables as dask arrays and not load any data into memory
+        while reading, including when converting cftime values to datetime64. Data are chunked
+        along time using the chunks keyword passed to xarray.open_mfdataset(), defaulting
+        to {'time': 'auto'}. Header information for each file is cached, see
+        get_file_info(), so reading the same files again does not require parsing the
+        netCDF headers to determine variable names or file times.
+    start_time : str, datetime.datetime, numpy.datetime64 or None
+        Only read data at or after this time. Files are selected using the time in
+        ARM standard file names, or the cached first and last time of the file from
+        get_file_info() for other file names, before any file is opened. The returned
+        Dataset is then subset to the requested time range.
+    end_time : str, datetime.datetime, numpy.datetime64 or None
+        Only read data at or before this time. See start_time.
+    max_workers : int or None
+        Number of worker processes used to open the files. If set, each file is opened,
+        has variables not in keep_variables removed, the preprocess function applied and
+        time values converted in a separate process, and the loaded results are
+        combined in the same order as xarray.open_mfdataset() would produce. Data are
+        loaded into memory so this can not be used with lazy, and preprocess needs to be
+        a function that can be pickled. If None, files are opened with
+        xarray.open_mfdataset() in this process.
+    index_file : str, pathlib.Path or None
+        Name of the JSON index file passed to get_file_info() to keep the cached header
+        information between sessions. If None, the information is only cached in memory.
     **kwargs : keywords
         Keywords to pass through to xarray.open_mfdataset().
 
@@ -104,8 +141,15 @@ def read_arm_netcdf(
 
     """
 
+    if lazy and max_workers is not None:
+        raise ValueError('The lazy and max_workers keywords can not be used together.')
+
     ds = None
     filenames, cleanup_temp_directory = check_if_tar_gz_file(filenames)
+    cleanup_filenames = filenames
+
+    if start_time is not None or end_time is not None:
+        filenames = _subset_files_by_time(filenames, start_time, end_time, index_file)
 
     file_dates = []
     file_times = []
@@ -127,6 +171,8 @@ def read_arm_netcdf(
     kwargs['decode_times'] = decode_times
     if len(filenames) > 1 and not isinstance(filenames, str):
         kwargs['combine_attrs'] = combine_attrs
+    if lazy and kwargs.get('chunks') is None:
+        kwargs['chunks'] = {'time': 'auto'}
 
     # Check if keep_variables is set. If so determine correct drop_variables
     if keep_variables is not None:
@@ -134,7 +180,11 @@ def read_arm_netcdf(
         if 'drop_variables' in kwargs.keys():
             drop_variables = kwargs['drop_variables']
         kwargs['drop_variables'] = keep_variables_to_drop_variables(
-            filenames, keep_variables, drop_variables=drop_variables
+            filenames,
+            keep_variables,
+            drop_variables=drop_variables,
+            use_index=lazy,
+            index_file=index_file,
         )
 
     # Create an exception tuple to use with try statements. Doing it this way
@@ -146,7 +196,7 @@ def read_arm_netcdf(
 
     try:
         # Read data file with Xarray function
-        ds = xr.open_mfdataset(filenames, **kwargs)
+        ds = _open_mfdataset(filenames, max_workers=max_workers, **kwargs)
 
     except except_tuple as exception:
         # If requested return None for File not found error
@@ -167,7 +217,7 @@ def read_arm_netcdf(
             'to use to order the datasets for concatenation'
         ):
             kwargs['combine'] = 'nested'
-            ds = xr.open_mfdataset(filenames, **kwargs)
+            ds = _open_mfdataset(filenames, max_workers=max_workers, **kwargs)
 
         else:
             # When all else fails raise the orginal exception
@@ -198,31 +248,7 @@ def read_arm_netcdf(
     # To ensure the times are read in correctly need to set use_cftime=True.
     # This will read in time as cftime object. But Xarray uses numpy datetime64
     # natively. This will convert the cftime time values to numpy datetime64.
-    desired_time_precision = 'datetime64[ns]'
-    for var_name in ['time', 'time_offset']:
-        try:
-            if 'time' in ds.dims and type(ds[var_name].values[0]).__module__.startswith('cftime.'):
-                # If we just convert time to datetime64 the group, sel, and other Xarray
-                # methods will not work correctly because time is not indexed. Need to
-                # use the formation of a Dataset to correctly set the time indexing.
-                temp_ds = xr.Dataset(
-                    {
-                        var_name: (
-                            ds[var_name].dims,
-                            ds[var_name].values.astype(desired_time_precision),
-                            ds[var_name].attrs,
-                        )
-                    }
-                )
-                ds[var_name] = temp_ds[var_name]
-                del temp_ds
-
-                # If time_offset is in file try to convert base_time as well
-                if var_name == 'time_offset':
-                    ds['base_time'].values = ds['base_time'].values.astype(desired_time_precision)
-                    ds['base_time'] = ds['base_time'].astype(desired_time_precision)
-        except KeyError:
-            pass
+    _convert_cftime_variables(ds)
 
     # Check if "time" variable is not in the netCDF file. If so try to use
     # base_time and time_offset to make time variable. Basically a fix for incorrectly
@@ -242,13 +268,20 @@ def read_arm_netcdf(
     # Get file dates and times that were read in to the dataset
     filenames.sort()
     for f in filenames:
-        f = Path(f).name
-        pts = re.match(r'(^[a-zA-Z0-9]+)\.([0-9a-z]{2})\.([\d]{8})\.([\d]{6})\.([a-z]{2,3}$)', f)
+        pts = re.match(ARM_FILENAME_REGEX, Path(f).name)
+        time_range = None
+        if pts is None and lazy:
+            time_range = get_file_info(f, index_file=index_file)['time_range']
+
         # If Not ARM format, read in first time for info
         if pts is not None:
             pts = pts.groups()
             file_dates.append(pts[2])
             file_times.append(pts[3])
+        elif time_range is not None:
+            dummy = np.datetime64(time_range[0])
+            file_dates.append(utils.numpy_to_arm_date(dummy))
+            file_times.append(utils.numpy_to_arm_date(dummy, returnTime=True))
         else:
             if len(ds['time'].shape) > 0:
                 dummy = ds['time'].values[0]
@@ -271,16 +304,206 @@ def read_arm_netcdf(
 
     ds.attrs['_arm_standards_flag'] = is_arm_file_flag
 
+    # Subset to requested time range. Files were already selected by time so this
+    # only trims the first and last file.
+    if (start_time is not None or end_time is not None) and 'time' in ds.dims:
+        ds = ds.sel(time=slice(start_time, end_time))
+
     if cleanup_qc:
         ds.clean.cleanup()
 
     if cleanup_temp_directory:
-        cleanup_files(files=filenames)
+        cleanup_files(files=cleanup_filenames)
 
     return ds
 
 
-def keep_variables_to_drop_variables(filenames, keep_variables, drop_variables=None):
+# Keywords used by xarray.open_mfdataset() that are not passed to xarray.open_dataset()
+_MFDATASET_KEYWORDS = [
+    'combine',
+    'concat_dim',
+    'combine_attrs',
+    'compat',
+    'preprocess',
+    'data_vars',
+    'coords',
+    'join',
+    'attrs_file',
+    'parallel',
+]
+
+
+def _open_mfdataset(filenames, max_workers=None, **kwargs):
+    """
+    Opens multiple files with xarray.open_mfdataset(), or when max_workers is set,
+    opens and preprocesses each file in a process pool and combines the results.
+
+    """
+    if max_workers is None:
+        return xr.open_mfdataset(filenames, **kwargs)
+
+    if isinstance(filenames, str):
+        filenames = sorted(glob.glob(filenames))
+    elif isinstance(filenames, PathLike):
+        filenames = [filenames]
+
+    if len(filenames) == 0:
+        raise OSError('no files to open')
+
+    combine = kwargs.get('combine', 'by_coords')
+    preprocess = kwargs.get('preprocess')
+    attrs_file = kwargs.get('attrs_file')
+    open_kwargs = {key: value for key, value in kwargs.items() if key not in _MFDATASET_KEYWORDS}
+
+    # Keywords passed on to the combine function. Only the ones set are passed so
+    # the defaults match xarray.open_mfdataset().
+    combine_keywords = ['compat', 'data_vars', 'coords', 'join']
+    if combine == 'nested':
+        combine_keywords.append('concat_dim')
+    combine_kwargs = {key: kwargs[key] for key in combine_keywords if key in kwargs}
+    combine_kwargs['combine_attrs'] = kwargs.get('combine_attrs', 'override')
+
+    # map() returns the datasets in the same order as the file names
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        datasets = list(
+            executor.map(
+                _open_and_preprocess_file, filenames, repeat(open_kwargs), repeat(preprocess)
+            )
+        )
+
+    if combine == 'nested':
+        ds = xr.combine_nested(datasets, **combine_kwargs)
+    else:
+        ds = xr.combine_by_coords(datasets, **combine_kwargs)
+
+    # Same as xarray.open_mfdataset() use the attributes from the requested file
+    if attrs_file is not None:
+        if isinstance(attrs_file, PathLike):
+            attrs_file = os.fspath(attrs_file)
+        ds.attrs = datasets[[os.fspath(ff) for ff in filenames].index(attrs_file)].attrs
+
+    return ds
+
+
+def _open_and_preprocess_file(filename, open_kwargs, preprocess=None):
+    """Reads a single file into memory, preprocesses and converts the time values."""
+    with xr.open_dataset(filename, **open_kwargs) as ds:
+        ds.load()
+
+    if preprocess is not None:
+        ds = preprocess(ds)
+
+    _convert_cftime_variables(ds)
+
+    return ds
+
+
+def _subset_files_by_time(filenames, start_time=None, end_time=None, index_file=None):
+    """
+    Returns the sorted list of files that may contain data between start_time
+    and end_time. For ARM standard file names the file start time is taken from the
+    file name and the file is assumed to end at the start of the next file. For
+    other file names the cached first and last time from get_file_info() is used.
+    Files with unknown times are always kept.
+
+    """
+    if isinstance(filenames, str):
+        filenames = glob.glob(filenames)
+    elif isinstance(filenames, PathLike):
+        filenames = [filenames]
+
+    start_time = np.datetime64(start_time) if start_time is not None else None
+    end_time = np.datetime64(end_time) if end_time is not None else None
+
+    file_ranges = []
+    for filename in filenames:
+        pts = re.match(ARM_FILENAME_REGEX, Path(filename).name)
+        if pts is not None:
+            pts = pts.groups()
+            file_start = np.datetime64(datetime.strptime(pts[2] + pts[3], '%Y%m%d%H%M%S'))
+            file_ranges.append([filename, file_start, None])
+        else:
+            time_range = get_file_info(filename, index_file=index_file)['time_range']
+            if time_range is None:
+                file_ranges.append([filename, None, None])
+            else:
+                file_ranges.append(
+                    [filename, np.datetime64(time_range[0]), np.datetime64(time_range[1])]
+                )
+
+    # Sort by start time and use the start of the next file as end time when unknown.
+    # That end time is exclusive since the data belongs to the next file.
+    file_ranges.sort(key=lambda x: (x[1] is None, x[1] if x[1] is not None else 0, str(x[0])))
+    next_start = [None] * len(file_ranges)
+    for ii in range(len(file_ranges) - 1):
+        if file_ranges[ii][1] is not None and file_ranges[ii][2] is None:
+            next_start[ii] = file_ranges[ii + 1][1]
+
+    keep_files = []
+    for (filename, file_start, file_end), next_file_start in zip(file_ranges, next_start):
+        if end_time is not None and file_start is not None and file_start > end_time:
+            continue
+        if start_time is not None:
+            if file_end is not None and file_end < start_time:
+                continue
+            if next_file_start is not None and next_file_start <= start_time:
+                continue
+        keep_files.append(filename)
+
+    return sorted(keep_files, key=str)
+
+
+def _convert_cftime_variables(ds):
+    """
+    Converts time and time_offset variables stored as cftime objects to datetime64
+    in place. Dask arrays are converted lazily block by block.
+
+    """
+    desired_time_precision = 'datetime64[ns]'
+    for var_name in ['time', 'time_offset']:
+        try:
+            # cftime values are stored as objects. Check the data type and first value
+            # so only one value is loaded if the variable is a dask array.
+            if (
+                'time' in ds.dims
+                and ds[var_name].dtype == object
+                and ds[var_name].size > 0
+                and type(np.asarray(ds[var_name].data.ravel()[0]).item()).__module__.startswith(
+                    'cftime.'
+                )
+            ):
+                if isinstance(ds[var_name].data, dask.array.Array):
+                    data = ds[var_name].data.map_blocks(
+                        _cftime_to_datetime64,
+                        desired_time_precision,
+                        dtype=desired_time_precision,
+                    )
+                else:
+                    data = ds[var_name].values.astype(desired_time_precision)
+
+                # If we just convert time to datetime64 the group, sel, and other Xarray
+                # methods will not work correctly because time is not indexed. Need to
+                # use the formation of a Dataset to correctly set the time indexing.
+                temp_ds = xr.Dataset({var_name: (ds[var_name].dims, data, ds[var_name].attrs)})
+                ds[var_name] = temp_ds[var_name]
+                del temp_ds
+
+                # If time_offset is in file try to convert base_time as well
+                if var_name == 'time_offset':
+                    ds['base_time'].values = ds['base_time'].values.astype(desired_time_precision)
+                    ds['base_time'] = ds['base_time'].astype(desired_time_precision)
+        except KeyError:
+            pass
+
+
+def _cftime_to_datetime64(values, precision):
+    """Converts a block of cftime objects to datetime64 values."""
+    return np.asarray(values).astype(precision)
+
+
+def keep_variables_to_drop_variables(
+    filenames, keep_variables, drop_variables=None, use_index=False, index_file=None
+):
     """
     Returns a list of variable names to exclude from reading by passing into
     `Xarray.open_dataset` drop_variables keyword. This can greatly help reduce
@@ -301,6 +524,11 @@ def keep_variables_to_drop_variables(filenames, keep_variables, drop_variables=N
     drop_variables : str or list of str
         Variable names to explicitly add to returned list. May be helpful if a variable
         exists in a file that is not in the first file in the list.
+    use_index : boolean
+        Option to get the variable names from the cached file information created by
+        get_file_info() instead of reading the netCDF file header.
+    index_file : str, pathlib.Path or None
+        Name of the JSON index file passed to get_file_info() when use_index is True.
 
     Returns
     -------
@@ -342,18 +570,21 @@ def keep_variables_to_drop_variables(filenames, keep_variables, drop_variables=N
             filename = filename[0]
 
     # Use netCDF4 library to extract the variable and dimension names.
-    rootgrp = Dataset(filename, 'r')
-    read_variables = list(rootgrp.variables)
+    if use_index:
+        variables = get_file_info(filename, index_file=index_file)['variables']
+    else:
+        with Dataset(filename, 'r') as rootgrp:
+            variables = {name: list(var.dimensions) for name, var in rootgrp.variables.items()}
+
+    read_variables = list(variables)
     # Loop over the variables to exclude needed coordinate dimention names.
     dims_to_keep = []
     for var_name in keep_variables:
         try:
-            dims_to_keep.extend(list(rootgrp[var_name].dimensions))
-        except IndexError:
+            dims_to_keep.extend(variables[var_name])
+        except KeyError:
             pass
 
-    rootgrp.close()
-
     # Remove names not matching keep_varibles excluding the associated coordinate dimentions
     return_variables = set(read_variables) - set(keep_variables) - set(dims_to_keep)
 
@@ -364,6 +595,139 @@ def keep_variables_to_drop_variables(filenames, keep_variables, drop_variables=N
     return list(return_variables)
 
 
+def get_file_info(filenames, index_file=None):
+    """
+
+    Returns header information for netCDF files. The information is cached so
+    repeated calls for the same files do not need to open and parse the netCDF
+    headers again. Entries are checked against the file size and modification time
+    and updated when a file changes.
+
+    Parameters
+    ----------
+    filenames : str, pathlib.Path or list of str or pathlib.Path
+        Name of file(s) to get information for.
+    index_file : str, pathlib.Path or None
+        Name of a JSON index file used to keep the cached information between
+        sessions. If None, the information is only cached in memory for this
+        session and nothing is written to disk. If the index can not be written,
+        the information is still returned and cached for this session.
+
+    Returns
+    -------
+    info : dict or list of dict
+        Dictionary, or list of dictionaries if a list of files was provided,
+        containing 'variables' with a dictionary of variable names and their
+        dimension names, 'dimensions' with a dictionary of dimension names and sizes,
+        and 'time_range' with a list of the first and last time in the file as
+        ISO 8601 strings, or None if the times can not be determined.
+
+    Examples
+    --------
+    .. code-block :: python
+
+        import act
+        info = act.io.arm.get_file_info(act.tests.sample_files.EXAMPLE_MET1)
+        print(info['time_range'])
+
+    """
+    return_list = isinstance(filenames, (list, tuple))
+    if not return_list:
+        filenames = [filenames]
+
+    index_name = None
+    if index_file is not None:
+        index_name = os.path.abspath(str(index_file))
+
+    index = _read_file_index(index_name)
+    updated = False
+    results = []
+    for filename in filenames:
+        filename = os.path.abspath(str(filename))
+        stat = os.stat(filename)
+        entry = index.get(filename)
+        if entry is None or entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime:
+            entry = _read_netcdf_header(filename)
+            entry['size'] = stat.st_size
+            entry['mtime'] = stat.st_mtime
+            index[filename] = entry
+            updated = True
+
+        results.append({key: entry[key] for key in ['variables', 'dimensions', 'time_range']})
+
+    if updated and index_name is not None:
+        _write_file_index(index_name, index)
+
+    if return_list:
+        return results
+
+    return results[0]
+
+
+# In memory copy of the file index files read during this session. The None key
+# holds the information for calls without an index file.
+_FILE_INDEX_CACHE = {}
+
+
+def _read_file_index(index_name):
+    """Returns the cached file index dictionary for an index file name."""
+    if index_name not in _FILE_INDEX_CACHE:
+        index = {}
+        if index_name is not None:
+            try:
+                with open(index_name) as fh:
+                    index = json.load(fh)
+            except (OSError, ValueError):
+                pass
+
+        _FILE_INDEX_CACHE[index_name] = index
+
+    return _FILE_INDEX_CACHE[index_name]
+
+
+def _write_file_index(index_name, index):
+    """Writes a file index dictionary to disk, ignoring unwritable locations."""
+    try:
+        # Write to a temporary file and rename so readers never see a partial file
+        with tempfile.NamedTemporaryFile(
+            'w', dir=os.path.dirname(index_name), suffix='.tmp', delete=False
+        ) as fh:
+            json.dump(index, fh)
+        os.replace(fh.name, index_name)
+    except OSError:
+        pass
+
+
+def _read_netcdf_header(filename):
+    """Reads variable names, dimension sizes and time range from a netCDF file."""
+    with Dataset(filename, 'r') as rootgrp:
+        variables = {name: list(var.dimensions) for name, var in rootgrp.variables.items()}
+        dimensions = {name: len(dim) for name, dim in rootgrp.dimensions.items()}
+
+        time_range = None
+        try:
+            if 'time' in rootgrp.variables and rootgrp['time'].size > 0:
+                var = rootgrp['time']
+                values = [var[0], var[-1]]
+                units = var.units
+            else:
+                var = rootgrp['time_offset']
+                values = [rootgrp['base_time'][...] + var[0], rootgrp['base_time'][...] + var[-1]]
+                units = rootgrp['base_time'].units
+
+            times = num2date(
+                np.array(values, dtype=float),
+                units,
+                calendar=getattr(var, 'calendar', 'standard'),
+                only_use_cftime_datetimes=True,
+            )
+            time_range = [str(np.datetime64(tt.isoformat(), 'ns')) for tt in times]
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+            pass
+
+    return {'variables': variables, 'dimensions': dimensions, 'time_range': time_range}
+
+
 def check_arm_standards(ds):
     """
 
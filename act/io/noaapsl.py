@@ -2,10 +2,11 @@
 Modules for reading in NOAA PSL data.
 """
 
-import datetime as dt
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from itertools import groupby
+from itertools import groupby, repeat
+from os import PathLike
 from os import path as ospath
 
 import fsspec
@@ -17,7 +18,7 @@ import yaml
 from .text import read_csv
 
 
-def read_psl_wind_profiler(filepath, transpose=True):
+def read_psl_wind_profiler(filepath, transpose=True, max_workers=None):
     """
     Returns two `xarray.Datasets` with stored data and metadata from a
     user-defined NOAA PSL wind profiler file each containing
@@ -26,10 +27,13 @@ def read_psl_wind_profiler(filepath, transpose=True):
 
     Parameters
     ----------
-    filepath : str
+    filepath : str or list
         Name of file(s) to read.
     transpose : bool
         True to transpose the data.
+    max_workers : int or None
+        Number of worker processes used to parse the files when reading more than
+        one file. If None, files are parsed in this process.
 
     Return
     ------
@@ -39,94 +43,227 @@ def read_psl_wind_profiler(filepath, transpose=True):
         Standard Xarray dataset with the second mode data.
 
     """
-    # Open the file, read in the lines as a list, and return that list
-    file = fsspec.open(filepath).open()
-    lines = file.readlines()
-    lines = [x.decode().rstrip()[:] for x in lines][1:]
-
-    # Separate sections based on the $ separator in the file
-    sections_of_file = (list(g) for _, g in groupby(lines, key='$'.__ne__))
-
-    # Count how many lines need to be skipped when reading into pandas
-    start_line = 0
-    list_of_datasets = []
-    for section in sections_of_file:
-        if section[0] != '$':
-            list_of_datasets.append(
-                _parse_psl_wind_lines(filepath, section, line_offset=start_line)
-            )
-        start_line += len(section)
+    # Sections of each file alternate between the two modes
+    mode_one_sections = []
+    mode_two_sections = []
+    for sections in _read_psl_sections(filepath, _parse_psl_wind_lines, max_workers=max_workers):
+        mode_one_sections.extend(sections[0::2])
+        mode_two_sections.extend(sections[1::2])
 
     # Return two datasets for each mode and the merge of datasets of the
     # same mode.
-    mode_one_ds = xr.concat(list_of_datasets[0::2], dim='time')
-    mode_two_ds = xr.concat(list_of_datasets[1::2], dim='time')
+    mode_one_ds = _merge_psl_sections(mode_one_sections)
+    mode_two_ds = _merge_psl_sections(mode_two_sections)
     if transpose:
         mode_one_ds = mode_one_ds.transpose('HT', 'time')
         mode_two_ds = mode_two_ds.transpose('HT', 'time')
     return mode_one_ds, mode_two_ds
 
 
-def read_psl_wind_profiler_temperature(filepath, transpose=True):
+def read_psl_wind_profiler_temperature(filepath, transpose=True, max_workers=None):
     """
     Returns `xarray.Dataset` with stored data and metadata from a user-defined
     NOAA PSL wind profiler temperature file.
 
     Parameters
     ----------
-    filepath : str
+    filepath : str or list
         Name of file(s) to read.
     transpose : bool
         True to transpose the data.
+    max_workers : int or None
+        Number of worker processes used to parse the files when reading more than
+        one file. If None, files are parsed in this process.
 
     Return
     ------
     ds : xarray.Dataset
         Standard Xarray dataset with the data.
 
+    """
+    sections = []
+    for file_sections in _read_psl_sections(
+        filepath, _parse_psl_temperature_lines, max_workers=max_workers
+    ):
+        sections.extend(file_sections)
+
+    # Merge the resultant sections together
+    ds = _merge_psl_sections(sections)
+    if transpose:
+        return ds.transpose('HT', 'time')
+    else:
+        return ds
+
+
+def _read_psl_sections(filepath, parser, max_workers=None):
+    """
+    Reads NOAA PSL wind profiler files and parses each $ separated section.
+
+    Parameters
+    ----------
+    filepath : str or list
+        Name of file(s) to read.
+    parser : function
+        Function used to parse the lines of a section.
+    max_workers : int or None
+        Number of worker processes used to parse the files. If None, files
+        are parsed in this process.
+
+    Returns
+    -------
+    sections : list
+        List for each file of the parsed sections in that file.
+
+    """
+    if isinstance(filepath, (str, PathLike)):
+        filepath = [filepath]
+
+    if max_workers is None or len(filepath) < 2:
+        return [_parse_psl_sections(fname, parser) for fname in filepath]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_parse_psl_sections, filepath, repeat(parser)))
+
+
+def _parse_psl_sections(filepath, parser):
+    """
+    Reads a NOAA PSL wind profiler file once and parses each $ separated section
+    from the lines in memory.
+
     """
     # Open the file, read in the lines as a list, and return that list
-    file = fsspec.open(filepath).open()
-    lines = file.readlines()
-    lines = [x.decode().rstrip()[:] for x in lines][1:]
+    with fsspec.open(filepath) as file:
+        lines = [x.decode().rstrip() for x in file.readlines()][1:]
 
     # Separate sections based on the $ separator in the file
     sections_of_file = (list(g) for _, g in groupby(lines, key='$'.__ne__))
 
-    # Count how many lines need to be skipped when reading into pandas
-    start_line = 0
-    list_of_datasets = []
-    for section in sections_of_file:
-        if section[0] != '$':
+    return [parser(section) for section in sections_of_file if section[0] != '$']
+
+
+def _parse_psl_table(lines, number_of_rows, rename=None):
+    """
+    Parses the data table of a section in a psl file.
+
+    Parameters
+    ----------
+    lines : list
+        List of strings containing the lines of the section. The table header
+        is the tenth line followed by the rows of data.
+    number_of_rows : int
+        Number of rows of data to read.
+    rename : dict or None
+        Dictionary to rename columns.
+
+    Returns
+    -------
+    columns : list
+        List of column names.
+    values : numpy.ndarray
+        Float array of data with shape (number_of_rows, number of columns).
+
+    """
+    # Repeated column names are numbered, e.g. SNR, SNR.1, SNR.2
+    columns = []
+    counts = {}
+    for column in lines[9].split():
+        columns.append(column if column not in counts else f'{column}.{counts[column]}')
+        counts[column] = counts.get(column, 0) + 1
+
+    # Grab the valid columns, except time, and set the data types to be floats
+    index = [ii for ii, column in enumerate(columns) if column != 'time']
+    values = np.array([line.split() for line in lines[10 : 10 + number_of_rows]], dtype=str)
+    values = values[:, index].astype(float)
+
+    # Nan values are encoded as 999999 - let's reflect that
+    values[values == 999999.0] = np.nan
+
+    if rename is None:
+        rename = {}
+    columns = [rename.get(columns[ii], columns[ii]) for ii in index]
+
+    return columns, values
+
+
+def _merge_psl_sections(sections):
+    """
+    Merges parsed sections of psl files into one `xarray.Dataset` with a time
+    and height dimension. Sections with the same heights are stacked into a
+    single array for each variable.
+
+    Parameters
+    ----------
+    sections : list
+        List of dictionaries returned from parsing each section.
+
+    Returns
+    -------
+    ds : xarray.Dataset
+        Xarray dataset with the data from all sections.
+
+    """
+    columns = sections[0]['columns']
+    heights = [section['values'][:, columns.index('HT')] for section in sections]
+    time = [section['time'] for section in sections]
+    same_heights = all(
+        section['columns'] == columns and np.array_equal(height, heights[0])
+        for section, height in zip(sections, heights)
+    )
+
+    if same_heights:
+        # Stack all sections into one (column, time, height) array
+        values = np.stack([section['values'].T for section in sections], axis=1)
+        ds = xr.Dataset(
+            {
+                column: (('time', 'HT'), values[ii])
+                for ii, column in enumerate(columns)
+                if column != 'HT'
+            },
+            coords={'time': time, 'HT': heights[0]},
+        )
+    else:
+        # Heights change between sections so align them on the union of heights
+        list_of_datasets = []
+        for section, height in zip(sections, heights):
             list_of_datasets.append(
-                _parse_psl_temperature_lines(filepath, section, line_offset=start_line)
+                xr.Dataset(
+                    {
+                        column: ('HT', section['values'][:, ii])
+                        for ii, column in enumerate(section['columns'])
+                        if column != 'HT'
+                    },
+                    coords={'HT': height},
+                ).expand_dims(time=[section['time']])
             )
-        start_line += len(section)
+        ds = xr.concat(list_of_datasets, dim='time', join='outer')
 
-    # Merge the resultant datasets together
-    if transpose:
-        return xr.concat(list_of_datasets, dim='time').transpose('HT', 'time')
-    else:
-        return xr.concat(list_of_datasets, dim='time')
+    # Add attributes to variables
+    # Height
+    ds['HT'].attrs['long_name'] = 'height_above_ground'
+    ds['HT'].attrs['units'] = 'km'
+    for var_name, attrs in sections[0]['variable_attrs'].items():
+        ds[var_name].attrs.update(attrs)
 
+    # Add in our additional attributes
+    ds.attrs = dict(sections[0]['attrs'])
+
+    return ds
 
-def _parse_psl_wind_lines(filepath, lines, line_offset=0):
+
+def _parse_psl_wind_lines(lines):
     """
     Reads lines related to wind in a psl file.
 
     Parameters
     ----------
-    filepath : str
-        Name of file(s) to read.
     lines : list
       List of strings containing the lines to parse.
-    line_offset : int (default = 0)
-      Offset to start reading the pandas data table.
 
     Returns
     -------
-    ds : xarray.Dataset
-      Xarray dataset with wind data.
+    section : dict
+      Dictionary with the time, data table columns and values, and attributes
+      of the section.
 
     """
     # 1 - site
@@ -187,29 +324,11 @@ def _parse_psl_wind_lines(filepath, lines, line_offset=0):
     beam_azimuth = np.array([beam_azimuth1, beam_azimuth2, beam_azimuth3], dtype='float32')
     beam_elevation = np.array([beam_elevation1, beam_elevation2, beam_elevation3], dtype='float32')
 
-    # Read in the data table section using pandas
-    df = pd.read_csv(filepath, skiprows=line_offset + 10, sep=r'\s+')
-
-    # Only read in the number of rows for a given set of gates
-    df = df.iloc[: int(number_of_range_gates)]
-
-    # Grab a list of valid columns, except time
-    columns = set(list(df.columns)) - {'time'}
-    # Set the data types to be floats
-    df = df[list(columns)].astype(float)
-
-    # Nan values are encoded as 999999 - let's reflect that
-    df = df.replace(999999.0, np.nan)
-
-    # Ensure the height array is stored as a float
-    df['HT'] = df.HT.astype(float)
-
-    # Set the height as an index
-    df = df.set_index('HT')
-
-    # Rename the count and snr columns more usefully
-    df = df.rename(
-        columns={
+    # Read in the data table, renaming the count and snr columns more usefully
+    columns, values = _parse_psl_table(
+        lines,
+        int(number_of_range_gates),
+        rename={
             'RAD': 'RAD1',
             'RAD.1': 'RAD2',
             'RAD.2': 'RAD3',
@@ -222,72 +341,65 @@ def _parse_psl_wind_lines(filepath, lines, line_offset=0):
             'QC': 'QC1',
             'QC.1': 'QC2',
             'QC.2': 'QC3',
-        }
+        },
     )
 
-    # Convert to an xaray dataset
-    ds = df.to_xarray()
-
-    # Add attributes to variables
-    # Height
-    ds['HT'].attrs['long_name'] = 'height_above_ground'
-    ds['HT'].attrs['units'] = 'km'
-
-    # Add time to our dataset
-    ds['time'] = time
-
     # Add in our additional attributes
-    ds.attrs['site_identifier'] = site.strip()
-    ds.attrs['data_type'] = datatype
-    ds.attrs['latitude'] = latitude
-    ds.attrs['longitude'] = longitude
-    ds.attrs['elevation'] = elevation
-    ds.attrs['beam_elevation'] = beam_elevation
-    ds.attrs['beam_azimuth'] = beam_azimuth
-    ds.attrs['revision_number'] = version
-    ds.attrs[
+    attrs = {}
+    attrs['site_identifier'] = site.strip()
+    attrs['data_type'] = datatype
+    attrs['latitude'] = latitude
+    attrs['longitude'] = longitude
+    attrs['elevation'] = elevation
+    attrs['beam_elevation'] = beam_elevation
+    attrs['beam_azimuth'] = beam_azimuth
+    attrs['revision_number'] = version
+    attrs[
         'data_description'
     ] = 'https://psl.noaa.gov/data/obs/data/view_data_type_info.php?SiteID=ctd&DataOperationalID=5855&OperationalID=2371'
-    ds.attrs['consensus_average_time'] = consensus_average_time
-    ds.attrs['oblique-beam_vertical_correction'] = int(beam_vertical_correction)
-    ds.attrs['number_of_beams'] = int(number_of_beams)
-    ds.attrs['number_of_range_gates'] = int(number_of_range_gates)
+    attrs['consensus_average_time'] = consensus_average_time
+    attrs['oblique-beam_vertical_correction'] = int(beam_vertical_correction)
+    attrs['number_of_beams'] = int(number_of_beams)
+    attrs['number_of_range_gates'] = int(number_of_range_gates)
 
     # Handle oblique and vertical attributes.
-    ds.attrs['number_of_gates_oblique'] = int(number_of_gates_obl)
-    ds.attrs['number_of_gates_vertical'] = int(number_of_gates_vert)
-    ds.attrs['number_spectral_averages_oblique'] = int(number_spectral_averages_obl)
-    ds.attrs['number_spectral_averages_vertical'] = int(number_spectral_averages_vert)
-    ds.attrs['pulse_width_oblique'] = int(pulse_width_obl)
-    ds.attrs['pulse_width_vertical'] = int(pulse_width_vert)
-    ds.attrs['inner_pulse_period_oblique'] = int(inner_pulse_period_obl)
-    ds.attrs['inner_pulse_period_vertical'] = int(inner_pulse_period_vert)
-    ds.attrs['full_scale_doppler_value_oblique'] = float(full_scale_doppler_obl)
-    ds.attrs['full_scale_doppler_value_vertical'] = float(full_scale_doppler_vert)
-    ds.attrs['delay_to_first_gate_oblique'] = int(delay_first_gate_obl)
-    ds.attrs['delay_to_first_gate_vertical'] = int(delay_first_gate_vert)
-    ds.attrs['spacing_of_gates_oblique'] = int(spacing_of_gates_obl)
-    ds.attrs['spacing_of_gates_vertical'] = int(spacing_of_gates_vert)
-    return ds
+    attrs['number_of_gates_oblique'] = int(number_of_gates_obl)
+    attrs['number_of_gates_vertical'] = int(number_of_gates_vert)
+    attrs['number_spectral_averages_oblique'] = int(number_spectral_averages_obl)
+    attrs['number_spectral_averages_vertical'] = int(number_spectral_averages_vert)
+    attrs['pulse_width_oblique'] = int(pulse_width_obl)
+    attrs['pulse_width_vertical'] = int(pulse_width_vert)
+    attrs['inner_pulse_period_oblique'] = int(inner_pulse_period_obl)
+    attrs['inner_pulse_period_vertical'] = int(inner_pulse_period_vert)
+    attrs['full_scale_doppler_value_oblique'] = float(full_scale_doppler_obl)
+    attrs['full_scale_doppler_value_vertical'] = float(full_scale_doppler_vert)
+    attrs['delay_to_first_gate_oblique'] = int(delay_first_gate_obl)
+    attrs['delay_to_first_gate_vertical'] = int(delay_first_gate_vert)
+    attrs['spacing_of_gates_oblique'] = int(spacing_of_gates_obl)
+    attrs['spacing_of_gates_vertical'] = int(spacing_of_gates_vert)
+    return {
+        'time': time,
+        'columns': columns,
+        'values': values,
+        'attrs': attrs,
+        'variable_attrs': {},
+    }
 
 
-def _parse_psl_temperature_lines(filepath, lines, line_offset=0):
+def _parse_psl_temperature_lines(lines):
     """
     Reads lines related to temperature in a psl file.
 
     Parameters
     ----------
-    filepath : str
-        Name of file(s) to read.
     lines : list
       List of strings containing the lines to parse.
-    line_offset : int (default = 0)
-      Offset to start reading the pandas data table.
 
     Returns
     -------
-    ds : xarray.Dataset
-      Xarray dataset with temperature data.
+    section : dict
+      Dictionary with the time, data table columns and values, and attributes
+      of the section.
 
     """
     # 1 - site
@@ -325,83 +437,59 @@ def _parse_psl_temperature_lines(filepath, lines, line_offset=0):
     # 9 - beam azimuth (degrees clockwise from north)
     beam_azimuth, beam_elevation = filter_list(lines[8].split(' ')).astype(float)
 
-    # Read in the data table section using pandas
-    df = pd.read_csv(filepath, skiprows=line_offset + 10, sep=r'\s+')
-
-    # Only read in the number of rows for a given set of gates
-    df = df.iloc[: int(number_of_gates)]
-
-    # Grab a list of valid columns, except time
-    columns = set(list(df.columns)) - {'time'}
-
-    # Set the data types to be floats
-    df = df[list(columns)].astype(float)
-
-    # Nan values are encoded as 999999 - let's reflect that
-    df = df.replace(999999.0, np.nan)
-
-    # Ensure the height array is stored as a float
-    df['HT'] = df.HT.astype(float)
-
-    # Set the height as an index
-    df = df.set_index('HT')
-
-    # Rename the count and snr columns more usefully
-    df = df.rename(
-        columns={
+    # Read in the data table, renaming the count and snr columns more usefully
+    columns, values = _parse_psl_table(
+        lines,
+        int(number_of_gates),
+        rename={
             'CNT': 'CNT_T',
             'CNT.1': 'CNT_Tc',
             'CNT.2': 'CNT_W',
             'SNR': 'SNR_T',
             'SNR.1': 'SNR_Tc',
             'SNR.2': 'SNR_W',
-        }
+        },
     )
 
-    # Convert to an xaray dataset
-    ds = df.to_xarray()
-
     # Add attributes to variables
-    # Height
-    ds['HT'].attrs['long_name'] = 'height_above_ground'
-    ds['HT'].attrs['units'] = 'km'
-
-    # Temperature
-    ds['T'].attrs['long_name'] = 'average_uncorrected_RASS_temperature'
-    ds['T'].attrs['units'] = 'degC'
-    ds['Tc'].attrs['long_name'] = 'average_corrected_RASS_temperature'
-    ds['Tc'].attrs['units'] = 'degC'
-
-    # Vertical motion (w)
-    ds['W'].attrs['long_name'] = 'average_vertical_wind'
-    ds['W'].attrs['units'] = 'm/s'
-
-    # Add time to our dataset
-    ds['time'] = time
+    variable_attrs = {
+        # Temperature
+        'T': {'long_name': 'average_uncorrected_RASS_temperature', 'units': 'degC'},
+        'Tc': {'long_name': 'average_corrected_RASS_temperature', 'units': 'degC'},
+        # Vertical motion (w)
+        'W': {'long_name': 'average_vertical_wind', 'units': 'm/s'},
+    }
 
     # Add in our additional attributes
-    ds.attrs['site_identifier'] = site.strip()
-    ds.attrs['data_type'] = datatype
-    ds.attrs['latitude'] = latitude
-    ds.attrs['longitude'] = longitude
-    ds.attrs['elevation'] = elevation
-    ds.attrs['beam_elevation'] = beam_elevation
-    ds.attrs['beam_azimuth'] = beam_azimuth
-    ds.attrs['revision_number'] = version
-    ds.attrs[
+    attrs = {}
+    attrs['site_identifier'] = site.strip()
+    attrs['data_type'] = datatype
+    attrs['latitude'] = latitude
+    attrs['longitude'] = longitude
+    attrs['elevation'] = elevation
+    attrs['beam_elevation'] = beam_elevation
+    attrs['beam_azimuth'] = beam_azimuth
+    attrs['revision_number'] = version
+    attrs[
         'data_description'
     ] = 'https://psl.noaa.gov/data/obs/data/view_data_type_info.php?SiteID=ctd&DataOperationalID=5855&OperationalID=2371'
-    ds.attrs['consensus_average_time'] = consensus_average_time
-    ds.attrs['number_of_beams'] = int(number_of_beams)
-    ds.attrs['number_of_gates'] = int(number_of_gates)
-    ds.attrs['number_of_range_gates'] = int(number_of_range_gates)
-    ds.attrs['number_spectral_averages'] = int(number_spectral_averages)
-    ds.attrs['pulse_width'] = pulse_width
-    ds.attrs['inner_pulse_period'] = inner_pulse_period
-    ds.attrs['full_scale_doppler_value'] = full_scale_doppler
-    ds.attrs['spacing_of_gates'] = spacing_of_gates
-
-    return ds
+    attrs['consensus_average_time'] = consensus_average_time
+    attrs['number_of_beams'] = int(number_of_beams)
+    attrs['number_of_gates'] = int(number_of_gates)
+    attrs['number_of_range_gates'] = int(number_of_range_gates)
+    attrs['number_spectral_averages'] = int(number_spectral_averages)
+    attrs['pulse_width'] = pulse_width
+    attrs['inner_pulse_period'] = inner_pulse_period
+    attrs['full_scale_doppler_value'] = full_scale_doppler
+    attrs['spacing_of_gates'] = spacing_of_gates
+
+    return {
+        'time': time,
+        'columns': columns,
+        'values': values,
+        'attrs': attrs,
+        'variable_attrs': variable_attrs,
+    }
 
 
 def filter_list(list_of_strings):
@@ -836,7 +924,7 @@ def read_psl_parsivel(files):
     return ds
 
 
-def read_psl_radar_fmcw_moment(files):
+def read_psl_radar_fmcw_moment(files, max_workers=None):
     """
     Returns `xarray.Dataset` with stored data and metadata from
     NOAA PSL FMCW Radar files. See References section for details.
@@ -846,6 +934,9 @@ def read_psl_radar_fmcw_moment(files):
     files : str or list
         Name of file(s) to read.  Currently does not support reading URLs but files can
         be downloaded easily using the act.discovery.download_noaa_psl_data function.
+    max_workers : int or None
+        Number of worker processes used to parse the files when reading more than
+        one file. If None, files are parsed in this process.
 
     Return
     ------
@@ -859,12 +950,12 @@ def read_psl_radar_fmcw_moment(files):
 
     """
 
-    ds = _parse_psl_radar_moments(files)
+    ds = _parse_psl_radar_moments(files, max_workers=max_workers)
 
     return ds
 
 
-def read_psl_radar_sband_moment(files):
+def read_psl_radar_sband_moment(files, max_workers=None):
     """
     Returns `xarray.Dataset` with stored data and metadata from
     NOAA PSL S-band Radar files.
@@ -874,6 +965,9 @@ def read_psl_radar_sband_moment(files):
     files : str or list
         Name of file(s) to read.  Currently does not support reading URLs but files can
         be downloaded easily using the act.discovery.download_noaa_psl_data function.
+    max_workers : int or None
+        Number of worker processes used to parse the files when reading more than
+        one file. If None, files are parsed in this process.
 
     Return
     ------
@@ -882,12 +976,12 @@ def read_psl_radar_sband_moment(files):
 
     """
 
-    ds = _parse_psl_radar_moments(files)
+    ds = _parse_psl_radar_moments(files, max_workers=max_workers)
 
     return ds
 
 
-def _parse_psl_radar_moments(files):
+def _parse_psl_radar_moments(files, max_workers=None):
     """
     Returns `xarray.Dataset` with stored data and metadata from
     NOAA PSL FMCW and S-Band Radar files.
@@ -897,6 +991,9 @@ def _parse_psl_radar_moments(files):
     files : str or list
         Name of file(s) to read.  Currently does not support reading URLs but files can
         be downloaded easily using the act.discovery.download_noaa_psl_data function.
+    max_workers : int or None
+        Number of worker processes used to parse the files when reading more than
+        one file. If None, files are parsed in this process.
 
     Return
     ------
@@ -1075,115 +1172,172 @@ def _parse_psl_radar_moments(files):
     if not isinstance(files, list):
         files = [files]
 
-    # Run through each file and read the data in
-    for f in files:
-        # Read in the first line of the file which has site, lat, lon, etc...
-        df = str(pd.read_table(f, nrows=0).columns[0]).split(' ')
-        ctr = 0
-        for d in df:
-            if len(d) > 0:
-                if d == 'lat' or d == 'lon':
-                    data[h1_names[ctr]]['data'].append(float(d) / 100.0)
-                else:
-                    data[h1_names[ctr]]['data'].append(d)
-                ctr += 1
-
-        # Set counts and errors
-        error = False
-        error_ct = 0
-        ct = 0
-        # Loop through while there's no errors i.e. eof
-        while error is False:
-            try:
-                # Read in the initial headers to get information used to parse data
-                if ct == 0:
-                    df = str(pd.read_table(f, nrows=0, skiprows=[0]).columns[0]).split(' ')
-                    ctr = 0
-                    for d in df:
-                        if len(d) > 0:
-                            data[h2_names[ctr]]['data'].append(d)
-                            ctr += 1
-                    # Read in third row of header information
-                    df = str(pd.read_table(f, nrows=0, skiprows=[0, 1]).columns[0]).split(' ')
-                    ctr = 0
-                    for d in df:
-                        if len(d) > 0:
-                            data[h3_names[ctr]]['data'].append(d)
-                            ctr += 1
-                    # Read in the data based on number of gates
-                    df = pd.read_csv(
-                        f,
-                        skiprows=[0, 1, 2],
-                        nrows=int(data['n_gates']['data'][-1]) - 1,
-                        sep=r'\s+',
-                        names=list(names.keys()),
-                    )
-                    index2 = 0
-                else:
-                    # Set indices for parsing data, reading 2 headers and then the columns of data
-                    index1 = ct * int(data['n_gates']['data'][-1])
-                    index2 = index1 + int(data['n_gates']['data'][-1]) + 2 * ct + 4
-                    df = str(
-                        pd.read_table(f, nrows=0, skiprows=list(range(index2 - 1))).columns[0]
-                    ).split(' ')
-                    ctr = 0
-                    for d in df:
-                        if len(d) > 0:
-                            data[h2_names[ctr]]['data'].append(d)
-                            ctr += 1
-                    df = str(
-                        pd.read_table(f, nrows=0, skiprows=list(range(index2))).columns[0]
-                    ).split(' ')
-                    ctr = 0
-                    for d in df:
-                        if len(d) > 0:
-                            data[h3_names[ctr]]['data'].append(d)
-                            ctr += 1
-                    df = pd.read_csv(
-                        f,
-                        skiprows=list(range(index2 + 1)),
-                        nrows=int(data['n_gates']['data'][-1]) - 1,
-                        sep=r'\s+',
-                        names=list(names.keys()),
-                    )
-
-                # Add data from the columns to the dictionary
-                for n in names:
-                    data[n]['data'].append(df[n].to_list())
-
-                # Calculate the range based on number of gates, range to first gate and range between gates
-                if len(data['range']['data']) == 0:
-                    ranges = float(data['first_range_gate']['data'][-1]) + np.array(
-                        range(int(data['n_gates']['data'][-1]) - 1)
-                    ) * float(data['range_between_gates']['data'][-1])
-                    data['range']['data'] = ranges
-
-                # Calculate a time
-                time = dt.datetime(
-                    int('20' + data['year']['data'][-1]),
-                    1,
-                    1,
-                    int(data['hour']['data'][-1]),
-                    int(data['minute']['data'][-1]),
-                    int(data['second']['data'][-1]),
-                ) + dt.timedelta(days=int(data['day_of_year']['data'][-1]) - 1)
-                data['time']['data'].append(time)
-
-                # Range correct the snr which converts it essentially to an uncalibrated reflectivity
-                snr_rc = data['snr']['data'][-1] - 20.0 * np.log10(1.0 / (ranges / 1000.0) ** 2)
-                data['reflectivity_uncalibrated']['data'].append(snr_rc)
-            except Exception as e:
-                # Handle errors, if end of file then continue on, if something else
-                # try the next block of data but if it errors another time in this file move on
-                if isinstance(e, pd.errors.EmptyDataError) or error_ct > 1:
-                    error = True
-                else:
-                    print(e)
-                    pass
-                error_ct += 1
-            ct += 1
+    # Each file is read and parsed in a single pass, optionally in separate processes
+    if max_workers is None or len(files) < 2:
+        results = [_read_psl_radar_moment_file(f) for f in files]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_read_psl_radar_moment_file, files))
+
+    for result in results:
+        for n in h1_names:
+            data[n]['data'].append(result[n])
+
+    results = [result for result in results if result['time'].size > 0]
+    if len(results) > 0:
+        # The number of gates and ranges are set by the first record read
+        n_range = results[0]['n_range']
+        for n in h2_names + h3_names + ['time']:
+            data[n]['data'] = np.concatenate([result[n] for result in results])
+        for n in list(names.keys()):
+            moments = np.full((sum(r['time'].size for r in results), n_range), np.nan)
+            index = 0
+            for result in results:
+                values = result[n][:, :n_range]
+                moments[index : index + values.shape[0], : values.shape[1]] = values
+                index += values.shape[0]
+            data[n]['data'] = moments
+        if np.all(np.mod(data['qc_variable']['data'], 1) == 0):
+            data['qc_variable']['data'] = data['qc_variable']['data'].astype(np.int64)
+
+        # Calculate the range based on number of gates, range to first gate and range between gates
+        first_record = results[0]
+        ranges = float(first_record['first_range_gate'][0]) + np.arange(n_range) * float(
+            first_record['range_between_gates'][0]
+        )
+        data['range']['data'] = ranges
+
+        # Range correct the snr which converts it essentially to an uncalibrated reflectivity
+        data['reflectivity_uncalibrated']['data'] = data['snr']['data'] - 20.0 * np.log10(
+            1.0 / (ranges / 1000.0) ** 2
+        )
 
     # Convert dictionary to Dataset
     ds = xr.Dataset().from_dict(data)
 
     return ds
+
+
+def _read_psl_radar_moment_file(filename):
+    """
+    Reads a single NOAA PSL FMCW or S-Band Radar moment file in one pass.
+
+    The file has one line of site information followed by records of two header
+    lines and one line per range gate. Records are found by the number of values
+    on the header lines so the file is only read once.
+
+    Parameters
+    ----------
+    filename : str
+        Name of file to read.
+
+    Returns
+    -------
+    result : dict
+        Dictionary of NumPy arrays keyed by variable name.
+
+    """
+    h1_names = ['site', 'lat', 'lon', 'alt', 'freq']
+    h2_names = [
+        'azimuth',
+        'elevation',
+        'beam_direction_code',
+        'year',
+        'day_of_year',
+        'hour',
+        'minute',
+        'second',
+    ]
+    h3_names = [
+        'interpulse_period',
+        'pulse_width',
+        'first_range_gate',
+        'range_between_gates',
+        'n_gates',
+        'n_coherent_integration',
+        'n_averaged_spectra',
+        'n_points_spectrum',
+        'n_code_bits',
+    ]
+    names = [
+        'radial_velocity',
+        'snr',
+        'signal_power',
+        'spectral_width',
+        'noise_amplitude',
+        'qc_variable',
+    ]
+
+    with open(filename, 'rb') as fh:
+        lines = fh.read().decode().splitlines()
+
+    result = dict(zip(h1_names, lines[0].split()))
+
+    def is_record_start(index):
+        return (
+            index < len(lines) - 1
+            and len(lines[index].split()) == len(h2_names)
+            and len(lines[index + 1].split()) == len(h3_names)
+        )
+
+    # Step from record to record using the number of gates in the header and only
+    # search line by line when a record is not the expected length.
+    starts = []
+    data_lines = []
+    n_rows = []
+    n_range = None
+    index = 1
+    while index < len(lines) - 1:
+        if not is_record_start(index):
+            index += 1
+            continue
+        n_gates = int(lines[index + 1].split()[4])
+        end = index + 2 + n_gates
+        rows = lines[index + 2 : end]
+        if end < len(lines) and not is_record_start(end):
+            end = index + 2
+            while end < len(lines) and not is_record_start(end):
+                end += 1
+            rows = [line for line in lines[index + 2 : end] if len(line.split()) == len(names)]
+
+        # The number of ranges is set by the first record and the last range gate
+        # of each record is not used
+        if n_range is None:
+            n_range = n_gates - 1
+        rows = rows[: min(n_range, n_gates - 1)]
+        starts.append(index)
+        data_lines.extend(rows)
+        n_rows.append(len(rows))
+        index = end
+
+    header_lines = [lines[start].split() for start in starts]
+    for ii, n in enumerate(h2_names):
+        result[n] = np.array([header[ii] for header in header_lines], dtype=str)
+    header_lines = [lines[start + 1].split() for start in starts]
+    for ii, n in enumerate(h3_names):
+        result[n] = np.array([header[ii] for header in header_lines], dtype=str)
+
+    # Convert all range gates in the file at once and place them into the records
+    n_range = 0 if n_range is None else n_range
+    moments = np.full((len(names), len(starts), n_range), np.nan)
+    if len(data_lines) > 0:
+        values = np.loadtxt(data_lines, dtype=float, ndmin=2).T
+        index = 0
+        for ii, n_row in enumerate(n_rows):
+            moments[:, ii, :n_row] = values[:, index : index + n_row]
+            index += n_row
+    for ii, n in enumerate(names):
+        result[n] = moments[ii]
+    result['n_range'] = n_range
+
+    # Calculate a time from the 2-digit year, day of year, hour, minute and second
+    time = (
+        np.array(['20' + year for year in result['year']], dtype='datetime64[Y]')
+        + (result['day_of_year'].astype(int) - 1).astype('timedelta64[D]')
+        + result['hour'].astype(int).astype('timedelta64[h]')
+        + result['minute'].astype(int).astype('timedelta64[m]')
+        + result['second'].astype(int).astype('timedelta64[s]')
+    )
+    result['time'] = time.astype('datetime64[ns]')
+
+    return result
@@ -27,6 +27,7 @@ __getattr__, __dir__, __all__ = lazy.attach(
             'parse_bit',
             'set_bit',
             'unset_bit',
+            'unpack_bits',
         ],
         'qc_summary': ['QCSummary'],
         'qctests': [
@@ -3,6 +3,8 @@ import numpy as np
 from pathlib import Path
 from dateutil import parser
 
+from act.utils.datetime_utils import time_ranges_to_mask
+
 #   Example of the YAML file and how to construct.
 #   The times are set as inclusive start to inclusive end time.
 #   Different formats are acceptable as displayed with temp_mean
@@ -297,14 +299,7 @@ def apply_supplemental_qc(
                     if np.all(np.isnat(times)):
                         continue
 
-                    indexes = np.array([], dtype=np.int32)
-                    for vals in times:
-                        ind = np.argwhere(
-                            (ds['time'].values >= vals[0]) & (ds['time'].values <= vals[1])
-                        )
-
-                        if len(ind) > 0:
-                            indexes = np.append(indexes, ind)
+                    indexes = np.flatnonzero(time_ranges_to_mask(ds['time'].values, times))
 
                     if indexes.size > 0:
                         ds.qcfilter.add_test(
@@ -323,13 +318,7 @@ def apply_supplemental_qc(
                 if np.all(np.isnat(times)):
                     continue
 
-                indexes = np.array([], dtype=np.int32)
-                for vals in times:
-                    ind = np.argwhere(
-                        (ds['time'].values >= vals[0]) & (ds['time'].values <= vals[1])
-                    )
-                    if ind.size > 0:
-                        indexes = np.append(indexes, np.ndarray.flatten(ind))
+                indexes = np.flatnonzero(time_ranges_to_mask(ds['time'].values, times))
 
                 if indexes.size > 0:
                     for all_var_name in list(ds.data_vars):
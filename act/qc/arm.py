@@ -11,6 +11,7 @@ import json
 from dateutil import parser
 
 from act.config import DEFAULT_DATASTREAM_NAME
+from act.utils.datetime_utils import time_ranges_to_mask
 
 
 def add_dqr_to_qc(
@@ -180,13 +181,11 @@ def add_dqr_to_qc(
             if include is not None and dqr_number not in include:
                 continue
 
-            index = np.array([], dtype=np.int32)
-            for time_range in docs[quality_category][dqr_number]['dates']:
-                starttime = np.datetime64(time_range['start_date'])
-                endtime = np.datetime64(time_range['end_date'])
-                ind = np.where((time >= starttime) & (time <= endtime))
-                if ind[0].size > 0:
-                    index = np.append(index, ind[0])
+            time_ranges = [
+                (np.datetime64(time_range['start_date']), np.datetime64(time_range['end_date']))
+                for time_range in docs[quality_category][dqr_number]['dates']
+            ]
+            index = np.flatnonzero(time_ranges_to_mask(time, time_ranges))
 
             if index.size > 0:
                 dqr_results[dqr_number] = {
@@ -238,7 +237,7 @@ def add_dqr_to_qc(
             try:
                 ds.qcfilter.add_test(
                     var_name,
-                    index=np.unique(value['index']),
+                    index=value['index'],
                     test_meaning=value['test_meaning'],
                     test_assessment=value['test_assessment'],
                 )
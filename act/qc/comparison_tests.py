@@ -2,10 +2,7 @@
 Functions and methods for performing comparison tests.
 
 """
-import copy
-
 import numpy as np
-import xarray as xr
 
 from act.utils.data_utils import convert_units
 from act.utils.datetime_utils import determine_time_delta
@@ -56,9 +53,11 @@ class QCTests:
 
         Returns
         -------
-        test_info : tuple
-            A tuple containing test information including var_name, qc variable name,
-            test_number, test_meaning, test_assessment
+        test_info : dict
+            A dictionary containing test information including var_name, qc variable name,
+            test_number, test_meaning, test_assessment. Also includes the best time shift
+            in seconds as time_shift, and all the tested shifts in seconds and their
+            summed absolute differences as time_shifts and time_shift_scores.
 
         """
         # If no comparison variable name given assume matches variable name
@@ -69,38 +68,30 @@ class QCTests:
         if comp_dataset is None:
             comp_dataset = self
 
-        # Extract copy of DataArray for work below
-        self_da = copy.deepcopy(self._ds[var_name])
-        comp_da = copy.deepcopy(comp_dataset[comp_var_name])
+        self_da = self._ds[var_name]
+        comp_da = comp_dataset[comp_var_name]
 
         # Convert comp data units to match
-        comp_da.values = convert_units(
-            comp_da.values, comp_da.attrs['units'], self_da.attrs['units']
-        )
-        comp_da.attrs['units'] = self_da.attrs['units']
+        comp_data = convert_units(comp_da.values, comp_da.attrs['units'], self_da.attrs['units'])
 
         # Match comparison data to time of data
         if time_step is None:
             time_step = determine_time_delta(self._ds['time'].values)
-        sum_diff = np.array([], dtype=float)
-        time_diff = np.array([], dtype=np.int32)
-        for tm_shift in range(-1 * time_shift, time_shift + int(time_step), int(time_step)):
-            time = self_da.time.values.astype('datetime64[s]') + tm_shift
-            time = time.astype('datetime64[ns]')
-            self_da_shifted = self_da.assign_coords(time=time)
-
-            data_matched, comp_data_matched = xr.align(self_da, comp_da)
-            self_da_shifted = self_da_shifted.reindex(
-                time=comp_da.time.values,
-                method='nearest',
-                tolerance=np.timedelta64(time_match_threshhold, 's'),
-            )
-            diff = np.abs(self_da_shifted.values - comp_da.values)
-            sum_diff = np.append(sum_diff, np.nansum(diff))
-            time_diff = np.append(time_diff, tm_shift)
+        time_diffs = np.arange(-1 * time_shift, time_shift + int(time_step), int(time_step))
+
+        # Self time is truncated to whole seconds before shifting
+        self_time = self_da['time'].values.astype('datetime64[s]').astype('datetime64[ns]')
+        sum_diff = _time_shift_scores(
+            self_time.astype(np.int64),
+            self_da.values,
+            comp_da['time'].values.astype('datetime64[ns]').astype(np.int64),
+            comp_data,
+            time_diffs * 10**9,
+            time_match_threshhold * 10**9,
+        )
 
         index = np.argmin(np.abs(sum_diff))
-        time_diff = time_diff[index]
+        time_diff = int(time_diffs[index])
 
         index = None
         if np.abs(time_diff) > time_qc_threshold:
@@ -113,5 +104,60 @@ class QCTests:
         result = self._ds.qcfilter.add_test(
             var_name, index=index, test_meaning=meaning, test_assessment='Indeterminate'
         )
+        result['time_shift'] = time_diff
+        result['time_shifts'] = time_diffs
+        result['time_shift_scores'] = sum_diff
 
         return result
+
+
+def _time_shift_scores(time, data, comp_time, comp_data, shifts, tolerance):
+    """
+    Sums the absolute difference between comparison data and data shifted in
+    time for all shifts at once. For each shift and comparison time the data
+    value with the nearest shifted time within tolerance is used, with ties
+    going to the later time, matching xarray reindex() with method='nearest'.
+    Comparison times without a match are not included in the sum.
+
+    Parameters
+    ----------
+    time : numpy.ndarray
+        Sorted integer times of data.
+    data : numpy.ndarray
+        Data values with time as the first dimension.
+    comp_time : numpy.ndarray
+        Integer times of comparison data in the same units as time.
+    comp_data : numpy.ndarray
+        Comparison data values with time as the first dimension.
+    shifts : numpy.ndarray
+        Integer time shifts added to time.
+    tolerance : int
+        Maximum time difference for matching times.
+
+    Returns
+    -------
+    sum_diff : numpy.ndarray
+        Summed absolute difference for each shift.
+
+    """
+    data = np.asarray(data, dtype=float).reshape(time.size, -1)
+    comp_data = np.asarray(comp_data, dtype=float).reshape(comp_time.size, -1)
+
+    # Limit the size of the (shift, time) arrays by processing blocks of shifts
+    block = max(1, int(1e7 // max(comp_data.size, 1)))
+    sum_diff = np.zeros(shifts.size)
+    for start in range(0, shifts.size, block):
+        target = comp_time[np.newaxis, :] - shifts[start : start + block, np.newaxis]
+
+        right = np.clip(np.searchsorted(time, target, side='left'), 0, time.size - 1)
+        left = np.clip(right - 1, 0, time.size - 1)
+        dist_right = np.abs(time[right] - target)
+        dist_left = np.abs(target - time[left])
+        nearest = np.where(dist_right <= dist_left, right, left)
+        matched = np.minimum(dist_right, dist_left) <= tolerance
+
+        diff = np.abs(data[nearest] - comp_data[np.newaxis])
+        diff[~matched] = np.nan
+        sum_diff[start : start + block] = np.nansum(diff, axis=(1, 2))
+
+    return sum_diff
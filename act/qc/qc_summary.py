@@ -9,9 +9,11 @@ description.
 
 import datetime
 import copy
-import xarray as xr
 import warnings
 
+import dask.array
+import numpy as np
+
 
 class QCSummary:
     """
@@ -68,8 +70,6 @@ class QCSummary:
         if normalize_assessment:
             self._ds.clean.normalize_assessment()
 
-        return_ds = self._ds.copy()
-
         added = False
         for var_name in list(self._ds.data_vars):
             qc_var_name = self.check_for_ancillary_qc(var_name, add_if_missing=False, cleanup=False)
@@ -78,7 +78,7 @@ class QCSummary:
                 continue
 
             # Do not really know how to handle scalars yet.
-            if return_ds[qc_var_name].ndim == 0:
+            if self._ds[qc_var_name].ndim == 0:
                 warnings.warn(
                     f'Unable to process scalar variable {var_name}. '
                     'Scalar variables currently not implemented.'
@@ -87,56 +87,78 @@ class QCSummary:
 
             added = True
 
-            result = xr.zeros_like(return_ds[qc_var_name])
-            for attr in ['flag_masks', 'flag_meanings', 'flag_assessments', 'flag_values']:
-                try:
-                    del result.attrs[attr]
-                except KeyError:
-                    pass
-
-            return_ds[qc_var_name] = result
-
-            return_ds.qcfilter.add_test(
-                var_name,
-                index=None,
-                test_number=0,
-                test_meaning='Not failing quality control tests',
-                test_assessment='Not failing',
-                flag_value=True,
-            )
-
             flag_assessments = list(standard_meanings.keys())
             added_assessments = set(self._ds[qc_var_name].attrs['flag_assessments']) - set(
                 flag_assessments
             )
             flag_assessments += list(added_assessments)
+            qc_assessments = [
+                assessment.lower() for assessment in self._ds[qc_var_name].attrs['flag_assessments']
+            ]
+
+            # Get one mask for each assessment with all the tests for that assessment
+            # combined. Assessments later in the list take precedence over earlier ones.
+            flag_meanings = ['Not failing quality control tests']
+            conditions = []
+            choices = []
             for ii, assessment in enumerate(flag_assessments):
                 try:
-                    standard_meaning = standard_meanings[assessment.capitalize()]
+                    flag_meanings.append(standard_meanings[assessment.capitalize()])
                 except KeyError:
-                    standard_meaning = f"Data {assessment}"
+                    flag_meanings.append(f"Data {assessment}")
+
+                if assessment.lower() not in qc_assessments:
+                    continue
 
-                qc_mask = self.get_masked_data(
-                    var_name, rm_assessments=assessment, return_mask_only=True
+                conditions.insert(
+                    0,
+                    self.get_masked_data(
+                        var_name, rm_assessments=assessment, return_mask_only=True, return_dask=True
+                    ),
                 )
+                choices.insert(0, ii + 1)
+
+            # Write the summary flag values in one pass keeping the integer data type
+            # of the embedded quality control variable.
+            qc_data = self._ds[qc_var_name].data
+            dtype = qc_data.dtype
+            if not np.issubdtype(dtype, np.integer):
+                dtype = np.dtype(int)
+
+            if isinstance(qc_data, dask.array.Array):
+                summary = dask.array.zeros(qc_data.shape, dtype=dtype, chunks=qc_data.chunks)
+                for condition, choice in zip(conditions[::-1], choices[::-1]):
+                    summary = dask.array.where(condition, dtype.type(choice), summary)
+            elif len(conditions) > 0:
+                conditions = [np.asarray(condition) for condition in conditions]
+                summary = np.select(conditions, choices, default=0).astype(dtype)
+            else:
+                summary = np.zeros(qc_data.shape, dtype=dtype)
 
-                # # Do not really know how to handle scalars yet.
+            result = self._ds[qc_var_name].copy(data=summary)
+            for attr in ['flag_masks', 'flag_meanings', 'flag_assessments', 'flag_values']:
+                try:
+                    del result.attrs[attr]
+                except KeyError:
+                    pass
 
-                return_ds.qcfilter.add_test(
-                    var_name,
-                    index=qc_mask,
-                    test_meaning=standard_meaning,
-                    test_assessment=assessment,
-                    flag_value=True,
-                )
+            result.attrs['flag_values'] = list(range(len(flag_assessments) + 1))
+            result.attrs['flag_meanings'] = flag_meanings
+            result.attrs['flag_assessments'] = ['Not failing'] + [
+                assessment.capitalize() for assessment in flag_assessments
+            ]
 
             # Remove fail limit variable attributes
             if remove_attrs is not None:
-                for att_name in copy.copy(list(return_ds[qc_var_name].attrs.keys())):
+                for att_name in copy.copy(list(result.attrs.keys())):
                     if att_name in remove_attrs:
-                        del return_ds[qc_var_name].attrs[att_name]
+                        del result.attrs[att_name]
 
-            self._ds.update({qc_var_name: return_ds[qc_var_name]})
+            self._ds[qc_var_name] = result
+
+        # Only the quality control variables are replaced so the returned Dataset
+        # shares all other data variables with the updated Dataset.
+        return_ds = self._ds.copy()
 
         if added:
             from act import __version__ as version
@@ -7,6 +7,7 @@ routines in ACT.
 
 import dask
 import numpy as np
+import pandas as pd
 import xarray as xr
 
 from act.qc import comparison_tests, qctests, bsrn_tests, qc_summary
@@ -93,10 +94,11 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
             # variable name. If it exists use it else create new
             # QC varaible.
             if add_if_missing:
-                try:
-                    self._ds['qc_' + var_name]
+                # Check membership instead of catching the KeyError since building the
+                # Xarray KeyError message is slow for datasets with many variables.
+                if 'qc_' + var_name in self._ds.variables:
                     qc_var_name = 'qc_' + var_name
-                except KeyError:
+                else:
                     qc_var_name = self._ds.qcfilter.create_qc_variable(
                         var_name, flag_type=flag_type
                     )
@@ -180,13 +182,11 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
 
         # Create the QC variable filled with 0 values matching the
         # shape of data variable.
-        try:
-            qc_data = dask.array.from_array(
-                np.zeros_like(self._ds[var_name].values, dtype=np.int32),
-                chunks=self._ds[var_name].data.chunksize,
-            )
-        except AttributeError:
-            qc_data = np.zeros_like(self._ds[var_name].values, dtype=np.int32)
+        data = self._ds[var_name].data
+        if isinstance(data, dask.array.Array):
+            qc_data = dask.array.zeros(data.shape, dtype=np.int32, chunks=data.chunks)
+        else:
+            qc_data = np.zeros_like(data, dtype=np.int32)
 
         # Updating to use coords instead of dim, which caused a loss of
         # attribuets as noted in Issue 347
@@ -198,7 +198,7 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
 
         # Update if using flag_values and don't want 0 to be default value.
         if flag_type and flag_values_set_value != 0:
-            self._ds[qc_var_name].values = self._ds[qc_var_name].values + int(flag_values_set_value)
+            self._ds[qc_var_name].data = self._ds[qc_var_name].data + int(flag_values_set_value)
 
         # Add requried variable attributes.
         if flag_type:
@@ -319,8 +319,8 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
 
         # This ensures the indexing will work even if given float values.
         # Preserves tuples from np.where() or boolean arrays for standard
-        # python indexing.
-        if index is not None and not isinstance(index, (np.ndarray, tuple)):
+        # python indexing and dask boolean arrays for lazy indexing.
+        if index is not None and not isinstance(index, (np.ndarray, tuple, dask.array.Array)):
             index = np.array(index)
             if index.dtype.kind not in np.typecodes['AllInteger']:
                 index = index.astype(int)
@@ -341,24 +341,9 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
             except KeyError:
                 self._ds[qc_var_name].attrs['flag_values'] = [test_number]
         else:
-            # Determine if flag_masks test number is too large for current data type.
-            # If so up convert data type.
-            flag_masks = np.array(self._ds[qc_var_name].attrs['flag_masks'])
-            mask_dtype = flag_masks.dtype
-            if not np.issubdtype(mask_dtype, np.integer):
-                mask_dtype = np.uint32
-
-            if np.iinfo(mask_dtype).max - set_bit(0, test_number) <= -1:
-                if mask_dtype == np.int8 or mask_dtype == np.uint8:
-                    mask_dtype = np.uint16
-                elif mask_dtype == np.int16 or mask_dtype == np.uint16:
-                    mask_dtype = np.uint32
-                elif mask_dtype == np.int32 or mask_dtype == np.uint32:
-                    mask_dtype = np.uint64
-
-            flag_masks = flag_masks.astype(mask_dtype)
-            flag_masks = np.append(flag_masks, np.array(set_bit(0, test_number), dtype=mask_dtype))
-            self._ds[qc_var_name].attrs['flag_masks'] = list(flag_masks)
+            self._ds[qc_var_name].attrs['flag_masks'] = append_flag_mask(
+                self._ds[qc_var_name].attrs['flag_masks'], test_number
+            )
 
         try:
             self._ds[qc_var_name].attrs['flag_meanings'].append(test_meaning)
@@ -499,9 +484,11 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
         ----------
         var_name : str
             Data variable name.
-        index : int or list or numpy array
+        index : int or list or numpy array or dask array
             Index to set test in quality control array. If want to
             unset all values will need to pass in index of all values.
+            A dask boolean array the same shape as the quality control
+            array is applied lazily.
         test_number : int
             Test number to set.
         flag_value : boolean
@@ -518,6 +505,33 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
 
         qc_var_name = self._ds.qcfilter.check_for_ancillary_qc(var_name)
 
+        # If the quality control variable is a dask array build the update
+        # lazily so the full array is never loaded into memory.
+        qc_data = self._ds[qc_var_name].data
+        if isinstance(qc_data, dask.array.Array) and qc_data.ndim > 0:
+            if not np.issubdtype(qc_data.dtype, np.integer):
+                qc_data = qc_data.astype(int)
+
+            dtype = qc_dtype_for_test(qc_data.dtype, test_number)
+            if dtype != qc_data.dtype:
+                qc_data = qc_data.astype(dtype)
+
+            if index is not None:
+                if flag_value:
+                    mask = _index_mask(index, qc_data.shape, qc_data.chunks)
+                    qc_data = dask.array.where(mask, dtype.type(test_number), qc_data)
+                elif bool(np.shape(index)):
+                    mask = _index_mask(index, qc_data.shape, qc_data.chunks)
+                    qc_data = dask.array.where(mask, set_bit(qc_data, test_number), qc_data)
+                elif index == 0:
+                    qc_data = set_bit(qc_data, test_number)
+
+            self._ds[qc_var_name].data = qc_data
+            return
+
+        if isinstance(index, dask.array.Array):
+            index = index.compute()
+
         qc_variable = np.array(self._ds[qc_var_name].values)
 
         # Ensure the qc_variable data type is integer. This ensures bitwise comparison
@@ -527,15 +541,8 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
 
         # Determine if test number is too large for current data type. If so
         # up convert data type.
-        dtype = qc_variable.dtype
-        if np.iinfo(dtype).max - set_bit(0, test_number) < -1:
-            if dtype == np.int8:
-                dtype = np.int16
-            elif dtype == np.int16:
-                dtype = np.int32
-            elif dtype == np.int32:
-                dtype = np.int64
-
+        dtype = qc_dtype_for_test(qc_variable.dtype, test_number)
+        if dtype != qc_variable.dtype:
             qc_variable = qc_variable.astype(dtype)
 
         if index is not None:
@@ -599,6 +606,24 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
         if var_name is not None:
             qc_var_name = self._ds.qcfilter.check_for_ancillary_qc(var_name)
 
+        qc_data = self._ds[qc_var_name].data
+        if isinstance(qc_data, dask.array.Array):
+            if not np.issubdtype(qc_data.dtype, np.integer):
+                qc_data = qc_data.astype(int)
+
+            mask = _index_mask(index, qc_data.shape, qc_data.chunks)
+            if flag_value:
+                reset_value = qc_data.dtype.type(flag_values_reset_value)
+                qc_data = dask.array.where(mask, reset_value, qc_data)
+            else:
+                qc_data = dask.array.where(mask, unset_bit(qc_data, test_number), qc_data)
+
+            self._ds[qc_var_name].data = qc_data
+            return
+
+        if isinstance(index, dask.array.Array):
+            index = index.compute()
+
         # Get QC variable
         qc_variable = self._ds[qc_var_name].values
 
@@ -689,6 +714,7 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
         qc_var_name=None,
         flag_value=False,
         return_index=False,
+        return_dask=False,
     ):
         """
         Returns a numpy array of False or True where a particular
@@ -708,10 +734,14 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
         return_index : boolean
             Return a numpy array of index numbers into QC array where the
             test is set instead of False or True mask.
+        return_dask : boolean
+            If the quality control variable is a dask array return the mask
+            as a lazy dask boolean array instead of computing it. Ignored if
+            return_index is True.
 
         Returns
         -------
-        test_mask : numpy bool array or numpy integer array
+        test_mask : numpy bool array or numpy integer array or dask bool array
             A numpy boolean array with False or True where the test number or
             bit was set, or numpy integer array of indexes where test is True.
 
@@ -764,23 +794,16 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
         if var_name is not None:
             qc_var_name = self._ds.qcfilter.check_for_ancillary_qc(var_name)
 
-        qc_variable = self._ds[qc_var_name].values
-        # Ensure the qc_variable data type is integer. This ensures bitwise comparison
-        # will not cause an error.
-        if qc_variable.dtype.kind not in np.typecodes['AllInteger']:
-            qc_variable = qc_variable.astype(int)
+        test_mask = _qc_test_mask(self._ds[qc_var_name].data, test_number, flag_value)
+        if isinstance(test_mask, dask.array.Array):
+            if return_dask and not return_index:
+                return test_mask
 
-        if flag_value:
-            tripped = qc_variable == test_number
-        else:
-            check_bit = set_bit(0, test_number) & qc_variable
-            tripped = check_bit > 0
+            test_mask = test_mask.compute()
 
-        test_mask = np.full(qc_variable.shape, False, dtype='bool')
         # Make sure test_mask is an array. If qc_variable is scalar will
-        # be retuned from np.zeros as scalar.
+        # be retuned as scalar.
         test_mask = np.atleast_1d(test_mask)
-        test_mask[tripped] = True
         test_mask = np.ma.make_mask(test_mask, shrink=False)
 
         if return_index:
@@ -797,6 +820,7 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
         ma_fill_value=None,
         return_inverse=False,
         return_mask_only=False,
+        return_dask=False,
     ):
         """
         Returns a numpy masked array containing data and mask or
@@ -825,6 +849,10 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
             where failing.
         return_mask_only : boolean
             Return the boolean mask only as a numpy array.
+        return_dask : boolean
+            If the data or quality control variable is a dask array return a
+            lazy dask array (or dask masked array) instead of computing the
+            result. The mask is built chunk by chunk when computed.
 
         Returns
         -------
@@ -835,6 +863,8 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
             If return_nan_array is True will return numpy array upconverted
             to float with locations where the test with requested assessment
             or test number was found set converted to NaN.
+            If return_dask is True and the data or quality control variable
+            is a dask array the same results are returned as dask arrays.
 
         Examples
         --------
@@ -904,27 +934,44 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
         test_numbers = list(set(test_numbers))
 
         # Create mask of indexes by looking where each test is set
-        variable = self._ds[var_name].values
+        variable = self._ds[var_name].data
         nan_dtype = np.float32
         if variable.dtype in (np.float64, np.int64):
             nan_dtype = np.float64
 
-        try:
-            # Get shape of mask from QC variable since there is a chance it will
-            # be a different shape than data variable.
+        # Get shape of mask from QC variable since there is a chance it will
+        # be a different shape than data variable. All requested tests are
+        # combined into one bit mask or set of flag values and checked in one pass.
+        if qc_var_name is not None and len(test_numbers) > 0:
+            mask = _qc_test_mask(self._ds[qc_var_name].data, test_numbers, flag_value)
+        elif qc_var_name is not None and qc_var_name in self._ds:
             mask = np.zeros(self._ds[qc_var_name].shape, dtype=bool)
-        except KeyError:
+        else:
             # If there is no QC variable make mask from shape of data variable.
             mask = np.zeros(self._ds[var_name].shape, dtype=bool)
 
-        for test in test_numbers:
-            qc_test_mask = self._ds.qcfilter.get_qc_test_mask(var_name, test, flag_value=flag_value)
-            mask = mask | qc_test_mask
+        if return_dask and (
+            isinstance(variable, dask.array.Array) or isinstance(mask, dask.array.Array)
+        ):
+            return _lazy_masked_data(
+                variable,
+                mask,
+                nan_dtype,
+                return_nan_array=return_nan_array,
+                ma_fill_value=ma_fill_value,
+                return_inverse=return_inverse,
+                return_mask_only=return_mask_only,
+            )
+
+        if isinstance(mask, dask.array.Array):
+            mask = mask.compute()
 
         # If requested only return the mask.
         if return_mask_only:
             return mask
 
+        variable = np.asarray(variable)
+
         # Convert data numpy array into masked array
         try:
             variable = np.ma.array(variable, mask=mask, fill_value=ma_fill_value)
@@ -1051,25 +1098,33 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
                 continue
 
             # Need to return data as Numpy array with NaN values. Setting the Dask array
-            # to Numpy masked array does not work with other tools.
+            # to Numpy masked array does not work with other tools. If data is stored
+            # as a Dask array the filtering is added lazily to the Dask array.
             data = self.get_masked_data(
-                var_name, rm_assessments=rm_assessments, rm_tests=rm_tests, return_nan_array=True
+                var_name,
+                rm_assessments=rm_assessments,
+                rm_tests=rm_tests,
+                return_nan_array=True,
+                return_dask=True,
             )
 
-            if no_NaN:
-                missing_value = get_missing_value(self._ds, var_name, add_if_missing_in_ds=True)
-                index = np.isnan(data)
-                if np.any(index):
-                    data[index] = missing_value
+            if isinstance(data, dask.array.Array):
+                if no_NaN:
+                    missing_value = get_missing_value(self._ds, var_name, add_if_missing_in_ds=True)
+                    data = dask.array.where(dask.array.isnan(data), missing_value, data)
 
-            # If data was orginally stored as Dask array return values to Dataset as Dask array
-            # else set as Numpy array.
-            try:
-                self._ds[var_name].data = dask.array.from_array(
-                    data, chunks=self._ds[var_name].data.chunksize
-                )
+                if not isinstance(self._ds[var_name].data, dask.array.Array):
+                    data = data.compute()
+
+                self._ds[var_name].data = data
+
+            else:
+                if no_NaN:
+                    missing_value = get_missing_value(self._ds, var_name, add_if_missing_in_ds=True)
+                    index = np.isnan(data)
+                    if np.any(index):
+                        data[index] = missing_value
 
-            except AttributeError:
                 self._ds[var_name].values = data
 
             # Adding information on filtering to history attribute
@@ -1126,6 +1181,242 @@ class QCFilter(qctests.QCTests, comparison_tests.QCTests, bsrn_tests.QCTests, qc
                 if verbose:
                     print(f'Deleting {qc_var_name} from dataset')
 
+    def get_qc_test_statistics(
+        self, variables=None, freq=None, time_dim='time', chunk_size=1000000
+    ):
+        """
+        Method to count the number and fraction of values failing each quality
+        control test for each data variable, optionally binned in time. The
+        quality control arrays are decoded in blocks along the time dimension
+        so only chunk_size values are held in memory at once, including
+        for dask arrays.
+
+        Parameters
+        ----------
+        variables : None or str or list of str
+            Data variable names to process. If set to None will process all
+            data variables with a quality control variable.
+        freq : None or str
+            Fixed pandas frequency string used to bin the time dimension,
+            for example '1h' or '1D'. If None counts are for the whole dataset.
+        time_dim : str
+            Name of the time dimension.
+        chunk_size : int
+            Approximate number of quality control values to decode at once.
+
+        Returns
+        -------
+        stats : pandas.DataFrame
+            DataFrame with one row per variable, test and time bin with columns
+            variable, qc_variable, test_number, test_meaning, test_assessment,
+            time (only if freq is set), failed, total and fraction. Counts for
+            several files can be combined by summing failed and total.
+
+        Examples
+        --------
+            .. code-block:: python
+
+                from act.io.arm import read_arm_netcdf
+                from act.tests import EXAMPLE_MET1
+
+                ds = read_arm_netcdf(EXAMPLE_MET1, cleanup_qc=True)
+                ds.qcfilter.add_less_test('temp_mean', 0.0)
+                stats = ds.qcfilter.get_qc_test_statistics('temp_mean', freq='1h')
+
+        """
+        if variables is None:
+            variables = list(self._ds.data_vars)
+        elif isinstance(variables, str):
+            variables = [variables]
+
+        bin_times = None
+        bin_index = None
+        if freq is not None:
+            bin_times, bin_index = np.unique(
+                pd.DatetimeIndex(self._ds[time_dim].values).floor(freq), return_inverse=True
+            )
+            bin_index = bin_index.ravel()
+
+        frames = []
+        for var_name in variables:
+            qc_var_name = self.check_for_ancillary_qc(var_name, add_if_missing=False, cleanup=False)
+            if qc_var_name is None or self._ds[qc_var_name].ndim == 0:
+                continue
+
+            qc_var = self._ds[qc_var_name]
+            if time_dim in qc_var.dims:
+                qc_var = qc_var.transpose(time_dim, ...)
+            elif freq is not None:
+                continue
+
+            flag_value = 'flag_masks' not in qc_var.attrs and 'flag_values' in qc_var.attrs
+            if flag_value:
+                tests = np.array(qc_var.attrs['flag_values'], dtype=int)
+            else:
+                tests = np.array(
+                    [parse_bit(mask)[0] for mask in qc_var.attrs.get('flag_masks', [])], dtype=int
+                )
+            meanings = list(qc_var.attrs.get('flag_meanings', [''] * tests.size))
+            assessments = list(qc_var.attrs.get('flag_assessments', [''] * tests.size))
+
+            num_bins = 1 if freq is None else bin_times.size
+            failed = np.zeros((num_bins, tests.size), dtype=np.int64)
+            total = np.zeros(num_bins, dtype=np.int64)
+
+            qc_data = qc_var.data
+            num_samples = int(np.prod(qc_data.shape[1:]))
+            num_rows = max(1, chunk_size // max(num_samples, 1))
+            for start in range(0, qc_data.shape[0], num_rows):
+                block = np.asarray(qc_data[start : start + num_rows])
+                block = block.reshape(block.shape[0], -1)
+                if not np.issubdtype(block.dtype, np.integer):
+                    block = block.astype(int)
+
+                if flag_value:
+                    row_failed = np.sum(block[:, :, np.newaxis] == tests, axis=1)
+                else:
+                    # Tests beyond the size of the data type can not be set.
+                    num_bits = min(tests.max(initial=0), block.dtype.itemsize * 8)
+                    bit_failed = unpack_bits(block, num_bits=num_bits).sum(axis=1)
+                    row_failed = np.zeros((block.shape[0], tests.size), dtype=np.int64)
+                    in_range = (tests >= 1) & (tests <= num_bits)
+                    row_failed[:, in_range] = bit_failed[:, tests[in_range] - 1]
+
+                if freq is None:
+                    failed[0] += row_failed.sum(axis=0)
+                    total[0] += block.size
+                else:
+                    row_bins = bin_index[start : start + block.shape[0]]
+                    np.add.at(failed, row_bins, row_failed)
+                    np.add.at(total, row_bins, block.shape[1])
+
+            stats = {
+                'variable': var_name,
+                'qc_variable': qc_var_name,
+                'test_number': np.tile(tests, num_bins),
+                'test_meaning': np.tile(np.array(meanings, dtype=object), num_bins),
+                'test_assessment': np.tile(np.array(assessments, dtype=object), num_bins),
+            }
+            if freq is not None:
+                stats['time'] = np.repeat(bin_times, tests.size)
+            stats['failed'] = failed.ravel()
+            stats['total'] = np.repeat(total, tests.size)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                stats['fraction'] = stats['failed'] / stats['total']
+            frames.append(pd.DataFrame(stats))
+
+        if len(frames) == 0:
+            columns = ['variable', 'qc_variable', 'test_number', 'test_meaning', 'test_assessment']
+            if freq is not None:
+                columns.append('time')
+            return pd.DataFrame(columns=columns + ['failed', 'total', 'fraction'])
+
+        return pd.concat(frames, ignore_index=True)
+
+
+def _index_mask(index, shape, chunks):
+    """
+    Converts an index into a quality control array to a lazy dask boolean mask
+    with the requested chunks. Each chunk of the mask is built from only the
+    index values that fall within it.
+
+    """
+    if isinstance(index, dask.array.Array):
+        if index.dtype == np.bool_ and index.shape == tuple(shape):
+            return index.rechunk(chunks)
+        index = index.compute()
+
+    if isinstance(index, np.ndarray) and index.dtype == np.bool_ and index.shape == tuple(shape):
+        return dask.array.from_array(index, chunks=chunks)
+
+    # Convert to a tuple of integer positions along the leading dimensions.
+    if isinstance(index, tuple):
+        positions = tuple(np.asarray(ii, dtype=int).ravel() for ii in index)
+    else:
+        index = np.asarray(index)
+        if index.dtype == np.bool_:
+            positions = np.nonzero(index)
+        else:
+            positions = (index.astype(int).ravel(),)
+    positions = tuple(np.where(pos < 0, pos + shape[dim], pos) for dim, pos in enumerate(positions))
+
+    def _mask_block(block_info=None):
+        location = block_info[None]['array-location']
+        mask = np.zeros(block_info[None]['chunk-shape'], dtype=bool)
+        keep = np.ones(positions[0].size, dtype=bool)
+        for dim, pos in enumerate(positions):
+            keep &= (pos >= location[dim][0]) & (pos < location[dim][1])
+        mask[tuple(pos[keep] - location[dim][0] for dim, pos in enumerate(positions))] = True
+        return mask
+
+    return dask.array.map_blocks(
+        _mask_block, chunks=chunks, dtype=bool, meta=np.array((), dtype=bool)
+    )
+
+
+def _qc_test_mask(qc_data, test_numbers, flag_value=False):
+    """
+    Returns a boolean array where any of the test numbers are set in the
+    quality control data. The bits for all tests are combined into one mask
+    so the data are only checked once. Stays lazy if qc_data is a dask array.
+
+    """
+    test_numbers = np.atleast_1d(test_numbers).astype(int)
+
+    # Ensure the qc_data data type is integer. This ensures bitwise comparison
+    # will not cause an error.
+    if not np.issubdtype(qc_data.dtype, np.integer):
+        qc_data = qc_data.astype(int)
+
+    if flag_value:
+        if test_numbers.size == 1:
+            return qc_data == test_numbers[0]
+        if isinstance(qc_data, dask.array.Array):
+            return dask.array.isin(qc_data, test_numbers)
+        return np.isin(qc_data, test_numbers)
+
+    combined = 0
+    for test_number in test_numbers:
+        combined = set_bit(combined, int(test_number))
+
+    # Wrap the combined mask into the QC data type so the highest bit of a
+    # signed type can be checked without overflow.
+    combined = np.array(combined, dtype=np.uint64).astype(qc_data.dtype)
+
+    return (qc_data & combined) != 0
+
+
+def _lazy_masked_data(
+    variable,
+    mask,
+    nan_dtype,
+    return_nan_array=False,
+    ma_fill_value=None,
+    return_inverse=False,
+    return_mask_only=False,
+):
+    """
+    Dask version of the returned values from QCFilter.get_masked_data().
+
+    """
+    mask = dask.array.asarray(mask)
+    if return_mask_only:
+        return mask
+
+    if return_inverse:
+        mask = ~mask
+
+    variable = dask.array.asarray(variable)
+    if return_nan_array:
+        return dask.array.where(mask, np.nan, variable.astype(nan_dtype))
+
+    if ma_fill_value is not None and not np.can_cast(
+        np.array(ma_fill_value).dtype, variable.dtype, casting='same_kind'
+    ):
+        variable = variable.astype(np.array(ma_fill_value).dtype)
+
+    return dask.array.ma.masked_array(variable, mask=mask, fill_value=ma_fill_value)
+
 
 def set_bit(array, bit_number):
     """
@@ -1235,6 +1526,82 @@ def unset_bit(array, bit_number):
     return array
 
 
+def append_flag_mask(flag_masks, test_number):
+    """
+    Function to append the bit mask for a test number to a list of flag_masks,
+    up converting the data type of all masks if the new mask is too large for
+    the current data type.
+
+    Parameters
+    ----------
+    flag_masks : list of int or numpy array
+        Current flag_masks attribute values.
+    test_number : int
+        The bit (or test) number to add starting at 1.
+
+    Returns
+    -------
+    flag_masks : list
+        List of bit masks including the new test.
+
+    Examples
+    --------
+        .. code-block:: python
+
+            from act.qc.qcfilter import append_flag_mask
+            append_flag_mask([1, 2], 3)
+            [np.uint32(1), np.uint32(2), np.uint32(4)]
+
+    """
+    flag_masks = np.array(flag_masks)
+    mask_dtype = flag_masks.dtype
+    if not np.issubdtype(mask_dtype, np.integer):
+        mask_dtype = np.uint32
+
+    if np.iinfo(mask_dtype).max - set_bit(0, test_number) <= -1:
+        if mask_dtype == np.int8 or mask_dtype == np.uint8:
+            mask_dtype = np.uint16
+        elif mask_dtype == np.int16 or mask_dtype == np.uint16:
+            mask_dtype = np.uint32
+        elif mask_dtype == np.int32 or mask_dtype == np.uint32:
+            mask_dtype = np.uint64
+
+    flag_masks = flag_masks.astype(mask_dtype)
+    flag_masks = np.append(flag_masks, np.array(set_bit(0, test_number), dtype=mask_dtype))
+
+    return list(flag_masks)
+
+
+def qc_dtype_for_test(dtype, test_number):
+    """
+    Function to determine the integer data type needed for a quality control
+    array to hold the bit for a test number.
+
+    Parameters
+    ----------
+    dtype : numpy dtype
+        Current integer data type of the quality control array.
+    test_number : int
+        The bit (or test) number to be set starting at 1.
+
+    Returns
+    -------
+    dtype : numpy dtype
+        Data type large enough to store the test bit.
+
+    """
+    dtype = np.dtype(dtype)
+    if np.iinfo(dtype).max - set_bit(0, test_number) < -1:
+        if dtype == np.int8:
+            dtype = np.dtype(np.int16)
+        elif dtype == np.int16:
+            dtype = np.dtype(np.int32)
+        elif dtype == np.int32:
+            dtype = np.dtype(np.int64)
+
+    return dtype
+
+
 def parse_bit(qc_bit):
     """
     Given a single integer value, return bit positions.
@@ -1299,3 +1666,55 @@ def parse_bit(qc_bit):
     bit_number = np.asarray(bit_number, dtype=np.int32)
 
     return bit_number
+
+
+def unpack_bits(qc_data, num_bits=None):
+    """
+    Function to expand a bit packed quality control array into boolean bit
+    planes, one for each bit (test) number, in a single pass.
+
+    Parameters
+    ----------
+    qc_data : int, list of int or numpy array of int
+        Bit packed quality control values of any integer type up to 64 bits.
+    num_bits : int or None
+        Number of bits (tests) to return starting at bit 1. If None will return
+        all bits of the data type.
+
+    Returns
+    -------
+    bit_planes : numpy bool array
+        Array with shape of qc_data plus a last dimension of size num_bits.
+        bit_planes[..., 0] is True where bit (test) number 1 is set.
+
+    Examples
+    --------
+        .. code-block:: python
+
+            from act.qc.qcfilter import unpack_bits
+
+            unpack_bits([0, 1, 6], num_bits=3)
+            array([[False, False, False],
+                   [ True, False, False],
+                   [False,  True,  True]])
+
+    """
+    qc_data = np.asarray(qc_data)
+    if not np.issubdtype(qc_data.dtype, np.integer):
+        qc_data = qc_data.astype(np.int64)
+
+    itemsize = qc_data.dtype.itemsize
+    if num_bits is None:
+        num_bits = itemsize * 8
+    if num_bits > itemsize * 8:
+        raise ValueError(f'num_bits must be less than or equal to {itemsize * 8}.')
+
+    # View the values as little endian bytes so bit number 1 is the first bit
+    # of the first byte, then unpack all the bytes at once.
+    shape = qc_data.shape
+    values = np.ascontiguousarray(qc_data.reshape(-1), dtype=qc_data.dtype.newbyteorder('<'))
+    bit_planes = np.unpackbits(
+        values.view(np.uint8).reshape(-1, itemsize), axis=1, count=num_bits, bitorder='little'
+    )
+
+    return bit_planes.view(bool).reshape(shape + (num_bits,))
@@ -15,7 +15,197 @@ import numpy as np
 import pandas as pd
 import xarray as xr
 
-from act.utils.data_utils import convert_units, get_missing_value
+from act.utils.data_utils import convert_units, get_missing_value, rolling_mean_std
+
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Definitions of the simple limit tests that can be applied together with
+# QCTests.apply_tests(). Each entry lists the limit keyword names, the default
+# limit attribute names for warning and failing assessments, the default test
+# meaning and the function returning the mask where the test is tripped.
+_LIMIT_TESTS = {
+    'less': (
+        ['limit_value'],
+        (['warn_min'], ['fail_min']),
+        'Data value less than {}.',
+        np.less,
+    ),
+    'greater': (
+        ['limit_value'],
+        (['warn_max'], ['fail_max']),
+        'Data value greater than {}.',
+        np.greater,
+    ),
+    'less_equal': (
+        ['limit_value'],
+        (['warn_min'], ['fail_min']),
+        'Data value less than or equal to {}.',
+        np.less_equal,
+    ),
+    'greater_equal': (
+        ['limit_value'],
+        (['warn_max'], ['fail_max']),
+        'Data value greater than or equal to {}.',
+        np.greater_equal,
+    ),
+    'equal_to': (
+        ['limit_value'],
+        (['warn_equal_to'], ['fail_equal_to']),
+        'Data value equal to {}.',
+        np.equal,
+    ),
+    'not_equal_to': (
+        ['limit_value'],
+        (['warn_not_equal_to'], ['fail_not_equal_to']),
+        'Data value not equal to {}.',
+        np.not_equal,
+    ),
+    'outside': (
+        ['limit_value_lower', 'limit_value_upper'],
+        (['warn_lower_range', 'warn_upper_range'], ['fail_lower_range', 'fail_upper_range']),
+        'Data value less than {} or greater than {}.',
+        lambda data, lower, upper: np.ma.getmaskarray(np.ma.masked_outside(data, lower, upper)),
+    ),
+    'inside': (
+        ['limit_value_lower', 'limit_value_upper'],
+        (
+            ['warn_lower_range_inner', 'warn_upper_range_inner'],
+            ['fail_lower_range_inner', 'fail_upper_range_inner'],
+        ),
+        'Data value greater than {} or less than {}.',
+        lambda data, lower, upper: np.ma.getmaskarray(np.ma.masked_inside(data, lower, upper)),
+    ),
+}
+
+
+def _missing_value_for_test(ds, var_name, missing_value=None):
+    """
+    Returns the missing value used by the missing value test as a numpy
+    value matching the data type of the data variable.
+
+    """
+    if missing_value is None:
+        missing_value = get_missing_value(ds, var_name, nodefault=True)
+        if missing_value is None and ds[var_name].values.dtype.type in (
+            float,
+            np.float16,
+            np.float32,
+            np.float64,
+        ):
+            missing_value = float('nan')
+        else:
+            missing_value = -9999
+
+    # Ensure missing_value attribute is matching data type
+    missing_value = np.array(missing_value, dtype=ds[var_name].values.dtype.type)
+
+    return missing_value
+
+
+def _cusum_loop(data, mean_val, k):
+    """
+    CUSUM loop over the first dimension of a 2D array. Compiled with numba
+    when available.
+
+    """
+    C = np.zeros(data.shape, dtype=np.float64)
+    for jj in range(data.shape[1]):
+        upper = 0.0
+        lower = 0.0
+        for ii in range(1, data.shape[0]):
+            value = data[ii, jj] - mean_val[jj]
+            lower = lower - (value + k)
+            upper = upper + (value - k)
+            # Comparisons with NaN are False so a missing value resets the sums to 0
+            lower = lower if lower > 0.0 else 0.0
+            upper = upper if upper > 0.0 else 0.0
+            C[ii, jj] = max(upper, lower)
+
+    return C
+
+
+if NUMBA_AVAILABLE:
+    _cusum_loop = numba.njit(cache=True)(_cusum_loop)
+
+
+def _cusum_accumulate(values):
+    """
+    Cumulative sum over the first dimension of a 2D array that is reset to 0
+    whenever it becomes negative and at the first and any NaN value. Uses
+    S[n] = P[n] - min(P[r:n + 1]) where P is the cumulative sum and r the index
+    of the last reset.
+
+    """
+    values = values.copy()
+    values[0] = np.nan
+    reset = np.isnan(values)
+    values[reset] = 0.0
+    total = np.cumsum(values, axis=0)
+
+    # Number the runs of values between resets for all columns together
+    segment = np.cumsum(reset.T.ravel())
+    running_min = pd.Series(total.T.ravel()).groupby(segment).cummin().to_numpy()
+
+    return total - running_min.reshape(total.T.shape).T
+
+
+def _cusum(data, k):
+    """
+    CUSUM algorithm used to detect step changes.
+
+    Parameters
+    ----------
+    data : numpy array
+        1D or 2D numpy array of time series data to analyze with time
+        as the first dimension. Each column of 2D data is processed separately.
+    k : float
+        Reference value. This is typically half the value of the shift size change to
+        to be detected or the size of the shift change if the data is detrended by
+        differencing.
+
+    Returns
+    -------
+    C : numpy array
+        Numpy array containing a 0 when there is no shift detected
+        or positive value when a shift is detected.
+
+    """
+    data = np.asarray(data, dtype=np.float64)
+    values = data.reshape(data.shape[0], -1)
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message='Mean of empty slice')
+        mean_val = np.nanmean(values, axis=0)
+
+    if NUMBA_AVAILABLE:
+        C = _cusum_loop(values, mean_val, float(k))
+    else:
+        C = np.maximum(
+            _cusum_accumulate(values - mean_val - k), _cusum_accumulate(mean_val - k - values)
+        )
+
+    return C.reshape(data.shape)
+
+
+def _dilate_flags(starts, n_flagged):
+    """
+    Returns a boolean array set to True for n_flagged values along the first
+    dimension beginning at each True value in starts.
+
+    """
+    if n_flagged <= 0:
+        return np.zeros(starts.shape, dtype=bool)
+
+    count = np.cumsum(starts, axis=0)
+    if n_flagged < count.shape[0]:
+        count[n_flagged:] = count[n_flagged:] - count[:-n_flagged]
+
+    return count > 0
 
 
 # This is a Mixins class used to allow using qcfilter class that is already
@@ -94,30 +284,15 @@ class QCTests:
         if prepend_text is not None:
             test_meaning = ': '.join((prepend_text, test_meaning))
 
-        if missing_value is None:
-            missing_value = get_missing_value(self._ds, var_name, nodefault=True)
-            if missing_value is None and self._ds[var_name].values.dtype.type in (
-                float,
-                np.float16,
-                np.float32,
-                np.float64,
-            ):
-                missing_value = float('nan')
-            else:
-                missing_value = -9999
-
-        # Ensure missing_value attribute is matching data type
-        missing_value = np.array(missing_value, dtype=self._ds[var_name].values.dtype.type)
+        missing_value = _missing_value_for_test(self._ds, var_name, missing_value)
 
         with warnings.catch_warnings():
             warnings.filterwarnings('ignore', category=RuntimeWarning)
             if use_dask and isinstance(self._ds[var_name].data, da.Array):
                 if np.isnan(missing_value) is False:
-                    index = da.where(
-                        self._ds[var_name].data == missing_value, True, False
-                    ).compute()
+                    index = da.where(self._ds[var_name].data == missing_value, True, False)
                 else:
-                    index = da.isnan(self._ds[var_name].data).compute()
+                    index = da.isnan(self._ds[var_name].data)
             else:
                 if np.isnan(missing_value) is False:
                     index = np.equal(self._ds[var_name].values, missing_value)
@@ -213,7 +388,7 @@ class QCTests:
         with warnings.catch_warnings():
             warnings.filterwarnings('ignore', category=RuntimeWarning)
             if use_dask and isinstance(self._ds[var_name].data, da.Array):
-                index = da.where(self._ds[var_name].data < limit_value, True, False).compute()
+                index = da.where(self._ds[var_name].data < limit_value, True, False)
             else:
                 index = np.less(self._ds[var_name].values, limit_value)
 
@@ -307,7 +482,7 @@ class QCTests:
         with warnings.catch_warnings():
             warnings.filterwarnings('ignore', category=RuntimeWarning)
             if use_dask and isinstance(self._ds[var_name].data, da.Array):
-                index = da.where(self._ds[var_name].data > limit_value, True, False).compute()
+                index = da.where(self._ds[var_name].data > limit_value, True, False)
             else:
                 index = np.greater(self._ds[var_name].values, limit_value)
 
@@ -406,7 +581,7 @@ class QCTests:
         with warnings.catch_warnings():
             warnings.filterwarnings('ignore', category=RuntimeWarning)
             if use_dask and isinstance(self._ds[var_name].data, da.Array):
-                index = da.where(self._ds[var_name].data <= limit_value, True, False).compute()
+                index = da.where(self._ds[var_name].data <= limit_value, True, False)
             else:
                 index = np.less_equal(self._ds[var_name].values, limit_value)
 
@@ -501,7 +676,7 @@ class QCTests:
         with warnings.catch_warnings():
             warnings.filterwarnings('ignore', category=RuntimeWarning)
             if use_dask and isinstance(self._ds[var_name].data, da.Array):
-                index = da.where(self._ds[var_name].data >= limit_value, True, False).compute()
+                index = da.where(self._ds[var_name].data >= limit_value, True, False)
             else:
                 index = np.greater_equal(self._ds[var_name].values, limit_value)
 
@@ -595,7 +770,7 @@ class QCTests:
         with warnings.catch_warnings():
             warnings.filterwarnings('ignore', category=RuntimeWarning)
             if use_dask and isinstance(self._ds[var_name].data, da.Array):
-                index = da.where(self._ds[var_name].data == limit_value, True, False).compute()
+                index = da.where(self._ds[var_name].data == limit_value, True, False)
             else:
                 index = np.equal(self._ds[var_name].values, limit_value)
 
@@ -689,7 +864,7 @@ class QCTests:
         with warnings.catch_warnings():
             warnings.filterwarnings('ignore', category=RuntimeWarning)
             if use_dask and isinstance(self._ds[var_name].data, da.Array):
-                index = da.where(self._ds[var_name].data != limit_value, True, False).compute()
+                index = da.where(self._ds[var_name].data != limit_value, True, False)
             else:
                 index = np.not_equal(self._ds[var_name].values, limit_value)
 
@@ -794,7 +969,7 @@ class QCTests:
             if use_dask and isinstance(self._ds[var_name].data, da.Array):
                 index1 = da.where(self._ds[var_name].data < limit_value_lower, True, False)
                 index2 = da.where(self._ds[var_name].data > limit_value_upper, True, False)
-                index = (index1 | index2).compute()
+                index = index1 | index2
             else:
                 data = np.ma.masked_outside(
                     self._ds[var_name].values, limit_value_lower, limit_value_upper
@@ -907,7 +1082,7 @@ class QCTests:
             if use_dask and isinstance(self._ds[var_name].data, da.Array):
                 index1 = da.where(self._ds[var_name].data > limit_value_lower, True, False)
                 index2 = da.where(self._ds[var_name].data < limit_value_upper, True, False)
-                index = (index1 & index2).compute()
+                index = index1 & index2
             else:
                 data = np.ma.masked_inside(
                     self._ds[var_name].values, limit_value_lower, limit_value_upper
@@ -951,7 +1126,7 @@ class QCTests:
         ignore_range=None,
     ):
         """
-        Method to perform a persistence test over 1-D data..
+        Method to perform a persistence test over data along the time dimension.
 
         Parameters
         ----------
@@ -968,7 +1143,7 @@ class QCTests:
             Setting to 1 so this correctly handles NaNs.
         center : boolean
             Optional where within the moving window to report the standard
-            deviation values. Used in the .rolling.std() calculation with xarray.
+            deviation values. If False the window ends at each value.
         test_meaning : None or str
             The optional text description to add to flag_meanings
             describing the test. Will add a default if not set.
@@ -998,8 +1173,11 @@ class QCTests:
 
         """
         data = self._ds[var_name]
-        if window > data.size:
-            window = data.size
+        axis = 0
+        if 'time' in data.dims:
+            axis = data.dims.index('time')
+        if window > data.shape[axis]:
+            window = data.shape[axis]
 
         if test_meaning is None:
             test_meaning = (
@@ -1013,12 +1191,14 @@ class QCTests:
 
         with warnings.catch_warnings():
             warnings.filterwarnings('ignore', category=RuntimeWarning)
-            stddev = data.rolling(time=window, min_periods=min_periods, center=True).std()
+            _, stddev = rolling_mean_std(
+                data.data, window, axis=axis, center=center, min_periods=min_periods
+            )
             index = stddev <= test_limit
 
-        if ignore_range is not None:
-            ignore_index = (data >= min(ignore_range)) & (data <= max(ignore_range))
-            index = index & ~ignore_index
+            if ignore_range is not None:
+                ignore_index = (data.data >= min(ignore_range)) & (data.data <= max(ignore_range))
+                index = index & ~ignore_index
 
         result = self._ds.qcfilter.add_test(
             var_name,
@@ -1613,7 +1793,7 @@ class QCTests:
             if use_dask and isinstance(self._ds[var_name].data, da.Array):
                 index1 = da.where(self._ds[var_name].data < lower_limit, True, False)
                 index2 = da.where(self._ds[var_name].data > upper_limit, True, False)
-                index = (index1 | index2).compute()
+                index = index1 | index2
             else:
                 index = (self._ds[var_name].values > upper_limit) | (
                     self._ds[var_name].values < lower_limit
@@ -1645,6 +1825,8 @@ class QCTests:
     ):
         """
         Method to detect a shift change in values using the CUSUM (cumulative sum control chart) test.
+        Data variables with a second dimension, such as height, have each column tested
+        separately along the first (time) dimension.
 
         Parameters
         ----------
@@ -1693,34 +1875,6 @@ class QCTests:
 
         """
 
-        def cusum(data, k):
-            """
-            CUSUM algorithm used to detect step changes.
-
-            data : numpy array
-                1D numpy array of time series data to analze
-            k : float
-                Reference value. This is typically half the value of the shift size change to
-                to be detected or the size of the shift change if the data is detrended by
-                differencing.
-
-            Returns
-            -------
-            C : numpy array
-                Numpy array containing a 0 when there is no shift detected
-                or positive value when a shift is detected.
-
-            """
-
-            mean_val = np.nanmean(data)
-            Cu = np.zeros(data.size, dtype=np.float16)
-            Cl = np.zeros(data.size, dtype=np.float16)
-            for ii in range(1, data.size):
-                Cl[ii] = max(0.0, Cl[ii - 1] - (data[ii] - mean_val + k))
-                Cu[ii] = max(0.0, Cu[ii - 1] + (data[ii] - mean_val - k))
-
-            return np.maximum(Cu, Cl)
-
         data = self._ds[var_name].values
         if add_nan:
             from act.utils.data_utils import add_in_nan
@@ -1729,24 +1883,22 @@ class QCTests:
 
         data = data.astype(float)
         if detrend:
-            data = np.diff(data)
-            data = np.append(np.nan, data)
+            data = np.diff(data, axis=0)
+            data = np.concatenate([np.full((1,) + data.shape[1:], np.nan), data])
 
         if n_flagged < 0:
-            n_flagged = data.size
+            n_flagged = data.shape[0]
 
-        index = np.full(data.size, False)
-        C = cusum(data, k)
-        found_ind = np.where(np.diff(C) > 0.0)[0]
-        for ind in found_ind:
-            ind = np.arange(ind, ind + n_flagged)
-            ind = ind[ind < data.size]
-            index[ind] = True
+        # Flag n_flagged time steps starting at each increase in the CUSUM value
+        C = _cusum(data, k)
+        starts = np.zeros(C.shape, dtype=bool)
+        starts[:-1] = np.diff(C, axis=0) > 0.0
+        index = _dilate_flags(starts, n_flagged)
 
         if add_nan:
             import xarray as xr
 
-            da = xr.DataArray(index, dims=['time'], coords=[time])
+            da = xr.DataArray(index, dims=self._ds[var_name].dims, coords={'time': time})
             da = da.sel(time=self._ds['time'])
             index = da.values
             del da
@@ -1767,3 +1919,200 @@ class QCTests:
         )
 
         return result
+
+    def apply_tests(self, tests, flag_value=False):
+        """
+        Method to apply many tests to many data variables in one call. For each data
+        variable the data is read once, all test masks are computed with NumPy, test
+        numbers are determined once and the quality control variable data and
+        flag_masks, flag_meanings and flag_assessments attributes are written once.
+        The results are identical to calling the individual add test methods in the
+        order listed.
+
+        Parameters
+        ----------
+        tests : dict
+            Dictionary with data variable names as keys and a list of dictionaries
+            describing the tests to apply as values. Each test dictionary must have a
+            'test' key with one of 'missing_value', 'less', 'greater', 'less_equal',
+            'greater_equal', 'equal_to', 'not_equal_to', 'outside' or 'inside'. The other
+            keys are the keywords of the matching add_<test>_test() method, for example
+            limit_value, limit_value_lower, limit_value_upper, test_meaning,
+            test_assessment, test_number, limit_attr_name, limit_attr_names, prepend_text,
+            missing_value and missing_value_att_name.
+        flag_value : boolean
+            Indicates that the tests are stored as integers
+            not bit packed values in quality control variable.
+
+        Returns
+        -------
+        results : dict
+            Dictionary with data variable names as keys and a list of the test
+            information dictionaries returned by add_test() as values. Tests with a
+            limit value of None are skipped and return None.
+
+        Examples
+        --------
+            .. code-block:: python
+
+                from act.io.arm import read_arm_netcdf
+                from act.tests import EXAMPLE_MET1
+
+                ds = read_arm_netcdf(EXAMPLE_MET1)
+                tests = {
+                    'temp_mean': [
+                        {'test': 'less', 'limit_value': -40},
+                        {'test': 'greater', 'limit_value': 50},
+                    ],
+                    'rh_mean': [
+                        {'test': 'outside', 'limit_value_lower': 0, 'limit_value_upper': 100},
+                        {'test': 'greater', 'limit_value': 99, 'test_assessment': 'Suspect'},
+                    ],
+                }
+                results = ds.qcfilter.apply_tests(tests)
+
+        """
+        from act.qc.qcfilter import append_flag_mask, parse_bit, qc_dtype_for_test, set_bit
+
+        results = {}
+        for var_name, var_tests in tests.items():
+            for test in var_tests:
+                if test.get('test') not in list(_LIMIT_TESTS) + ['missing_value']:
+                    raise ValueError(
+                        f'Test "{test.get("test")}" for {var_name} is not a known test. '
+                        f'Options are {["missing_value"] + list(_LIMIT_TESTS)}'
+                    )
+
+            # Tests with a single limit set to None are skipped
+            if all(
+                len(_LIMIT_TESTS[test['test']][0]) == 1 and test.get('limit_value') is None
+                for test in var_tests
+                if test['test'] in _LIMIT_TESTS
+            ) and not any(test['test'] == 'missing_value' for test in var_tests):
+                results[var_name] = [None] * len(var_tests)
+                continue
+
+            # Scalar values are handled by the individual methods
+            if self._ds[var_name].ndim == 0:
+                results[var_name] = []
+                for test in var_tests:
+                    kwargs = {key: value for key, value in test.items() if key != 'test'}
+                    method = getattr(self._ds.qcfilter, f'add_{test["test"]}_test')
+                    results[var_name].append(method(var_name, flag_value=flag_value, **kwargs))
+                continue
+
+            qc_var_name = self._ds.qcfilter.check_for_ancillary_qc(var_name, flag_type=flag_value)
+            data = self._ds[var_name].values
+            qc_attrs = self._ds[qc_var_name].attrs
+            flag_masks = list(qc_attrs.get('flag_values' if flag_value else 'flag_masks', []))
+            flag_meanings = list(qc_attrs.get('flag_meanings', []))
+            flag_assessments = list(qc_attrs.get('flag_assessments', []))
+            limit_attrs = {}
+            data_attrs = {}
+
+            qc_variable = np.array(self._ds[qc_var_name].values)
+            if not np.issubdtype(qc_variable.dtype, np.integer):
+                qc_variable = qc_variable.astype(int)
+
+            # Determine test numbers, masks and attributes for all tests
+            var_results = []
+            set_tests = []
+            with warnings.catch_warnings():
+                warnings.filterwarnings('ignore', category=RuntimeWarning)
+                for test in var_tests:
+                    test_assessment = test.get('test_assessment', 'Bad')
+                    test_meaning = test.get('test_meaning')
+                    if test['test'] == 'missing_value':
+                        missing_value = _missing_value_for_test(
+                            self._ds, var_name, test.get('missing_value')
+                        )
+                        if test_meaning is None:
+                            test_meaning = 'Value is set to missing_value.'
+                        if np.isnan(missing_value) is False:
+                            index = np.equal(data, missing_value)
+                        else:
+                            index = np.isnan(data)
+                        data_attr_name = test.get('missing_value_att_name', 'missing_value')
+                        data_attrs.setdefault(data_attr_name, missing_value)
+                        limits = {}
+                    else:
+                        limit_names, default_attr_names, meaning, func = _LIMIT_TESTS[test['test']]
+                        limit_values = [test.get(name) for name in limit_names]
+                        if len(limit_names) == 1 and limit_values[0] is None:
+                            var_results.append(None)
+                            continue
+
+                        attr_names = test.get('limit_attr_names', test.get('limit_attr_name'))
+                        if attr_names is None:
+                            if test_assessment == 'Suspect' or test_assessment == 'Indeterminate':
+                                attr_names = default_attr_names[0]
+                            else:
+                                attr_names = default_attr_names[1]
+                        elif isinstance(attr_names, str):
+                            attr_names = [attr_names]
+
+                        if test_meaning is None:
+                            test_meaning = meaning.format(*attr_names)
+
+                        index = func(data, *limit_values)
+                        limits = {
+                            attr_name: np.array(limit_value, dtype=data.dtype.type)
+                            for attr_name, limit_value in zip(attr_names, limit_values)
+                        }
+
+                    if test.get('prepend_text') is not None:
+                        test_meaning = ': '.join((test['prepend_text'], test_meaning))
+
+                    test_number = test.get('test_number')
+                    if test_number is None:
+                        if len(flag_masks) == 0:
+                            test_number = 1
+                        elif flag_value:
+                            test_number = max(flag_masks) + 1
+                        else:
+                            test_number = parse_bit(max(flag_masks))[0] + 1
+                        test_number = int(test_number)
+
+                    test_assessment = test_assessment.capitalize()
+                    if flag_value:
+                        flag_masks.append(test_number)
+                    else:
+                        flag_masks = append_flag_mask(flag_masks, test_number)
+                    flag_meanings.append(test_meaning)
+                    flag_assessments.append(test_assessment)
+                    limit_attrs.update(limits)
+                    set_tests.append((index, test_number))
+
+                    var_results.append(
+                        {
+                            'test_number': test_number,
+                            'test_meaning': test_meaning,
+                            'test_assessment': test_assessment,
+                            'qc_variable_name': qc_var_name,
+                            'variable_name': var_name,
+                        }
+                    )
+
+            # Set all tests in the quality control array
+            for index, test_number in set_tests:
+                if flag_value:
+                    qc_variable[index] = test_number
+                else:
+                    dtype = qc_dtype_for_test(qc_variable.dtype, test_number)
+                    if dtype != qc_variable.dtype:
+                        qc_variable = qc_variable.astype(dtype)
+                    qc_variable[index] = set_bit(qc_variable[index], test_number)
+
+            self._ds[qc_var_name].values = qc_variable
+            qc_attrs = self._ds[qc_var_name].attrs
+            qc_attrs['flag_values' if flag_value else 'flag_masks'] = flag_masks
+            qc_attrs['flag_meanings'] = flag_meanings
+            qc_attrs['flag_assessments'] = flag_assessments
+            qc_attrs.update(limit_attrs)
+            for attr_name, value in data_attrs.items():
+                if attr_name not in self._ds[var_name].attrs:
+                    self._ds[var_name].attrs[attr_name] = value
+
+            results[var_name] = var_results
+
+        return results
@@ -5,15 +5,18 @@ Tests specific to radiometers.
 
 import warnings
 
-import dask
 import numpy as np
 import pandas as pd
 import xarray as xr
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy.fftpack import rfft, rfftfreq
 
 from act.utils.datetime_utils import determine_time_delta
 from act.utils.geo_utils import is_sun_visible
 
+# Number of FFT windows processed at a time by fft_shading_test to limit memory use
+_FFT_CHUNK_SIZE = 20000
+
 
 def fft_shading_test(
     ds,
@@ -93,42 +96,64 @@ def fft_shading_test(
     else:
         dt = time_interval
 
-    # Compute the FFT for each point +- window samples
-    task = []
-    sun_up = is_sun_visible(latitude=ds['lat'].values, longitude=ds['lon'].values, date_time=time)
-    for t in range(len(time)):
-        sind = t - fft_window
-        eind = t + fft_window
-        if sind < 0:
-            sind = 0
-        if eind > len(time):
-            eind = len(time)
-
-        # Get data and remove all nan/missing values
-        d = data[sind:eind]
-        idx = (d != missing) & (np.isnan(d) is not True)
-        index = np.where(idx)
-        d = d[index]
+    # Prepare frequency and fft variables for adding to the dataset
+    num_time = len(time)
+    fft = np.full([num_time, fft_window * 2], np.nan)
+    freq = np.full([num_time, fft_window * 2], np.nan)
+    shading = np.zeros(num_time)
+
+    # Night time samples are not processed and are not flagged
+    sun_up = np.asarray(
+        is_sun_visible(latitude=ds['lat'].values, longitude=ds['lon'].values, date_time=time),
+        dtype=bool,
+    )
 
-        # Add to task for dask processing
-        task.append(
-            dask.delayed(fft_shading_test_process)(
-                time[t],
-                d,
+    # Samples with a full +- window of data without missing values are
+    # processed together from a strided view of the data. The remaining
+    # samples at the ends of the data or with missing values in the window
+    # are processed one at a time.
+    bad = (data == missing) | np.isnan(data)
+    full = np.zeros(num_time, dtype=bool)
+    if num_time >= fft_window * 2:
+        bad_count = np.concatenate(([0], np.cumsum(bad)))
+        window_bad = bad_count[fft_window * 2 :] - bad_count[: -fft_window * 2]
+        full[fft_window : num_time - fft_window + 1] = window_bad == 0
+        windows = sliding_window_view(data, fft_window * 2)
+
+        index = np.where(full & sun_up)[0]
+        for start in range(0, index.size, _FFT_CHUNK_SIZE):
+            t = index[start : start + _FFT_CHUNK_SIZE]
+            shading[t], fft[t], freq[t] = _fft_shading_windows(
+                windows[t - fft_window],
                 shad_freq_lower=shad_freq_lower,
                 shad_freq_upper=shad_freq_upper,
                 ratio_thresh=ratio_thresh,
                 time_interval=dt,
-                is_sunny=sun_up[t],
             )
-        )
 
-    # Process using dask
-    result = dask.compute(*task)
+    for t in np.where(~full & sun_up)[0]:
+        sind = max(t - fft_window, 0)
+        eind = min(t + fft_window, num_time)
+
+        # Get data and remove missing values
+        d = data[sind:eind]
+        d = d[d != missing]
+
+        result = fft_shading_test_process(
+            time[t],
+            d,
+            shad_freq_lower=shad_freq_lower,
+            shad_freq_upper=shad_freq_upper,
+            ratio_thresh=ratio_thresh,
+            time_interval=dt,
+            is_sunny=True,
+        )
+        shading[t] = result['shading']
+        fft[t, 0 : len(result['fft'])] = result['fft']
+        freq[t, 0 : len(result['freq'])] = result['freq']
 
     # Run data through a rolling median to filter out singular
     # false positives
-    shading = [r['shading'] for r in result]
     shading = pd.Series(shading).rolling(window=smooth_window, min_periods=1).median()
 
     # Find indices where shading is indicated
@@ -139,17 +164,6 @@ def fft_shading_test(
     desc = 'FFT Shading Test'
     ds.qcfilter.add_test(variable, index=index, test_meaning=desc)
 
-    # Prepare frequency and fft variables for adding to the dataset
-    fft = np.empty([len(time), fft_window * 2])
-    fft[:] = np.nan
-    freq = np.empty([len(time), fft_window * 2])
-    freq[:] = np.nan
-    for i, r in enumerate(result):
-        dummy = r['fft']
-        fft[i, 0 : len(dummy)] = dummy
-        dummy = r['freq']
-        freq[i, 0 : len(dummy)] = dummy
-
     attrs = {
         'units': '',
         'long_name': 'FFT Results for Shading Test',
@@ -284,3 +298,81 @@ def fft_shading_test_process(
             shading = 1
 
     return {'shading': shading, 'fft': fftv, 'freq': freq}
+
+
+def _fft_shading_windows(
+    windows,
+    shad_freq_lower=None,
+    shad_freq_upper=None,
+    ratio_thresh=None,
+    time_interval=None,
+):
+    """
+    Vectorized version of fft_shading_test_process for a 2D array of data
+    windows of the same length without missing values, one window per row.
+    Returns the shading flag, FFT values and frequencies for each window
+    matching fft_shading_test_process.
+
+    """
+    num_windows, num_fft = windows.shape
+
+    # FFT Algorithm
+    fftv = abs(rfft(windows, axis=-1))
+    freq = np.tile(rfftfreq(num_fft, d=time_interval), (num_windows, 1))
+
+    # Get FFT data under threshold
+    over = fftv > 1.0
+    fftv[over] = np.nan
+    freq[over] = np.nan
+
+    # Calculates the ratio (size) of the peaks in the FFT to the surrounding
+    # data. A frequency range with no values is skipped so the ratios of the
+    # following ranges move down, as in fft_shading_test_process.
+    wind = 3
+    rows = np.arange(num_windows)[:, np.newaxis]
+    offsets = np.arange(wind)
+    has_ratio = np.zeros((num_windows, len(shad_freq_lower)), dtype=bool)
+    ratio = np.full((num_windows, len(shad_freq_lower)), np.nan)
+    for i in range(len(shad_freq_lower)):
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore', category=RuntimeWarning)
+            in_band = np.logical_and(freq > shad_freq_lower[i], freq < shad_freq_upper[i])
+        has_ratio[:, i] = in_band.any(axis=1)
+
+        peak = np.max(np.where(in_band, fftv, -np.inf), axis=1)
+        first = np.argmax(in_band, axis=1)
+        last = num_fft - 1 - np.argmax(in_band[:, ::-1], axis=1)
+
+        # Values to the left of the peak, the first of up to three values
+        # being missing makes the left peak missing like max() on a list
+        sind = np.maximum(first - wind, 0)
+        left_index = sind[:, np.newaxis] + offsets
+        left = np.where(left_index < first[:, np.newaxis], fftv[rows, left_index], np.nan)
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore', category=RuntimeWarning)
+            peak_l = np.where(np.isnan(left[:, 0]), np.nan, np.nanmax(left, axis=1))
+
+            # Values to the right of the peak
+            right_index = last[:, np.newaxis] + offsets
+            right = np.where(
+                right_index < num_fft,
+                fftv[rows, np.minimum(right_index, num_fft - 1)],
+                np.nan,
+            )
+            peak_r = np.nanmax(right, axis=1)
+
+            mean_value = (peak_l + peak_r) / 2.0
+            band_ratio = np.where(mean_value == 0.0, np.nan, peak / mean_value)
+        ratio[:, i] = np.where(first == 0, 0.0, band_ratio)
+
+    # Checks ratios against thresholds for each freq range
+    rank = np.cumsum(has_ratio, axis=1)
+    ratio_1 = np.sum(np.where(has_ratio & (rank == 1), ratio, 0.0), axis=1)
+    pass1 = ratio_1 > ratio_thresh[0]
+    pass2 = rank[:, -1] < 2
+    if len(shad_freq_lower) > 1:
+        ratio_2 = np.sum(np.where(has_ratio & (rank == 2), ratio, 0.0), axis=1)
+        pass2 |= ratio_2 > ratio_thresh[1]
+    shading = (rank[:, -1] > 0) & pass1 & pass2
+
+    return shading.astype(int), fftv, freq
@@ -11,8 +11,8 @@ __getattr__, __dir__, __all__ = lazy.attach(
     submod_attrs={
         'aeri': ['aeri2irt'],
         'cbh': ['generic_sobel_cbh'],
-        'doppler_lidar': ['compute_winds_from_ppi'],
-        'irt': ['sst_from_irt', 'sum_function_irt'],
+        'doppler_lidar': ['compute_winds_from_ppi', 'solve_ppi_winds'],
+        'irt': ['invert_irt_radiance', 'irt_band_radiance', 'sst_from_irt', 'sum_function_irt'],
         'radiation': [
             'calculate_dsh_from_dsdh_sdn',
             'calculate_irradiance_stats',
@@ -20,10 +20,15 @@ __getattr__, __dir__, __all__ = lazy.attach(
             'calculate_net_radiation',
         ],
         'sonde': [
+            'arden_buck_saturation_vapor_pressure',
             'calculate_pbl_liu_liang',
             'calculate_precipitable_water',
+            'calculate_sonde_batch',
             'calculate_stability_indicies',
             'calculate_pbl_heffter',
+            'mixing_ratio_from_vapor_pressure',
+            'precipitable_water_from_profiles',
+            'specific_humidity_from_mixing_ratio',
         ],
         'sp2': ['calc_sp2_diams_masses', 'process_sp2_psds'],
     },
@@ -4,9 +4,8 @@ Functions for aeri retrievals.
 """
 
 import numpy as np
-from scipy.optimize import brentq
 
-from act.retrievals.irt import irt_response_function, sum_function_irt
+from act.retrievals.irt import invert_irt_radiance, irt_response_function
 
 
 def aeri2irt(
@@ -53,9 +52,9 @@ def aeri2irt(
     tolerance : float
         The tolerance value to try and match for returned temperature.
     temp_low : float
-        The initial low value to use in zbren function to invert radiances.
+        The lowest temperature value to use to invert radiances.
     temp_high : float
-        The initial low value to use in zbren function to invert radiances.
+        The highest temperature value to use to invert radiances.
     maxiter : int
         The maximum number if iterations to use with invertion process.
         Prevents runaway processes.
@@ -99,8 +98,8 @@ def aeri2irt(
     # Sum along wavenumber dimention to get a single value for each time step
     mean_rad = np.nansum(mean_rad, axis=1)
 
-    # Loop over each time step of the AERI data and through the use of
-    # solving for zero determine the AERI equivlante IRT sky temperature.
+    # Invert all time steps of the AERI data at once to determine
+    # the AERI equivlante IRT sky temperature.
     aeri_irt_vals = np.full(mean_rad.size, np.nan, dtype=mean_rad.dtype)
 
     # Look for when the hatch is not in Open position and set values to NaN.
@@ -116,21 +115,9 @@ def aeri2irt(
         value = flag_values[flag_meanings.index('open')]
         mean_rad[aeri_ds[hatch_name].values != value] = np.nan
 
-    for ii in range(mean_rad.size):
-        if np.isnan(mean_rad[ii]):
-            continue
-        else:
-            try:
-                aeri_irt_vals[ii] = brentq(
-                    sum_function_irt,
-                    temp_low,
-                    temp_high,
-                    args=(mean_rad[ii],),
-                    xtol=tolerance,
-                    maxiter=maxiter,
-                )
-            except ValueError:
-                pass
+    aeri_irt_vals[:] = invert_irt_radiance(
+        mean_rad, temp_low=temp_low, temp_high=temp_high, tol=tolerance, maxiter=maxiter
+    )
 
     # Add new values to Xarray Dataset
     aeri_ds['aeri_irt_equiv_temperature'] = (
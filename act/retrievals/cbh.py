@@ -3,6 +3,7 @@ Functions for calculated cloud base height that are instrument agnostic.
 
 """
 
+import dask.array
 import numpy as np
 import xarray as xr
 from scipy import ndimage
@@ -17,6 +18,7 @@ def generic_sobel_cbh(
     return_thresh=False,
     filter_type='uniform',
     edge_thresh=5.0,
+    num_layers=1,
 ):
     """
     Function for calculating cloud base height from lidar/radar data
@@ -47,11 +49,17 @@ def generic_sobel_cbh(
     edge_thresh : float
         Threshold value for finding the edge after the sobel filtering.
         If the signal is not strong, this may need to be lowered
+    num_layers : int
+        Number of cloud layers to return for each profile. Each layer is
+        the bottom of a group of consecutive range gates above edge_thresh.
+        If greater than 1 the returned variable has a second layer dimension.
 
     Returns
     -------
     new_ds : ACT xarray.Dataset
-        ACT xarray dataset with cbh values included as variable.
+        ACT xarray dataset with cbh values included as variable. If the data
+        are stored in a dask array the filtering and search are done chunk
+        by chunk along time.
 
     Examples
     --------
@@ -95,7 +103,7 @@ def generic_sobel_cbh(
 
     # Apply thresholds if set
     if var_thresh is not None:
-        da = da.where(da.values > var_thresh)
+        da = da.where(da > var_thresh)
 
     # Fill with fill_na values
     da = da.fillna(fill_na)
@@ -105,45 +113,64 @@ def generic_sobel_cbh(
     if return_thresh is True:
         ds[variable].values = da.values
 
-    # Apply Sobel filter to data and smooth the results
-    data = da.values.tolist()
-    edge = ndimage.sobel(data)
-    if filter_type == 'uniform':
-        edge = ndimage.uniform_filter(edge, size=3, mode='nearest')
-
-    # Create Data Array
-    edge_da = xr.DataArray(edge, dims=ds[variable].dims)
-
-    # Filter some of the resulting edge data to get defined edges
-    edge_da = edge_da.where(edge_da > edge_thresh)
-    edge_da = edge_da.fillna(fill_na)
-
-    # Do a diff along the height dimension to define edge
-    diff = edge_da.diff(dim=1).values
-
     # Get height variable to use for cbh
-    height = ds[height_dim].values
-
-    # Run through times and find the height
-    cbh = []
-    for i in range(np.shape(diff)[0]):
-        try:
-            index = np.where(diff[i, :] > edge_thresh)[0]
-        except ValueError():
-            index = []
-        if len(np.shape(height)) > 1:
-            ht = height[i, :]
-        else:
-            ht = height
-
-        if len(index) > 0:
-            cbh.append(ht[index[0] + 1])
+    height = ds[height_dim].data
+
+    data = da.data
+    if isinstance(data, dask.array.Array):
+        # Work chunk-wise along time. The sobel and uniform filters each need
+        # one neighboring profile so the chunks overlap by two.
+        data = data.rechunk({0: 'auto', 1: -1})
+        edge = data.map_overlap(
+            _sobel_edges,
+            depth={0: 2, 1: 0},
+            boundary='none',
+            dtype=float,
+            filter_type=filter_type,
+        )
+        if np.ndim(height) > 1:
+            height = dask.array.asarray(height).rechunk(edge.chunks)
+            cbh = dask.array.map_blocks(
+                _find_cloud_layers,
+                edge,
+                height,
+                edge_thresh=edge_thresh,
+                fill_na=fill_na,
+                num_layers=num_layers,
+                dtype=float,
+                chunks=(edge.chunks[0], (num_layers,)),
+            )
         else:
-            cbh.append(np.nan)
+            cbh = edge.map_blocks(
+                _find_cloud_layers,
+                height=np.asarray(height),
+                edge_thresh=edge_thresh,
+                fill_na=fill_na,
+                num_layers=num_layers,
+                dtype=float,
+                chunks=(edge.chunks[0], (num_layers,)),
+            )
+        cbh = cbh.compute()
+    else:
+        edge = _sobel_edges(data, filter_type=filter_type)
+        cbh = _find_cloud_layers(
+            edge,
+            np.asarray(height),
+            edge_thresh=edge_thresh,
+            fill_na=fill_na,
+            num_layers=num_layers,
+        )
 
     # Create DataArray to add to the dataset
     var_name = 'cbh_sobel_' + variable
-    da = xr.DataArray(cbh, dims=['time'], coords=[ds['time'].values])
+    if num_layers == 1:
+        da = xr.DataArray(cbh[:, 0], dims=['time'], coords=[ds['time'].values])
+    else:
+        da = xr.DataArray(
+            cbh,
+            dims=['time', 'layer'],
+            coords=[ds['time'].values, np.arange(num_layers)],
+        )
     ds[var_name] = da
     ds[var_name].attrs['long_name'] = ' '.join(
         ['CBH calculated from', variable, 'using sobel filter']
@@ -151,3 +178,51 @@ def generic_sobel_cbh(
     ds[var_name].attrs['units'] = ds[height_dim].attrs['units']
 
     return ds
+
+
+def _sobel_edges(data, filter_type='uniform'):
+    """
+    Applies the sobel filter along the height dimension and optionally
+    smooths the result with a 3x3 uniform filter.
+
+    """
+    edge = ndimage.sobel(np.asarray(data, dtype=float))
+    if filter_type == 'uniform':
+        edge = ndimage.uniform_filter(edge, size=3, mode='nearest')
+
+    return edge
+
+
+def _find_cloud_layers(edge, height, edge_thresh=5.0, fill_na=None, num_layers=1):
+    """
+    Finds the heights of the first num_layers edges above edge_thresh for
+    every profile. Returns an array of shape (time, num_layers) with NaN
+    where fewer layers are found.
+
+    """
+    if fill_na is None:
+        fill_na = np.nan
+
+    # Filter some of the resulting edge data to get defined edges
+    edge = np.where(edge > edge_thresh, edge, fill_na)
+
+    # Do a diff along the height dimension to define edge
+    above = np.diff(edge, axis=1) > edge_thresh
+
+    # Each layer starts where the diff goes above the threshold
+    layer_start = above.copy()
+    layer_start[:, 1:] &= ~above[:, :-1]
+    layer_number = np.cumsum(layer_start, axis=1)
+
+    height = np.asarray(height, dtype=float)
+    cbh = np.full((edge.shape[0], num_layers), np.nan)
+    for layer in range(num_layers):
+        is_layer = layer_start & (layer_number == layer + 1)
+        index = np.argmax(is_layer, axis=1) + 1
+        if height.ndim > 1:
+            layer_height = np.take_along_axis(height, index[:, np.newaxis], axis=1)[:, 0]
+        else:
+            layer_height = height[index]
+        cbh[:, layer] = np.where(is_layer.any(axis=1), layer_height, np.nan)
+
+    return cbh
@@ -3,7 +3,7 @@ Functions for doppler lidar specific retrievals
 
 """
 import warnings
-import dask
+
 import numpy as np
 import xarray as xr
 
@@ -74,7 +74,6 @@ def compute_winds_from_ppi(
 
     """
 
-    new_ds = None
     azimuth = ds[azimuth_name].values
     azimuth_rounded = np.round(azimuth).astype(int)
 
@@ -121,36 +120,63 @@ def compute_winds_from_ppi(
             height_units = 'km'
     time = ds['time'].values
 
-    # Loop over each PPI scan
-    task = []
-    for start_index in index:
-        scan_index = range(start_index, start_index + num_scans)
-        # Since this can run while instrument is making measurements
-        # the number of PPI scans may not match exactly. This will
-        # adjust the number of scans in case there is an issue.
-        if scan_index[-1] > np.size(elevation):
-            scan_index = range(start_index, np.size(elevation))
-
-        task.append(
-            dask.delayed(process_ppi_winds)(
-                time[scan_index],
-                elevation[scan_index],
-                azimuth[scan_index],
-                snr[scan_index, :],
-                doppler[scan_index, :],
-                rng,
-                condition_limit,
-                snr_threshold,
-                remove_all_missing,
-                height_units,
-            )
-        )
+    # Gather every PPI scan into stacked (scan, azimuth, range) arrays. Since
+    # this can run while instrument is making measurements the last scan may
+    # be shorter than the others. The missing samples are padded with NaN
+    # doppler values so they are excluded from the fit.
+    scan_index = index[:, np.newaxis] + np.arange(num_scans)
+    in_scan = scan_index < azimuth.size
+    scan_index = np.where(in_scan, scan_index, index[:, np.newaxis])
+
+    scan_doppler = doppler[scan_index, :].astype(float, copy=False)
+    scan_doppler[~in_scan, :] = np.nan
+    scan_snr = snr[scan_index, :].astype(float, copy=False)
+    scan_snr[~in_scan, :] = np.nan
+
+    last_index = scan_index[np.arange(index.size), np.sum(in_scan, axis=1) - 1]
+    scan_time = time[index] + (time[last_index] - time[index]) / 2
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', category=RuntimeWarning)
+        scan_elevation = np.where(in_scan, np.sin(elevation[scan_index]), np.nan)
+        height = rng * np.nanmedian(scan_elevation, axis=1)[:, np.newaxis]
+        snr_mean = np.nanmean(scan_snr, axis=1)
+
+    winds = solve_ppi_winds(
+        elevation[scan_index],
+        azimuth[scan_index],
+        scan_snr,
+        scan_doppler,
+        snr_threshold=snr_threshold,
+        condition_limit=condition_limit,
+    )
+    winds['signal_to_noise_ratio'] = snr_mean
 
-    results = dask.compute(*task)
-    is_Dataset = [isinstance(ii, xr.core.dataset.Dataset) for ii in results]
-    if any(is_Dataset):
-        results = [results[ii] for ii, value in enumerate(is_Dataset) if value is True]
-        new_ds = xr.concat(results, 'time')
+    if remove_all_missing:
+        keep = ~np.all(np.isnan(winds['wind_speed']), axis=1)
+        scan_time = scan_time[keep]
+        height = height[keep]
+        winds = {key: value[keep] for key, value in winds.items()}
+
+    new_ds = None
+    if scan_time.size > 0:
+        if np.all(height == height[0]):
+            new_ds = _ppi_winds_dataset(scan_time, height[0], height_units, winds)
+        else:
+            # Scans with different elevation angles have different heights
+            # so each one needs its own height coordinate.
+            new_ds = xr.concat(
+                [
+                    _ppi_winds_dataset(
+                        scan_time[ii : ii + 1],
+                        height[ii],
+                        height_units,
+                        {key: value[ii : ii + 1] for key, value in winds.items()},
+                    )
+                    for ii in range(scan_time.size)
+                ],
+                'time',
+            )
 
     if isinstance(return_ds, xr.core.dataset.Dataset) and isinstance(
         new_ds, xr.core.dataset.Dataset
@@ -162,144 +188,209 @@ def compute_winds_from_ppi(
     return return_ds
 
 
-def process_ppi_winds(
-    time,
+def solve_ppi_winds(
     elevation,
     azimuth,
     snr,
     doppler,
-    rng,
-    condition_limit,
-    snr_threshold,
-    remove_all_missing,
-    height_units,
+    snr_threshold=0.008,
+    condition_limit=1.0e4,
 ):
     """
-    This function is for processing the winds using dask from the compute_winds_from_ppi
-    function.  This should not be used standalone.
+    Solve the least squares velocity azimuth display wind fit for many range
+    gates and PPI scans at once.
+
+    The normal equations for every range gate of every scan are formed as
+    stacked 3x3 matrices and inverted together, so no Python loop over range
+    gates or scans is needed.
+
+    Parameters
+    ----------
+    elevation : numpy.ndarray
+        Elevation angles in radians with shape (..., azimuth).
+    azimuth : numpy.ndarray
+        Azimuth angles in radians with the same shape as elevation.
+    snr : numpy.ndarray
+        Signal to noise ratio with shape (..., azimuth, range).
+    doppler : numpy.ndarray
+        Radial velocity with the same shape as snr. NaN values are not used
+        in the fit.
+    snr_threshold : float
+        The signal to noise lower threshold used to decide which values to use.
+    condition_limit : float
+        Upper limit of the normal matrix condition number for a range gate
+        to be converted into winds.
+
+    Returns
+    -------
+    winds : dict
+        Dictionary of numpy arrays with shape (..., range) for wind_speed,
+        wind_direction, wind_speed_error, wind_direction_error, residual and
+        correlation. Range gates with fewer than four usable samples or a
+        condition number above the limit are set to NaN.
 
     """
+    elevation = np.asarray(elevation, dtype=float)
+    azimuth = np.asarray(azimuth, dtype=float)
+    doppler = np.asarray(doppler, dtype=float)
+    snr = np.asarray(snr, dtype=float)
+
+    # Unit vectors along each beam, shape (..., azimuth, 1, 3) to broadcast over range
+    unit = np.stack(
+        [
+            np.sin(azimuth) * np.cos(elevation),
+            np.cos(azimuth) * np.cos(elevation),
+            np.sin(elevation),
+        ],
+        axis=-1,
+    )[..., np.newaxis, :]
 
-    height = rng * np.median(np.sin(elevation))
-    xhat = np.sin(azimuth) * np.cos(elevation)
-    yhat = np.cos(azimuth) * np.cos(elevation)
-    zhat = np.sin(elevation)
-
-    dims = np.shape(snr)
-
-    # mean_snr = np.nanmean(snr, axis=1)
-    u_wind = np.full(dims[1], np.nan)
-    v_wind = np.full(dims[1], np.nan)
-    w_wind = np.full(dims[1], np.nan)
-    u_err = np.full(dims[1], np.nan)
-    v_err = np.full(dims[1], np.nan)
-    w_err = np.full(dims[1], np.nan)
-    residual = np.full(dims[1], np.nan)
-    chisq = np.full(dims[1], np.nan)
-    corr = np.full(dims[1], np.nan)
-
-    # Loop over each level
-    for ii in range(dims[1]):
-        ur1 = doppler[:, ii]
-        snr1 = snr[:, ii]
-        with warnings.catch_warnings():
-            warnings.filterwarnings('ignore', category=RuntimeWarning)
-            index = np.where((snr1 >= snr_threshold) & np.isfinite(ur1))[0]
-        count = index.size
-        if count >= 4:
-            ur1 = ur1[index]
-            xhat1 = xhat[index]
-            yhat1 = yhat[index]
-            zhat1 = zhat[index]
-
-            a = np.full((3, 3), np.nan)
-            b = np.full(3, np.nan)
-
-            a[0, 0] = np.sum(xhat1**2)
-            a[1, 0] = np.sum(xhat1 * yhat1)
-            a[2, 0] = np.sum(xhat1 * zhat1)
-
-            a[0, 1] = a[1, 0]
-            a[1, 1] = np.sum(yhat1**2)
-            a[2, 1] = np.sum(yhat1 * zhat1)
-
-            a[0, 2] = a[2, 0]
-            a[1, 2] = a[2, 1]
-            a[2, 2] = np.sum(zhat1**2)
-
-            b[0] = np.sum(ur1 * xhat1)
-            b[1] = np.sum(ur1 * yhat1)
-            b[2] = np.sum(ur1 * zhat1)
-
-            ainv = np.linalg.inv(a)
-            condition = np.linalg.norm(a) * np.linalg.norm(ainv)  # Condition Number ?
-            if condition < condition_limit:
-                c = b @ ainv
-                u_wind[ii] = c[0]
-                v_wind[ii] = c[1]
-                w_wind[ii] = c[2]
-                ur_fit = xhat1 * u_wind[ii] + yhat1 * v_wind[ii] + zhat1 * w_wind[ii]
-                chisq[ii] = np.sum((ur_fit - ur1) ** 2)
-                residual[ii] = np.sqrt(chisq[ii] / count)
-                with warnings.catch_warnings():
-                    warnings.filterwarnings('ignore', category=RuntimeWarning)
-                    corr[ii] = np.corrcoef(ur_fit, ur1)[0, 1]
-                u_err[ii] = np.sqrt((chisq[ii] / (count - 3)) * ainv[0, 0])
-                v_err[ii] = np.sqrt((chisq[ii] / (count - 3)) * ainv[1, 1])
-                w_err[ii] = np.sqrt((chisq[ii] / (count - 3)) * ainv[2, 2])
-
-    # Compute windspeed and direction
     with warnings.catch_warnings():
         warnings.filterwarnings('ignore', category=RuntimeWarning)
+        mask = (snr >= snr_threshold) & np.isfinite(doppler)
+    count = np.sum(mask, axis=-2)
+    ur = np.where(mask, doppler, 0.0)
+    weight = mask[..., np.newaxis].astype(float)
+
+    # Normal equations a c = b for every range gate, a has shape (..., range, 3, 3)
+    masked_unit = unit * weight
+    a = np.einsum('...tri,...tj->...rij', masked_unit, unit[..., 0, :])
+    b = np.einsum('...tri,...tr->...ri', masked_unit, ur)
+
+    # Analytic inverse of the 3x3 matrices from the adjugate. Singular
+    # matrices give an infinite condition number and are excluded below.
+    row0, row1, row2 = a[..., 0, :], a[..., 1, :], a[..., 2, :]
+    cofactor = np.stack([np.cross(row1, row2), np.cross(row2, row0), np.cross(row0, row1)], axis=-1)
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', category=RuntimeWarning)
+        det = np.sum(row0 * cofactor[..., 0], axis=-1)
+        ainv = cofactor / det[..., np.newaxis, np.newaxis]
+        condition = np.sqrt(np.sum(a**2, axis=(-2, -1))) * np.sqrt(
+            np.sum(ainv**2, axis=(-2, -1))
+        )
+
+    valid = (count >= 4) & np.isfinite(condition) & (condition < condition_limit)
+    ainv[~valid] = np.nan
+
+    coef = np.einsum('...ri,...rij->...rj', b, ainv)
+    u_wind = coef[..., 0]
+    v_wind = coef[..., 1]
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', category=RuntimeWarning)
+        ur_fit = np.einsum('...tri,...ri->...tr', np.broadcast_to(unit, mask.shape + (3,)), coef)
+        ur_fit = np.where(mask, ur_fit, 0.0)
+        chisq = np.sum((ur_fit - ur) ** 2, axis=-2)
+        chisq[~valid] = np.nan
+        residual = np.sqrt(chisq / count)
+
+        # Pearson correlation between fit and measured radial velocities
+        fit_mean = np.sum(ur_fit, axis=-2, keepdims=True) / count[..., np.newaxis, :]
+        ur_mean = np.sum(ur, axis=-2, keepdims=True) / count[..., np.newaxis, :]
+        fit_anom = np.where(mask, ur_fit - fit_mean, 0.0)
+        ur_anom = np.where(mask, ur - ur_mean, 0.0)
+        corr = np.sum(fit_anom * ur_anom, axis=-2) / np.sqrt(
+            np.sum(fit_anom**2, axis=-2) * np.sum(ur_anom**2, axis=-2)
+        )
+        corr[~valid] = np.nan
+
+        variance = chisq / (count - 3)
+        u_err = np.sqrt(variance * ainv[..., 0, 0])
+        v_err = np.sqrt(variance * ainv[..., 1, 1])
+
+        # Compute windspeed and direction
         wspd = np.sqrt(u_wind**2 + v_wind**2)
         wdir = np.degrees(np.arctan2(u_wind, v_wind) + np.pi)
 
         wspd_err = np.sqrt((u_wind * u_err) ** 2 + (v_wind * v_err) ** 2) / wspd
         wdir_err = np.degrees(np.sqrt((u_wind * v_err) ** 2 + (v_wind * u_err) ** 2) / wspd**2)
 
-    if remove_all_missing and np.isnan(wspd).all():
+    return {
+        'wind_speed': wspd,
+        'wind_direction': wdir,
+        'wind_speed_error': wspd_err,
+        'wind_direction_error': wdir_err,
+        'residual': residual,
+        'correlation': corr,
+    }
+
+
+def process_ppi_winds(
+    time,
+    elevation,
+    azimuth,
+    snr,
+    doppler,
+    rng,
+    condition_limit,
+    snr_threshold,
+    remove_all_missing,
+    height_units,
+):
+    """
+    This function is for processing the winds for a single PPI scan from the
+    compute_winds_from_ppi function.  This should not be used standalone.
+
+    """
+
+    winds = solve_ppi_winds(
+        elevation,
+        azimuth,
+        snr,
+        doppler,
+        snr_threshold=snr_threshold,
+        condition_limit=condition_limit,
+    )
+
+    if remove_all_missing and np.isnan(winds['wind_speed']).all():
         return np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan
 
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', category=RuntimeWarning)
+        winds['signal_to_noise_ratio'] = np.nanmean(snr, axis=0)
+
+    height = rng * np.median(np.sin(elevation))
     time = time[0] + (time[-1] - time[0]) / 2
     time = time.reshape(
         1,
     )
-    wspd = wspd.reshape(1, rng.size)
-    wdir = wdir.reshape(1, rng.size)
-    wspd_err = wspd_err.reshape(1, rng.size)
-    wdir_err = wdir_err.reshape(1, rng.size)
-    corr = corr.reshape(1, rng.size)
-    residual = residual.reshape(1, rng.size)
-    with warnings.catch_warnings():
-        warnings.filterwarnings('ignore', category=RuntimeWarning)
-        snr_mean = np.nanmean(snr, axis=0)
-    snr_mean = snr_mean.reshape(1, rng.size)
+    winds = {key: value.reshape(1, rng.size) for key, value in winds.items()}
+
+    return _ppi_winds_dataset(time, height, height_units, winds)
+
+
+def _ppi_winds_dataset(time, height, height_units, winds):
+    """
+    Assemble the winds Dataset from (time, height) shaped arrays returned by
+    solve_ppi_winds.
+
+    """
 
     new_ds = xr.Dataset(
         {
             'wind_speed': (
                 ('time', 'height'),
-                wspd,
+                winds['wind_speed'],
                 {'long_name': 'Wind speed', 'units': 'm/s'},
             ),
             'wind_direction': (
                 ('time', 'height'),
-                wdir,
+                winds['wind_direction'],
                 {'long_name': 'Wind direction', 'units': 'degree'},
             ),
             'wind_speed_error': (
                 ('time', 'height'),
-                wspd_err,
+                winds['wind_speed_error'],
                 {'long_name': 'Wind direction error', 'units': 'm/s'},
             ),
             'wind_direction_error': (
                 ('time', 'height'),
-                wdir_err,
+                winds['wind_direction_error'],
                 {'long_name': 'Wind direction error', 'units': 'degree'},
             ),
             'signal_to_noise_ratio': (
                 ('time', 'height'),
-                snr_mean,
+                winds['signal_to_noise_ratio'],
                 {
                     'long_name': 'Signal to noise ratio mean over PPI scan',
                     'units': '1',
@@ -307,7 +398,7 @@ def process_ppi_winds(
             ),
             'residual': (
                 ('time', 'height'),
-                residual,
+                winds['residual'],
                 {
                     'long_name': 'Residual values (Square Root of Chi Square)',
                     'units': 'm/s',
@@ -315,7 +406,7 @@ def process_ppi_winds(
             ),
             'correlation': (
                 ('time', 'height'),
-                corr,
+                winds['correlation'],
                 {'long_name': 'Correlation coefficient', 'units': '1'},
             ),
         },
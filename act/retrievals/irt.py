@@ -3,10 +3,10 @@ Functions for IRT retrievals and calculations.
 
 """
 
-import dask
+from functools import lru_cache
+
 import numpy as np
 import xarray as xr
-from scipy.optimize import brentq
 
 from act.utils.radiance_utils import planck_converter
 
@@ -960,13 +960,169 @@ def sum_function_irt(temperature, inTotal, units='cm', rf=None, rf_wnum=None):
 
     """
     if rf is None or rf_wnum is None:
-        rf_wnum, rf = irt_response_function()
-        if units == 'm':
-            rf_wnum *= 100.0
+        rf_wnum, rf = _irt_response(units)
     rad = planck_converter(rf_wnum, temperature=temperature, units=units) * rf
     return np.nansum(rad) - inTotal
 
 
+@lru_cache(maxsize=None)
+def _irt_response(units='cm'):
+    """
+    Returns the read only response function wavenumbers in the requested units
+    and response function values so they are only created once.
+
+    """
+    rf_wnum, rf = irt_response_function()
+    if units == 'm':
+        rf_wnum *= 100.0
+    rf_wnum.flags.writeable = False
+    rf.flags.writeable = False
+
+    return rf_wnum, rf
+
+
+def irt_band_radiance(temperature, units='cm', chunk_size=10000):
+    """
+    Function to calculate the response function weighted radiance for an array of
+    temperature values. This is the vectorized version of sum_function_irt().
+
+    Parameters
+    ----------
+    temperature : float or numpy array
+        Temperature values in K.
+    units : str
+        Units of wavenumber used in the Planck function, 'cm' or 'm'.
+    chunk_size : int
+        Number of temperature values to process at a time to limit memory use.
+
+    Returns
+    -------
+    radiance : numpy array
+        Radiance values the same shape as temperature. NaN where temperature is NaN.
+
+    """
+    rf_wnum, rf = _irt_response(units)
+    temperature = np.asarray(temperature, dtype=np.float64)
+    radiance = np.full(temperature.size, np.nan)
+    values = temperature.ravel()
+    for start in range(0, values.size, chunk_size):
+        temp = values[start : start + chunk_size]
+        rad = planck_converter(rf_wnum, temperature=temp[:, np.newaxis], units=units) * rf
+        radiance[start : start + chunk_size] = np.nansum(rad, axis=1)
+
+    radiance[np.isnan(values)] = np.nan
+
+    return radiance.reshape(temperature.shape)
+
+
+def invert_irt_radiance(
+    radiance, units='cm', temp_low=150.0, temp_high=350.0, tol=0.1, maxiter=200
+):
+    """
+    Function to invert response function weighted radiance values to temperatures.
+    Brent's method is run on all values at once, following the same steps as
+    scipy.optimize.brentq() would for each value within the temp_low to temp_high
+    bracket, so the results match the scalar root find.
+
+    Parameters
+    ----------
+    radiance : float or numpy array
+        Band radiance values to invert.
+    units : str
+        Units of wavenumber used in the Planck function, 'cm' or 'm'.
+    temp_low : float
+        Lowest temperature in K to search.
+    temp_high : float
+        Highest temperature in K to search.
+    tol : float
+        Tolerance in K of the returned temperature.
+    maxiter : int
+        The maximum number of iterations.
+
+    Returns
+    -------
+    temperature : numpy array
+        Temperature values in K the same shape as radiance. Set to NaN when radiance
+        is NaN, outside of the radiance range of temp_low to temp_high or did not
+        converge in maxiter iterations.
+
+    """
+    radiance = np.asarray(radiance, dtype=np.float64)
+    temperature = np.full(radiance.size, np.nan)
+    rtol = 4 * np.finfo(float).eps
+
+    # Start with the bracket end points for all finite values
+    index = np.flatnonzero(np.isfinite(radiance))
+    target = radiance.ravel()[index]
+    rad_low, rad_high = irt_band_radiance([temp_low, temp_high], units=units)
+    xpre = np.full(target.size, float(temp_low))
+    xcur = np.full(target.size, float(temp_high))
+    fpre = rad_low - target
+    fcur = rad_high - target
+
+    temperature[index[fcur == 0]] = temp_high
+    temperature[index[fpre == 0]] = temp_low
+    keep = (fpre != 0) & (fcur != 0) & (np.signbit(fpre) != np.signbit(fcur))
+    index, target = index[keep], target[keep]
+    xpre, xcur, fpre, fcur = xpre[keep], xcur[keep], fpre[keep], fcur[keep]
+    xblk, fblk, spre, scur = (np.zeros(target.size) for _ in range(4))
+
+    for _ in range(maxiter):
+        if index.size == 0:
+            break
+
+        # Start a new bracket when the sign changed
+        change = (fpre != 0) & (fcur != 0) & (np.signbit(fpre) != np.signbit(fcur))
+        xblk = np.where(change, xpre, xblk)
+        fblk = np.where(change, fpre, fblk)
+        spre = np.where(change, xcur - xpre, spre)
+        scur = np.where(change, xcur - xpre, scur)
+
+        # Keep the best estimate in xcur
+        swap = np.abs(fblk) < np.abs(fcur)
+        xpre, xcur, xblk = (
+            np.where(swap, xcur, xpre),
+            np.where(swap, xblk, xcur),
+            np.where(swap, xcur, xblk),
+        )
+        fpre, fcur, fblk = (
+            np.where(swap, fcur, fpre),
+            np.where(swap, fblk, fcur),
+            np.where(swap, fcur, fblk),
+        )
+
+        done = (fcur == 0) | (np.abs(xblk - xcur) / 2.0 < (tol + rtol * np.abs(xcur)) / 2.0)
+        temperature[index[done]] = xcur[done]
+        keep = ~done
+        index, target = index[keep], target[keep]
+        xpre, xcur, xblk = xpre[keep], xcur[keep], xblk[keep]
+        fpre, fcur, fblk = fpre[keep], fcur[keep], fblk[keep]
+        spre, scur = spre[keep], scur[keep]
+        delta = (tol + rtol * np.abs(xcur)) / 2.0
+        sbis = (xblk - xcur) / 2.0
+
+        # Interpolate or extrapolate a step and fall back to bisection when the
+        # step is too large or not going to improve the estimate.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dpre = (fpre - fcur) / (xpre - xcur)
+            dblk = (fblk - fcur) / (xblk - xcur)
+            stry = np.where(
+                xpre == xblk,
+                -fcur * (xcur - xpre) / (fcur - fpre),
+                -fcur * (fblk * dblk - fpre * dpre) / (dblk * dpre * (fblk - fpre)),
+            )
+        good = (np.abs(spre) > delta) & (np.abs(fcur) < np.abs(fpre))
+        good &= 2.0 * np.abs(stry) < np.minimum(np.abs(spre), 3.0 * np.abs(sbis) - delta)
+        spre = np.where(good, scur, sbis)
+        scur = np.where(good, stry, sbis)
+
+        xpre, fpre = xcur, fcur
+        xcur = xcur + np.where(np.abs(scur) > delta, scur, np.where(sbis > 0, delta, -delta))
+        fcur = irt_band_radiance(xcur, units=units) - target
+
+    return temperature.reshape(radiance.shape)
+
+
 def sst_min_function(x, y):
     """
     Minimization function for sst
@@ -990,8 +1146,7 @@ def sst_min_function(x, y):
 def process_sst_data(sfc_t, sky_t, emis, maxit, tempLow, tempHigh, tol):
     """
     Function called from sst_from_irt to calculate sea surface temperatures
-    from Sky and Surface IRT values.  This is meant to take advantage of
-    dask and multiprocessing
+    from single Sky and Surface IRT values.
 
     Code was adapted by Adam Theisen from code developed by Kenneth Kehoe
     and based on work by Donlon et al 2008
@@ -1007,7 +1162,7 @@ def process_sst_data(sfc_t, sky_t, emis, maxit, tempLow, tempHigh, tol):
     emis : float
         Seawater emissivity
     maxit : int
-        Max number of iterations to run through with brentq optimization
+        Max number of iterations to run through with Brent's method
     tempLow : float
         Low range of temperature values to pass through minimization function
     tempHigh : float
@@ -1028,20 +1183,53 @@ def process_sst_data(sfc_t, sky_t, emis, maxit, tempLow, tempHigh, tol):
     J. Atmos. Oceanic Technol., 25, 93–113, https://doi.org/10.1175/2007JTECHO505.1
 
     """
-    if np.isnan(sfc_t) or np.isnan(sky_t):
-        return np.nan
+    sst = sst_from_radiance(sfc_t, sky_t, emis, maxit, tempLow, tempHigh, tol)
+
+    return float(sst)
+
+
+def sst_from_radiance(sfc_t, sky_t, emis=0.986, maxit=500, tempLow=250.0, tempHigh=350.0, tol=0.1):
+    """
+    Function to calculate sea surface temperatures from arrays of Sky and Surface
+    IRT values. The radiances are calculated and inverted for all values at once
+    with invert_irt_radiance().
 
+    Parameters
+    ----------
+    sfc_t : float or numpy array
+        Surface ir temperature values
+    sky_t : float or numpy array
+        Sky ir temperature values
+    emis : float
+        Seawater emissivity
+    maxit : int
+        Max number of iterations to run through with Brent's method
+    tempLow : float
+        Low range of temperature values to invert radiances
+    tempHigh : float
+        High range of temperature values to invert radiances
+    tol : float
+        Tolerance value
+
+    Returns
+    -------
+    sst : numpy array
+        Sea surface temperatures. NaN where either input is NaN or the temperature
+        is outside of tempLow to tempHigh.
+
+    """
     # Convert surface and sky irt values to radiance
-    Lsurf = sum_function_irt(sfc_t, 0, units='m')
-    Lsky = sum_function_irt(sky_t, 0, units='m')
+    Lsurf = irt_band_radiance(sfc_t, units='m')
+    Lsky = irt_band_radiance(sky_t, units='m')
 
     # Correct sea surface brightness temperature for sky brightness
     # temperature using Donlon (2008)
     Lsst = (Lsurf - np.asarray(1.0 - emis) * Lsky) / emis
-    Lsst.astype(Lsurf.dtype)
 
-    # Invert the integral to get temperatures through optimization method
-    sst = brentq(sst_min_function, tempLow, tempHigh, args=(Lsst,), xtol=tol, maxiter=maxit)
+    # Invert the integral to get temperatures
+    sst = invert_irt_radiance(
+        Lsst, units='m', temp_low=tempLow, temp_high=tempHigh, tol=tol, maxiter=maxit
+    )
 
     return sst
 
@@ -1059,7 +1247,7 @@ def sst_from_irt(
 ):
     """
     Base function to calculate sea surface temperatures from Sky and Surface IRT values.
-    This is meant to take advantage of dask and multiprocessing
+    All time samples are inverted at once with invert_irt_radiance().
 
     Code was adapted by Adam Theisen from code developed by Kenneth Kehoe
     and based on work by Donlon et al 2008
@@ -1075,7 +1263,7 @@ def sst_from_irt(
     emis : float
         Seawater emissivity.  Default of 0.986
     maxit : int
-        Max number of iterations to run through with brentq optimization. Default of 500
+        Max number of iterations to run through with Brent's method. Default of 500
     tempLow : float
         Low range of temperature values to pass through minimization function. Default of 250
     tempHigh : float
@@ -1103,21 +1291,12 @@ def sst_from_irt(
     sfc_temp = ds[sfc_irt].values
     sky_temp = ds[sky_irt].values
 
-    # Get response function values once instead of calling function each time
-    task = []
-    for i in range(len(sfc_temp)):
-        task.append(
-            dask.delayed(process_sst_data)(
-                sfc_temp[i], sky_temp[i], emis, maxit, tempLow, tempHigh, tol
-            )
-        )
-
-    results = dask.compute(*task)
+    results = sst_from_radiance(sfc_temp, sky_temp, emis, maxit, tempLow, tempHigh, tol)
 
     # Add data back to the dataset
     long_name = 'Calculated sea surface temperature'
     attrs = {'long_name': long_name, 'units': 'K'}
-    da = xr.DataArray(list(results), dims=['time'], coords=[ds['time'].values], attrs=attrs)
+    da = xr.DataArray(results, dims=['time'], coords=[ds['time'].values], attrs=attrs)
     ds[sst_variable] = da
 
     return ds
@@ -3,13 +3,17 @@ Functions for radiosonde related calculations.
 
 """
 
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from os import PathLike
+
 import numpy as np
 import xarray as xr
-from operator import itemgetter
-from itertools import groupby
 import metpy.calc as mpcalc
 from metpy.units import units
 
+from act.io.arm import read_arm_netcdf
 from act.utils.data_utils import convert_to_potential_temp
 
 
@@ -38,56 +42,146 @@ def calculate_precipitable_water(ds, temp_name='tdry', rh_name='rh', pres_name='
     rh = ds[rh_name].values
     pres = ds[pres_name].values
 
-    # Get list of temperature values for saturation vapor pressure calc
-    temperature = []
-    for t in np.nditer(temp):
-        temperature.append(t)
-
-    # Apply Arden-Buck equation to get saturation vapor pressure
-    sat_vap_pres = []
-    for t in temperature:
-        # Over liquid water, above freezing
-        if t >= 0:
-            sat_vap_pres.append(0.61121 * np.exp((18.678 - (t / 234.5)) * (t / (257.14 + t))))
-        # Over ice, below freezing
-        else:
-            sat_vap_pres.append(0.61115 * np.exp((23.036 - (t / 333.7)) * (t / (279.82 + t))))
+    # The integration has always stopped one level below the top of the
+    # profile. Keep doing so for consistent values.
+    pwv = precipitable_water_from_profiles(temp[:-1], rh[:-1], pres[:-1])
+    return pwv
+
+
+def arden_buck_saturation_vapor_pressure(temperature):
+    """
+    Calculate saturation vapor pressure using the Arden-Buck equations, over
+    liquid water above freezing and over ice below freezing.
+
+    Parameters
+    ----------
+    temperature : numpy.ndarray or float
+        Temperature in degrees Celsius. Any shape is accepted.
+
+    Returns
+    -------
+    sat_vap_pres : numpy.ndarray
+        Saturation vapor pressure in kPa with the same shape as temperature.
 
-    # convert rh from % to decimal
-    rel_hum = []
-    for r in np.nditer(rh):
-        rel_hum.append(r / 100.0)
+    """
+    temperature = np.asarray(temperature, dtype=float)
+    with np.errstate(invalid='ignore'):
+        over_water = temperature >= 0
+    sat_vap_pres = np.where(
+        over_water,
+        0.61121 * np.exp((18.678 - (temperature / 234.5)) * (temperature / (257.14 + temperature))),
+        0.61115 * np.exp((23.036 - (temperature / 333.7)) * (temperature / (279.82 + temperature))),
+    )
+
+    return sat_vap_pres
+
+
+def mixing_ratio_from_vapor_pressure(vapor_pressure, pressure):
+    """
+    Calculate the mixing ratio from vapor pressure and atmospheric pressure.
+
+    Parameters
+    ----------
+    vapor_pressure : numpy.ndarray or float
+        Vapor pressure.
+    pressure : numpy.ndarray or float
+        Atmospheric pressure in the same units as vapor_pressure.
+
+    Returns
+    -------
+    mix_rat : numpy.ndarray
+        Mixing ratio in kg/kg.
 
-    # get vapor pressure from rh and saturation vapor pressure
-    vap_pres = []
-    for i in range(0, len(sat_vap_pres)):
-        es = rel_hum[i] * sat_vap_pres[i]
-        vap_pres.append(es)
+    """
+    vapor_pressure = np.asarray(vapor_pressure, dtype=float)
+    pressure = np.asarray(pressure, dtype=float)
+
+    return 0.622 * vapor_pressure / (pressure - vapor_pressure)
+
+
+def specific_humidity_from_mixing_ratio(mixing_ratio):
+    """
+    Calculate specific humidity from the mixing ratio.
+
+    Parameters
+    ----------
+    mixing_ratio : numpy.ndarray or float
+        Mixing ratio in kg/kg.
+
+    Returns
+    -------
+    spec_hum : numpy.ndarray
+        Specific humidity in kg/kg.
+
+    """
+    mixing_ratio = np.asarray(mixing_ratio, dtype=float)
+
+    return mixing_ratio / (1 + mixing_ratio)
+
+
+def precipitable_water_from_profiles(temperature, rh, pressure, axis=-1, skipna=False):
+    """
+    Calculate precipitable water vapor for one profile or a stack of profiles.
+
+    Saturation vapor pressure is calculated with the Arden-Buck equations,
+    converted to specific humidity and integrated over pressure with the
+    trapezoidal rule. A missing value in a profile makes its precipitable
+    water missing unless skipna is set. Profiles of different length can be
+    stacked into one array by padding them with NaN and setting skipna.
+
+    Parameters
+    ----------
+    temperature : numpy.ndarray
+        Temperature in degrees Celsius.
+    rh : numpy.ndarray
+        Relative humidity in percent with the same shape as temperature.
+    pressure : numpy.ndarray
+        Atmospheric pressure with the same shape as temperature, decreasing
+        with height.
+    axis : int
+        The vertical axis of the arrays.
+    skipna : boolean
+        Option to leave out intervals with a missing value at either end from
+        the integration instead of returning NaN for the profile.
+
+    Returns
+    -------
+    pwv : numpy.ndarray or float
+        Precipitable water vapor in centimeters for each profile. Profiles
+        without any valid interval are set to NaN.
 
-    # Get list of pressure values for mixing ratio calc
-    pressure = []
-    for p in np.nditer(pres):
-        pressure.append(p)
+    Examples
+    --------
+    .. code-block :: python
 
-    # Mixing ratio calc
+        # Soundings padded to a common number of levels, shape (launch, level)
+        pwv = act.retrievals.precipitable_water_from_profiles(tdry, rh, pres, skipna=True)
 
-    mix_rat = []
-    for i in range(0, len(vap_pres)):
-        mix_rat.append(0.622 * vap_pres[i] / (pressure[i] - vap_pres[i]))
+    """
+    temperature = np.asarray(temperature, dtype=float)
+    pressure = np.asarray(pressure, dtype=float)
+    rel_hum = np.asarray(rh, dtype=float) / 100.0
 
-    # Specific humidity
+    vap_pres = rel_hum * arden_buck_saturation_vapor_pressure(temperature)
+    spec_hum = specific_humidity_from_mixing_ratio(
+        mixing_ratio_from_vapor_pressure(vap_pres, pressure)
+    )
 
-    spec_hum = []
-    for rat in mix_rat:
-        spec_hum.append(rat / (1 + rat))
+    spec_hum = np.moveaxis(spec_hum, axis, -1)
+    pressure = np.moveaxis(pressure, axis, -1)
+    layer = (
+        0.5 * (spec_hum[..., 1:] + spec_hum[..., :-1]) * (pressure[..., :-1] - pressure[..., 1:])
+    )
 
-    # Integrate specific humidity
+    valid = np.isfinite(layer)
+    if skipna:
+        layer = np.where(valid, layer, 0.0)
 
-    pwv = 0.0
-    for i in range(1, len(pressure) - 1):
-        pwv = pwv + 0.5 * (spec_hum[i] + spec_hum[i - 1]) * (pressure[i - 1] - pressure[i])
+    pwv = np.sum(layer, axis=-1) / 0.098
+    pwv = np.where(np.any(valid, axis=-1), pwv, np.nan)
+    if pwv.ndim == 0:
+        pwv = float(pwv)
 
-    pwv = pwv / 0.098
     return pwv
 
 
@@ -339,25 +433,22 @@ def calculate_pbl_liu_liang(
         idx = np.where(theta_gradient >= overshoot_thresh)[0]
         pbl = alt[idx[0]]
     else:
-        idx = np.array(
-            [
-                i
-                for i, t in enumerate(theta_gradient[1:-1])
-                if theta_gradient[i] < theta_gradient[i - 1]
-                and theta_gradient[i] < theta_gradient[i + 1]
-            ]
-        )
-
-        for i in idx:
-            cond1 = (theta_gradient[i] - theta_gradient[i - 1]) < -40.0
-            cond2 = (theta_gradient[i + 1] < overshoot_thresh) or (
-                theta_gradient[i + 2] < overshoot_thresh
+        # Local minima of the gradient. The first level is compared against the
+        # last gradient value, as the original level scan did.
+        num = theta_gradient.size - 2
+        grad = theta_gradient[:num]
+        prev_grad = np.roll(theta_gradient, 1)[:num]
+        idx = np.where((grad < prev_grad) & (grad < theta_gradient[1 : num + 1]))[0]
+        if idx.size > 0:
+            cond1 = (theta_gradient[idx] - prev_grad[idx]) < -40.0
+            cond2 = (theta_gradient[idx + 1] < overshoot_thresh) | (
+                theta_gradient[idx + 2] < overshoot_thresh
             )
-            if cond1 or cond2:
+            found = np.where(cond1 | cond2)[0]
+            if found.size > 0:
+                i = idx[found[0]]
                 # This gets the ARM answer
                 pbl_stable = (alt[i + 1] + alt[i]) / 2.0
-                # pbl_stable = alt[i]
-                break
 
         # Check for low-level jet
         # Find the height of the maximum windspeed and look up to find layer 2m/s lower
@@ -365,7 +456,7 @@ def calculate_pbl_liu_liang(
         # maximum that is more than 2 m/s faster than the wind speeds above it within
         # the lowest 1500m of the atmosphere. Keywords to adjust are provided
         idh = np.where(alt <= llj_max_alt)[0]
-        max_wspd_ind = [i for i, w in enumerate(wspd[:-1]) if wspd[i] > wspd[i + 1]][0]
+        max_wspd_ind = np.where(wspd[:-1] > wspd[1:])[0][0]
         diff = wspd[max_wspd_ind] - wspd[max_wspd_ind : idh[-1]]
         idx = np.where(diff > llj_max_wspd)[0]
         if len(idx) > 0:
@@ -491,11 +582,11 @@ def calculate_pbl_heffter(
 
     # Find the consistent layers by grouping the indices together
     # Does not include a single height as a layer
-    ranges = []
-    for key, group in groupby(enumerate(idx), lambda i: i[0] - i[1]):
-        group = list(map(itemgetter(1), group))
-        if group[-1] - group[0] > 0:
-            ranges.append((group[0], group[-1]))
+    breaks = np.where(np.diff(idx) != 1)[0]
+    starts = idx[np.concatenate(([0], breaks + 1))] if idx.size > 0 else idx
+    ends = idx[np.concatenate((breaks, [idx.size - 1]))] if idx.size > 0 else idx
+    keep = ends > starts
+    ranges = list(zip(starts[keep], ends[keep]))
 
     # Subset ranges to lowest 5
     if len(ranges) > 5:
@@ -682,3 +773,198 @@ def preprocess_sonde_data(
     ds2['potential_temperature'] = da
 
     return ds2
+
+
+def calculate_sonde_batch(
+    sondes,
+    retrievals=('stability', 'liu_liang', 'heffter'),
+    retrieval_kwargs=None,
+    max_workers=None,
+    launch_gap=np.timedelta64(30, 'm'),
+    preprocess=None,
+):
+    """
+    Function for calculating stability indices and PBL heights for many
+    radiosonde launches at once.
+
+    Each launch is read and processed on its own, optionally in a process
+    pool. An error raised while reading, preprocessing or running a retrieval
+    for one launch does not stop the processing of the other launches, the
+    retrieval values for that launch are set to missing and the error message
+    is recorded instead. Launches that could not be read have a time of NaT.
+
+    Parameters
+    ----------
+    sondes : str, list or xarray.Dataset
+        Launches to process. A glob string or list of filenames with one
+        launch per file, a list of Datasets with one launch each, or a single
+        Dataset of concatenated launches that will be split on time gaps.
+    retrievals : tuple of str
+        Retrievals to run. Options are 'stability' for
+        calculate_stability_indicies, 'liu_liang' for calculate_pbl_liu_liang
+        and 'heffter' for calculate_pbl_heffter.
+    retrieval_kwargs : dict or None
+        Keywords passed to each retrieval function, keyed by retrieval name.
+    max_workers : int or None
+        Number of processes used to process the launches. If None the
+        launches are processed serially in the current process.
+    launch_gap : numpy.timedelta64
+        Minimum time gap between samples that starts a new launch when a
+        single Dataset of concatenated launches is provided.
+    preprocess : function or None
+        Function called with each launch Dataset before running the
+        retrievals, returning the Dataset to use. Must be picklable when
+        max_workers is set.
+
+    Returns
+    -------
+    ds : xarray.Dataset or None
+        Dataset of the scalar retrieval results with a time dimension of the
+        launch start times and a retrieval_error variable holding the error
+        messages for each launch. None if no launches were provided.
+
+    Examples
+    --------
+    .. code-block :: python
+
+        stability_kwargs = {'temp_name': 'tdry', 'td_name': 'dp', 'p_name': 'pres'}
+        ds = act.retrievals.calculate_sonde_batch(
+            'sgpsondewnpnC1.b1.2019*.cdf',
+            retrieval_kwargs={'stability': stability_kwargs},
+            max_workers=4,
+        )
+
+    """
+    if retrieval_kwargs is None:
+        retrieval_kwargs = {}
+
+    for name in retrievals:
+        if name not in _BATCH_RETRIEVALS:
+            raise ValueError(
+                f'Unknown retrieval "{name}". Options are {list(_BATCH_RETRIEVALS.keys())}'
+            )
+
+    if isinstance(sondes, (str, PathLike)):
+        sondes = sorted(glob.glob(str(sondes)))
+    elif isinstance(sondes, xr.Dataset):
+        sondes = _split_sonde_launches(sondes, launch_gap)
+
+    args = (sondes, repeat(retrievals), repeat(retrieval_kwargs), repeat(preprocess))
+    if max_workers is None:
+        results = list(map(_process_sonde_launch, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_process_sonde_launch, *args))
+
+    if len(results) == 0:
+        return None
+
+    time = np.array([result[0] for result in results])
+    data_vars = {}
+    for name in retrievals:
+        for var_name in _BATCH_RETRIEVALS[name][1]:
+            values = [result[1].get(var_name) for result in results]
+            if any(isinstance(value, str) for value in values):
+                values = np.array(['' if value is None else value for value in values])
+            else:
+                values = np.array([np.nan if value is None else value for value in values])
+
+            attrs = next((result[2][var_name] for result in results if var_name in result[2]), {})
+            data_vars[var_name] = ('time', values, attrs)
+
+    data_vars['retrieval_error'] = (
+        'time',
+        np.array([result[3] for result in results]),
+        {'long_name': 'Errors raised by the retrievals for the launch', 'units': ''},
+    )
+
+    ds = xr.Dataset(data_vars, coords={'time': ('time', time, {'long_name': 'Launch time in UTC'})})
+    ds = ds.sortby('time')
+
+    return ds
+
+
+def _split_sonde_launches(ds, launch_gap):
+    """
+    Splits a Dataset of concatenated launches into a list of Datasets, one per
+    launch, where the time between samples is larger than launch_gap.
+
+    """
+    time = ds['time'].values
+    breaks = np.where(np.diff(time) > launch_gap)[0] + 1
+    bounds = np.concatenate(([0], breaks, [time.size]))
+
+    return [ds.isel(time=slice(start, end)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _process_sonde_launch(sonde, retrievals, retrieval_kwargs, preprocess):
+    """
+    Runs the batch retrievals on a single launch. Returns the launch time,
+    dictionaries of values and attributes for each output variable and the
+    error messages. The launch time is NaT if the launch could not be read.
+
+    """
+    launch_time = np.datetime64('NaT', 'ns')
+    values = {}
+    attrs = {}
+    errors = []
+    try:
+        if isinstance(sonde, xr.Dataset):
+            ds = sonde
+        else:
+            ds = read_arm_netcdf(sonde)
+
+        if preprocess is not None:
+            ds = preprocess(ds)
+
+        if ds['time'].size == 0:
+            raise ValueError('No data in launch')
+
+        launch_time = ds['time'].values[0]
+    except Exception as error:
+        return launch_time, values, attrs, f'read: {error}'
+
+    for name in retrievals:
+        function, var_names = _BATCH_RETRIEVALS[name]
+        # Retrievals modify the Dataset they are given so each gets a copy
+        try:
+            result = function(ds.copy(deep=True), **retrieval_kwargs.get(name, {}))
+            for var_name in var_names:
+                value = np.asarray(result[var_name].values)
+                values[var_name] = value.item() if value.size == 1 else np.nan
+                attrs[var_name] = {key: str(att) for key, att in result[var_name].attrs.items()}
+        except Exception as error:
+            errors.append(f'{name}: {error}')
+            for var_name in var_names:
+                values.pop(var_name, None)
+
+    return launch_time, values, attrs, '; '.join(errors)
+
+
+# Retrieval functions used by calculate_sonde_batch and the scalar variables
+# they add to the Dataset.
+_BATCH_RETRIEVALS = {
+    'stability': (
+        calculate_stability_indicies,
+        [
+            'surface_based_cape',
+            'surface_based_cin',
+            'most_unstable_cape',
+            'most_unstable_cin',
+            'lifted_index',
+            'level_of_free_convection',
+            'lifted_condensation_level_temperature',
+            'lifted_condensation_level_pressure',
+        ],
+    ),
+    'liu_liang': (
+        calculate_pbl_liu_liang,
+        [
+            'pblht_liu_liang',
+            'pblht_regime_liu_liang',
+            'pblht_liu_liang_stable_cond',
+            'pblht_liu_liang_shear_cond',
+        ],
+    ),
+    'heffter': (calculate_pbl_heffter, ['pblht_heffter']),
+}
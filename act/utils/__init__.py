@@ -34,6 +34,7 @@ __getattr__, __dir__, __all__ = lazy.attach(
             'DatastreamParserARM',
             'calculate_percentages',
             'convert_2d_to_1d',
+            'rolling_mean_std',
         ],
         'datetime_utils': [
             'dates_between',
@@ -41,6 +42,8 @@ __getattr__, __dir__, __all__ = lazy.attach(
             'determine_time_delta',
             'numpy_to_arm_date',
             'reduce_time_ranges',
+            'merge_time_ranges',
+            'time_ranges_to_mask',
             'date_parser',
             'adjust_timestamp',
         ],
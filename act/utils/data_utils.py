@@ -5,7 +5,9 @@ Module containing utilities for the data.
 
 import importlib
 import warnings
+from functools import lru_cache
 
+import dask.array
 import json
 import metpy
 import numpy as np
@@ -640,22 +642,29 @@ def convert_units(data, in_units, out_units):
     if in_units == out_units:
         return data
 
-    # Instantiate the registry
-    ureg = pint.UnitRegistry(autoconvert_offset_to_baseunit=True)
-
-    # Add missing units and conversions
-    ureg.define('fraction = []')
-    ureg.define('unitless = []')
-
     if not isinstance(data, np.ndarray):
         data = np.array(data)
 
     data_type = data.dtype
     data_type_kind = data.dtype.kind
 
-    # Do the conversion magic
-    data = (data * ureg(in_units)).to(out_units)
-    data = data.magnitude
+    # Most unit conversions are a scale and offset. Use the cached values and
+    # apply with numpy, else use pint to do the conversion.
+    plan = _get_conversion_plan(in_units, out_units)
+    if plan is not None and isinstance(plan[0], type):
+        error_type, error_args = plan
+        raise error_type(*error_args)
+
+    if plan is not None:
+        scale, offset = plan
+        data = data * scale
+        if offset != 0.0:
+            data += offset
+    else:
+        # Do the conversion magic
+        ureg = _get_unit_registry()
+        data = (data * ureg(in_units)).to(out_units)
+        data = data.magnitude
 
     # The data type may be changed by pint. This is a side effect
     # of pint changing the datatype to float. Check if the converted values
@@ -673,6 +682,56 @@ def convert_units(data, in_units, out_units):
     return data
 
 
+@lru_cache(maxsize=None)
+def _get_unit_registry():
+    """
+    Returns the pint unit registry used by convert_units(). The registry is
+    created once on first use since creating a registry is slow.
+
+    """
+    # Instantiate the registry
+    ureg = pint.UnitRegistry(autoconvert_offset_to_baseunit=True)
+
+    # Add missing units and conversions
+    ureg.define('fraction = []')
+    ureg.define('unitless = []')
+
+    return ureg
+
+
+@lru_cache(maxsize=1024)
+def _get_conversion_plan(in_units, out_units):
+    """
+    Returns the (scale, offset) tuple converting values in in_units to out_units,
+    None if the conversion is not linear, or the (exception type, exception
+    arguments) tuple of the pint exception raised when the conversion is not
+    possible. The exception itself is not cached so each call raises a new one.
+
+    """
+    ureg = _get_unit_registry()
+    try:
+        # Nonlinear units may overflow at the largest value, which is detected below
+        values = np.array([0.0, 1.0, 1.0e9])
+        with np.errstate(over='ignore', invalid='ignore'):
+            converted = (values * ureg(in_units)).to(out_units).magnitude
+    except Exception as error:
+        return type(error), error.args
+
+    offset = float(converted[0])
+    if offset == 0.0:
+        # Only a scale factor, use the value from pint directly
+        scale, check = float(converted[1]), 2
+    else:
+        # Use well separated values so the offset does not reduce the precision
+        scale = float((converted[2] - converted[0]) / (values[2] - values[0]))
+        check = 1
+
+    if not np.isclose(converted[check], scale * values[check] + offset, rtol=1e-12, atol=0.0):
+        return None
+
+    return scale, offset
+
+
 def ts_weighted_average(ts_dict):
     """
     Program to take in multiple difference time-series and average them
@@ -1523,3 +1582,154 @@ def convert_2d_to_1d(
                 new_ds[var] = new_ds[var].squeeze(dim=parse)
 
     return new_ds
+
+
+def rolling_mean_std(data, window, axis=0, center=False, min_periods=None, ddof=0):
+    """
+    Function to calculate the moving window mean and standard deviation of
+    data along one axis in a single O(n) pass using running sums. NaN
+    values are skipped. Dask arrays are processed chunk by chunk with the
+    chunks overlapping by the window size.
+
+    Parameters
+    ----------
+    data : numpy array or dask array
+        Data to process. Can be any number of dimensions.
+    window : int
+        Number of samples in the moving window.
+    axis : int
+        Axis along which to move the window, usually the time axis.
+    center : boolean
+        Option to report values at the center of the window. Matches the
+        xarray.DataArray.rolling() convention of window // 2 samples before
+        and (window - 1) // 2 samples after. If False the window is trailing
+        and ends at each sample.
+    min_periods : int or None
+        Minimum number of non-NaN values in the window required to report a
+        value. If None will use window.
+    ddof : int
+        Delta degrees of freedom used in the standard deviation calculation.
+
+    Returns
+    -------
+    mean, std : numpy array or dask array
+        Moving window mean and standard deviation with same shape as data.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from act.utils.data_utils import rolling_mean_std
+
+        mean, std = rolling_mean_std(ds['temp_mean'].values, 60, center=True, min_periods=1)
+
+    """
+    window = int(window)
+    if window < 1:
+        raise ValueError('window must be a positive integer.')
+    if min_periods is None:
+        min_periods = window
+
+    axis = axis % np.ndim(data)
+    kwargs = {'window': window, 'axis': axis, 'center': center, 'min_periods': min_periods}
+    if isinstance(data, dask.array.Array):
+        if center:
+            depth = (window // 2, (window - 1) // 2)
+        else:
+            depth = (window - 1, 0)
+
+        # Chunks need to be at least as large as the overlap.
+        if min(data.chunks[axis]) < max(depth) and data.numblocks[axis] > 1:
+            data = data.rechunk({axis: max(max(depth), max(data.chunks[axis]))})
+
+        def _block_statistic(block, index):
+            return _rolling_mean_std(block, ddof=ddof, **kwargs)[index]
+
+        return tuple(
+            data.map_overlap(
+                _block_statistic, depth={axis: depth}, boundary='none', dtype=float, index=index
+            )
+            for index in range(2)
+        )
+
+    return _rolling_mean_std(np.asarray(data), ddof=ddof, **kwargs)
+
+
+def _rolling_mean_std(data, window, axis=0, center=False, min_periods=1, ddof=0):
+    """
+    Numpy version of rolling_mean_std().
+
+    The data are split into blocks of window samples. Every window spans the
+    end of one block and the start of the next so the sums only ever
+    accumulate over two blocks. Values in each block are taken relative to
+    the block mean which keeps the sum of squares accurate for data with a
+    large offset and small variance.
+
+    """
+    data = np.moveaxis(np.asarray(data, dtype=float), axis, 0)
+    size = data.shape[0]
+
+    # For centered windows pad the end so the trailing window ending
+    # (window - 1) // 2 samples later is the centered window.
+    shift = (window - 1) // 2 if center else 0
+
+    # One leading block of padding so each window has a previous block, and
+    # trailing padding to fill the last block.
+    num_blocks = -(-(size + shift) // window) + 1
+    values = np.zeros((num_blocks * window,) + data.shape[1:])
+    count = np.zeros_like(values)
+    valid = np.isfinite(data)
+    values[window : window + size] = np.where(valid, data, 0.0)
+    count[window : window + size] = valid
+
+    values = values.reshape((num_blocks, window) + data.shape[1:])
+    count = count.reshape(values.shape)
+
+    # Block reference values. Blocks without data (the padding blocks and gaps)
+    # take the reference of the previous block with data, or the next one for
+    # leading blocks, so the shift between neighbouring blocks stays small.
+    block_count = count.sum(axis=1, keepdims=True)
+    has_data = block_count > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        reference = np.where(has_data, values.sum(axis=1, keepdims=True) / block_count, np.nan)
+    block_index = np.arange(num_blocks).reshape((-1,) + (1,) * (reference.ndim - 1))
+    previous = np.maximum.accumulate(np.where(has_data, block_index, 0), axis=0)
+    following = np.minimum.accumulate(
+        np.where(has_data, block_index, num_blocks - 1)[::-1], axis=0
+    )[::-1]
+    filled = np.take_along_axis(reference, previous, axis=0)
+    filled = np.where(np.isnan(filled), np.take_along_axis(reference, following, axis=0), filled)
+    reference = np.where(np.isnan(filled), 0.0, filled)
+    values = np.where(count > 0, values - reference, 0.0)
+
+    # Sums from the start of each block up to and including each sample, and from
+    # the next sample to the end of the block.
+    sum1 = np.cumsum(values, axis=1)
+    sum2 = np.cumsum(values**2, axis=1)
+    num = np.cumsum(count, axis=1)
+    rest1 = sum1[:, -1:] - sum1
+    rest2 = sum2[:, -1:] - sum2
+    rest_num = num[:, -1:] - num
+
+    # Combine the end of the previous block with the start of the current block,
+    # moving the previous block values to the current block reference value.
+    delta = reference[:-1] - reference[1:]
+    total_num = num[1:] + rest_num[:-1]
+    total1 = sum1[1:] + rest1[:-1] + rest_num[:-1] * delta
+    total2 = sum2[1:] + rest2[:-1] + 2.0 * delta * rest1[:-1] + rest_num[:-1] * delta**2
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total1 / total_num
+        variance = (total2 - total1 * mean) / (total_num - ddof)
+        mean = mean + reference[1:]
+
+    variance = np.where(total_num - ddof > 0, np.maximum(variance, 0.0), np.nan)
+    missing = total_num < max(min_periods, 1)
+    mean = np.where(missing, np.nan, mean)
+    std = np.where(missing, np.nan, np.sqrt(variance))
+
+    shape = (-1,) + data.shape[1:]
+    mean = mean.reshape(shape)[shift : shift + size]
+    std = std.reshape(shape)[shift : shift + size]
+
+    return np.moveaxis(mean, 0, axis), np.moveaxis(std, 0, axis)
@@ -147,6 +147,104 @@ def determine_time_delta(time, default=60):
     return float(time_delta)
 
 
+def merge_time_ranges(time_ranges):
+    """
+    Merges overlapping time ranges into the smallest set of time ranges covering
+    the same times.
+
+    Parameters
+    ----------
+    time_ranges : numpy datetime64 array
+        Array of shape (N, 2) with the start time and end time of each range.
+        Ranges with a start or end time of NaT, or an end time before the start
+        time, are removed.
+
+    Returns
+    -------
+    time_ranges : numpy datetime64 array
+        Array of shape (M, 2) with the merged time ranges sorted by start time.
+
+    """
+    time_ranges = np.asarray(time_ranges).reshape(-1, 2)
+    start, end = time_ranges[:, 0], time_ranges[:, 1]
+    keep = ~(np.isnat(start) | np.isnat(end)) & (end >= start)
+    start, end = start[keep], end[keep]
+    if start.size == 0:
+        return np.empty((0, 2), dtype=time_ranges.dtype)
+
+    order = np.argsort(start, kind='stable')
+    start, end = start[order], end[order]
+
+    # A new range begins where the start time is after all previous end times
+    max_end = np.maximum.accumulate(end)
+    first = np.flatnonzero(np.append(True, start[1:] > max_end[:-1]))
+    last = np.append(first[1:] - 1, end.size - 1)
+
+    return np.stack([start[first], max_end[last]], axis=1)
+
+
+def time_ranges_to_mask(time, time_ranges):
+    """
+    Returns a boolean mask of times within any of the time ranges. Each range
+    includes the start and end time.
+
+    Instead of comparing every time to every range, the time ranges are merged,
+    the range start and end times located in the sorted times with a binary search,
+    and the mask built from the cumulative sum of range starts minus range ends.
+
+    Parameters
+    ----------
+    time : numpy datetime64 array
+        The numpy array of date time values. Does not need to be sorted.
+    time_ranges : numpy datetime64 array or list
+        Array of shape (N, 2) or list of (start, end) pairs of datetime64 values.
+
+    Returns
+    -------
+    mask : numpy bool array
+        Boolean array the same size as time set to True where time is within
+        a time range.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        time = np.arange('2020-01-01', '2020-01-02', dtype='datetime64[h]')
+        ranges = [['2020-01-01T02', '2020-01-01T04'], ['2020-01-01T03', '2020-01-01T05']]
+        mask = time_ranges_to_mask(time, np.array(ranges, dtype='datetime64[h]'))
+        np.flatnonzero(mask)
+        array([2, 3, 4, 5])
+
+    """
+    time = np.asarray(time)
+    time_ranges = np.asarray(time_ranges)
+    if time_ranges.size == 0:
+        return np.zeros(time.shape, dtype=bool)
+
+    # Compare times at the finer of the two time resolutions
+    dtype = np.promote_types(time.dtype, time_ranges.dtype)
+    time = time.astype(dtype)
+    time_ranges = merge_time_ranges(time_ranges.astype(dtype))
+
+    sorted_time = time
+    is_sorted = time.size < 2 or bool(np.all(time[1:] >= time[:-1]))
+    if not is_sorted:
+        order = np.argsort(time, kind='stable')
+        sorted_time = time[order]
+
+    first = np.searchsorted(sorted_time, time_ranges[:, 0], side='left')
+    last = np.searchsorted(sorted_time, time_ranges[:, 1], side='right')
+    count = np.bincount(first, minlength=time.size + 1) - np.bincount(last, minlength=time.size + 1)
+    sorted_mask = np.cumsum(count[:-1]) > 0
+
+    if is_sorted:
+        return sorted_mask
+
+    mask = np.empty(time.size, dtype=bool)
+    mask[order] = sorted_mask
+    return mask
+
+
 def datetime64_to_datetime(time):
     """
     Given a numpy datetime64 array time series, return datetime
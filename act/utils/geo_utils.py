@@ -4,7 +4,9 @@ including solar calculations
 
 """
 
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
@@ -17,6 +19,10 @@ from act.utils.datetime_utils import datetime64_to_datetime
 
 skyfield_bsp_file = str(Path(Path(__file__).parent, 'conf', 'de421.bsp'))
 
+# Number of solar calculation results kept by _memoize_solar
+_SOLAR_CACHE_SIZE = 32
+_SOLAR_CACHE = OrderedDict()
+
 
 def destination_azimuth_distance(lat, lon, az, dist, dist_units='m'):
     """
@@ -184,13 +190,15 @@ def get_solar_azimuth_elevation(
     time : datetime.datetime, numpy.datetime64, list, numpy.array
         Time in UTC. May be a scalar or vector. datetime must be timezone aware.
     library : str
-        Library to use for making calculations. Options include ['skyfield']
+        Library to use for making calculations. Options include ['skyfield', 'noaa'].
+        'noaa' uses the vectorized NOAA solar calculator equations, which are much
+        faster with an accuracy of about 0.01 degrees.
     temperature_C : string or list of float
-        If library is 'skyfield' the temperature in degrees C at the surface for
+        If library is 'skyfield' or 'noaa' the temperature in degrees C at the surface for
         atmospheric compensation of the positon of the sun. Set to None for no
         compensation or 'standard' for standard model with a standard temperature.
     pressure_mbar : string or list of float
-        If library is 'skyfield' the pressure in milibars at the surface for
+        If library is 'skyfield' or 'noaa' the pressure in milibars at the surface for
         atmospheric compensation of the positon of the sun. Set to None for no
         compensation or 'standard' for standard model with a standard pressure.
 
@@ -198,42 +206,47 @@ def get_solar_azimuth_elevation(
     -------
     result : tuple of float
         Values returned are a tuple of elevation, azimuth and distance. Elevation and
-        azimuth are in degrees, with distance in Astronomical Units.
+        azimuth are in degrees, with distance in Astronomical Units. Results are
+        cached for recently used locations and times.
 
     """
 
-    # result = {'elevation': None, 'azimuth': None, 'distance': None}
-    result = (None, None, None)
+    time = _to_datetime64(time)
 
-    if library == 'skyfield':
-        planets = load_file(skyfield_bsp_file)
-        earth, sun = planets['earth'], planets['sun']
+    return _memoize_solar(
+        _solar_azimuth_elevation, latitude, longitude, time, library, temperature_C, pressure_mbar
+    )
 
-        if isinstance(time, datetime) and time.tzinfo is None:
-            time = time.replace(tzinfo=pytz.UTC)
 
-        if isinstance(time, (list, tuple)) and time[0].tzinfo is None:
-            time = [ii.replace(tzinfo=pytz.UTC) for ii in time]
+def _solar_azimuth_elevation(latitude, longitude, time, library, temperature_C, pressure_mbar):
+    """
+    Calculates solar elevation, azimuth and distance for get_solar_azimuth_elevation
+    from a numpy datetime64 array of times.
 
-        if type(time).__module__ == np.__name__ and np.issubdtype(time.dtype, np.datetime64):
-            time = time.astype('datetime64[s]').astype(int)
-            if time.size > 1:
-                time = [datetime.fromtimestamp(tm, timezone.utc) for tm in time]
-            else:
-                time = [datetime.fromtimestamp(time, timezone.utc)]
+    """
+    result = (None, None, None)
 
-        if not isinstance(time, (list, tuple, np.ndarray)):
-            time = [time]
+    if library == 'skyfield':
+        planets = _skyfield_ephemeris()
+        earth, sun = planets['earth'], planets['sun']
 
-        ts = load.timescale()
-        t = ts.from_datetimes(time)
+        t = _datetime64_to_skyfield(time)
         location = earth + wgs84.latlon(latitude, longitude)
         astrometric = location.at(t).observe(sun)
         alt, az, distance = astrometric.apparent().altaz(
             temperature_C=temperature_C, pressure_mbar=pressure_mbar
         )
         result = (alt.degrees, az.degrees, distance.au)
-        planets.close()
+
+    elif library == 'noaa':
+        elevation, azimuth, distance = _noaa_solar_position(latitude, longitude, time)
+        if temperature_C is not None and pressure_mbar is not None:
+            if temperature_C == 'standard':
+                temperature_C = 10.0
+            if pressure_mbar == 'standard':
+                pressure_mbar = 1010.0
+            elevation = elevation + _refraction(elevation, temperature_C, pressure_mbar)
+        result = (elevation, azimuth, distance)
 
     return result
 
@@ -271,8 +284,8 @@ def get_sunrise_sunset_noon(
     sunrise, sunset, noon = np.array([]), np.array([]), np.array([])
 
     if library == 'skyfield':
-        ts = load.timescale()
-        eph = load_file(skyfield_bsp_file)
+        ts = _skyfield_timescale()
+        eph = _skyfield_ephemeris()
         sf_dates = []
 
         # Parse datetime object
@@ -374,8 +387,6 @@ def get_sunrise_sunset_noon(
             sunrise = temp_sunrise[sunrise_index:sunset_index]
             sunset = temp_sunset[sunrise_index:sunset_index]
 
-        eph.close()
-
     if timezone is False:
         for ii in range(0, sunset.size):
             sunrise[ii] = sunrise[ii].replace(tzinfo=None)
@@ -386,7 +397,9 @@ def get_sunrise_sunset_noon(
     return sunrise, sunset, noon
 
 
-def is_sun_visible(latitude=None, longitude=None, date_time=None, dawn_dusk=False):
+def is_sun_visible(
+    latitude=None, longitude=None, date_time=None, dawn_dusk=False, library='skyfield'
+):
     """
     Determine if sun is above horizon at for a list of times.
 
@@ -407,42 +420,48 @@ def is_sun_visible(latitude=None, longitude=None, date_time=None, dawn_dusk=Fals
         2 - Nautical Twilight
         3 - Civil Twilight
         4 - Sun Is Up
+    library : str
+        Library to use for making calculations. Options include ['skyfield', 'noaa'].
+        See get_solar_azimuth_elevation().
 
     Returns
     -------
     result : list
         List matching size of date_time containing True/False if sun is above horizon.
     """
-    sf_dates = None
-
-    # Check if datetime object is scalar and if has no timezone.
-    if isinstance(date_time, datetime):
-        if date_time.tzinfo is None:
-            sf_dates = [date_time.replace(tzinfo=pytz.UTC)]
-        else:
-            sf_dates = [date_time]
-
-    # Check if datetime objects in list have timezone. If not add.
-    if isinstance(date_time, (list, tuple)) and isinstance(date_time[0], datetime):
-        if isinstance(date_time[0], datetime) and date_time[0].tzinfo is not None:
-            sf_dates = date_time
-        else:
-            sf_dates = [ii.replace(tzinfo=pytz.UTC) for ii in date_time]
-
-    # Convert datetime64 to datetime with timezone.
-    if type(date_time).__module__ == np.__name__ and np.issubdtype(date_time.dtype, np.datetime64):
-        sf_dates = datetime64_to_datetime(date_time)
-        sf_dates = [ii.replace(tzinfo=pytz.UTC) for ii in sf_dates]
+    if isinstance(date_time, (list, tuple)):
+        valid = len(date_time) > 0 and isinstance(date_time[0], datetime)
+    else:
+        valid = isinstance(date_time, datetime) or (
+            type(date_time).__module__ == np.__name__
+            and np.issubdtype(date_time.dtype, np.datetime64)
+        )
 
-    if sf_dates is None:
+    if not valid:
         raise ValueError(
             'The date_time values entered into is_sun_visible() ' 'do not match input types.'
         )
 
-    ts = load.timescale()
-    eph = load_file(skyfield_bsp_file)
+    return _memoize_solar(
+        _sun_visible, latitude, longitude, _to_datetime64(date_time), dawn_dusk, library
+    )
+
 
-    t0 = ts.from_datetimes(sf_dates)
+def _sun_visible(latitude, longitude, time, dawn_dusk, library):
+    """
+    Calculates the sun visible flags for is_sun_visible from a numpy datetime64
+    array of times.
+
+    """
+    if library == 'noaa':
+        elevation = _noaa_solar_position(latitude, longitude, time)[0]
+        # Same limits as the skyfield almanac functions
+        if dawn_dusk:
+            return np.digitize(elevation, [-18.0, -12.0, -6.0, -0.8333])
+        return elevation > -0.8333
+
+    eph = _skyfield_ephemeris()
+    t0 = _datetime64_to_skyfield(time)
     location = wgs84.latlon(latitude, longitude)
     if dawn_dusk:
         f = almanac.dark_twilight_day(eph, location)
@@ -451,6 +470,182 @@ def is_sun_visible(latitude=None, longitude=None, date_time=None, dawn_dusk=Fals
 
     sun_up = f(t0)
 
-    eph.close()
-
     return sun_up
+
+
+@lru_cache(maxsize=None)
+def _skyfield_ephemeris():
+    """
+    Loads the skyfield ephemeris file once for the process.
+
+    """
+    return load_file(skyfield_bsp_file)
+
+
+@lru_cache(maxsize=None)
+def _skyfield_timescale():
+    """
+    Loads the skyfield timescale once for the process.
+
+    """
+    return load.timescale()
+
+
+def _to_datetime64(time):
+    """
+    Converts datetime, list of datetime or numpy datetime64 values to a 1D numpy
+    datetime64[ns] array in UTC. Datetimes without a timezone are assumed to be UTC.
+
+    """
+    if isinstance(time, datetime):
+        time = [time]
+
+    if isinstance(time, (list, tuple)) and len(time) > 0 and isinstance(time[0], datetime):
+        time = [
+            tm.astimezone(timezone.utc).replace(tzinfo=None) if tm.tzinfo is not None else tm
+            for tm in time
+        ]
+
+    return np.atleast_1d(np.asarray(time, dtype='datetime64[ns]'))
+
+
+def _datetime64_to_skyfield(time):
+    """
+    Converts numpy datetime64 values to a skyfield Time object without going
+    through Python datetime objects.
+
+    """
+    time = np.asarray(time, dtype='datetime64[ns]').astype(np.int64)
+    day_ns = 86400 * 10**9
+    days = time // day_ns
+    seconds = (time - days * day_ns) / 1e9
+
+    return _skyfield_timescale().utc(1970, 1, 1 + days, 0, 0, seconds)
+
+
+def _memoize_solar(function, latitude, longitude, time, *args):
+    """
+    Calls a solar calculation function, keeping the most recent results keyed
+    on the location, time grid and other arguments. Copies of the cached
+    results are returned so callers may modify them.
+
+    """
+    key = (
+        function.__name__,
+        tuple(np.ravel(latitude).tolist()),
+        tuple(np.ravel(longitude).tolist()),
+        time.tobytes(),
+        *args,
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return function(latitude, longitude, time, *args)
+
+    if key in _SOLAR_CACHE:
+        _SOLAR_CACHE.move_to_end(key)
+        result = _SOLAR_CACHE[key]
+    else:
+        result = function(latitude, longitude, time, *args)
+        _SOLAR_CACHE[key] = result
+        if len(_SOLAR_CACHE) > _SOLAR_CACHE_SIZE:
+            _SOLAR_CACHE.popitem(last=False)
+
+    if isinstance(result, tuple):
+        return tuple(None if value is None else np.copy(value) for value in result)
+
+    return np.copy(result)
+
+
+def _noaa_solar_position(latitude, longitude, time):
+    """
+    Calculates solar elevation and azimuth in degrees and distance in Astronomical
+    Units from numpy datetime64 times using the NOAA solar calculator equations,
+    based on Meeus, Astronomical Algorithms. Elevation does not include refraction.
+
+    """
+    time = np.asarray(time, dtype='datetime64[ns]')
+    latitude = np.radians(np.asarray(latitude, dtype=float))
+    longitude = np.asarray(longitude, dtype=float)
+
+    # Julian century
+    day_ns = 86400 * 10**9
+    julian_day = time.astype(np.int64) / day_ns + 2440587.5
+    jc = (julian_day - 2451545.0) / 36525.0
+
+    # Sun mean longitude and anomaly, Earth orbit eccentricity
+    mean_long = np.radians((280.46646 + jc * (36000.76983 + jc * 0.0003032)) % 360.0)
+    mean_anom = np.radians(357.52911 + jc * (35999.05029 - 0.0001537 * jc))
+    eccent = 0.016708634 - jc * (0.000042037 + 0.0000001267 * jc)
+
+    # Sun equation of center, true anomaly and apparent longitude
+    center = np.radians(
+        np.sin(mean_anom) * (1.914602 - jc * (0.004817 + 0.000014 * jc))
+        + np.sin(2 * mean_anom) * (0.019993 - 0.000101 * jc)
+        + np.sin(3 * mean_anom) * 0.000289
+    )
+    true_anom = mean_anom + center
+    distance = 1.000001018 * (1 - eccent**2) / (1 + eccent * np.cos(true_anom))
+    omega = np.radians(125.04 - 1934.136 * jc)
+    app_long = mean_long + center - np.radians(0.00569 + 0.00478 * np.sin(omega))
+
+    # Obliquity and declination
+    obliq = 23.0 + (26.0 + (21.448 - jc * (46.815 + jc * (0.00059 - jc * 0.001813))) / 60.0) / 60.0
+    obliq = np.radians(obliq + 0.00256 * np.cos(omega))
+    declination = np.arcsin(np.sin(obliq) * np.sin(app_long))
+
+    # Equation of time in minutes
+    var_y = np.tan(obliq / 2.0) ** 2
+    eq_time = 4.0 * np.degrees(
+        var_y * np.sin(2 * mean_long)
+        - 2 * eccent * np.sin(mean_anom)
+        + 4 * eccent * var_y * np.sin(mean_anom) * np.cos(2 * mean_long)
+        - 0.5 * var_y**2 * np.sin(4 * mean_long)
+        - 1.25 * eccent**2 * np.sin(2 * mean_anom)
+    )
+
+    # Hour angle from true solar time
+    minutes = (time - time.astype('datetime64[D]')).astype(np.int64) / 6.0e10
+    solar_time = (minutes + eq_time + 4.0 * longitude) % 1440.0
+    hour_angle = np.radians(solar_time / 4.0 - 180.0)
+
+    elevation = np.arcsin(
+        np.sin(latitude) * np.sin(declination)
+        + np.cos(latitude) * np.cos(declination) * np.cos(hour_angle)
+    )
+    azimuth = (
+        np.degrees(
+            np.arctan2(
+                np.sin(hour_angle),
+                np.cos(hour_angle) * np.sin(latitude) - np.tan(declination) * np.cos(latitude),
+            )
+        )
+        + 180.0
+    ) % 360.0
+
+    return np.degrees(elevation), azimuth, distance
+
+
+def _refraction(elevation, temperature_C, pressure_mbar):
+    """
+    Atmospheric refraction correction in degrees for a true elevation in degrees,
+    using the Bennett formula iterated to the apparent elevation the same way as
+    skyfield. No correction is applied below -1 or above 89.9 degrees.
+
+    """
+
+    def bennett(elev):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            refraction = 0.016667 / np.tan(np.radians(elev + 7.31 / (elev + 4.4)))
+        scale = 0.28 * np.asarray(pressure_mbar) / (np.asarray(temperature_C) + 273.0)
+        refraction = refraction * scale
+        return np.where((elev >= -1.0) & (elev <= 89.9), refraction, 0.0)
+
+    apparent = np.asarray(elevation, dtype=float)
+    for _ in range(20):
+        previous = apparent
+        apparent = elevation + bennett(apparent)
+        if np.all(np.abs(apparent - previous) <= 3.0e-5):
+            break
+
+    return apparent - elevation
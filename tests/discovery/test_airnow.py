@@ -1,6 +1,7 @@
 import os
 
 import numpy as np
+import pandas as pd
 
 import act
 
@@ -51,3 +52,86 @@ def test_get_airnow():
         assert results['PM2.5'].values[-1, 0] == 1.8
         assert results['OZONE'].values[0, 0] == 37.0
         assert len(results['time'].values) == 13
+
+
+def test_bounded_obs_to_dataset(tmp_path):
+    # Synthetic AirNow response with two times, three sites and two parameters.
+    # Site C has no PM2.5 and the first OZONE line for A at the first time is repeated.
+    lines = []
+    sites = [('A', 41.1, -88.1, 1), ('B', 41.2, -88.2, 2), ('C', 41.3, -88.3, 3)]
+    for time in ['2022-05-01T00:00', '2022-05-01T01:00']:
+        for site, lat, lon, aqs in sites:
+            for param, unit, conc in [('OZONE', 'PPB', 30.0), ('PM2.5', 'UG/M3', 5.0)]:
+                if site == 'C' and param == 'PM2.5':
+                    continue
+                value = conc + aqs + (10 if time.endswith('01:00') else 0)
+                lines.append(
+                    f'{lat},{lon},{time},{param},{value},{unit},{value + 0.5},{aqs * 10},1,'
+                    f'{site},Agency,{aqs},840{aqs}'
+                )
+    lines.insert(1, '41.1,-88.1,2022-05-01T00:00,OZONE,99.0,PPB,99.5,99,2,A,Agency,1,8401')
+    filename = tmp_path / 'airnow.csv'
+    filename.write_text('\n'.join(lines))
+    names = [
+        'latitude',
+        'longitude',
+        'time',
+        'parameter',
+        'concentration',
+        'unit',
+        'raw_concentration',
+        'AQI',
+        'category',
+        'site_name',
+        'site_agency',
+        'aqs_id',
+        'full_aqs_id',
+    ]
+    df = pd.read_csv(filename, names=names)
+
+    ds = act.discovery.airnow._bounded_obs_to_dataset(df)
+    assert list(ds.data_vars) == [
+        'latitude',
+        'longitude',
+        'aqs_id',
+        'OZONE',
+        'PM2.5',
+        'AQI',
+        'category',
+        'raw_concentration',
+    ]
+    assert list(ds['sites'].values) == ['A', 'B', 'C']
+    np.testing.assert_array_equal(ds['latitude'].values, [41.1, 41.2, 41.3])
+    np.testing.assert_array_equal(ds['aqs_id'].values, [1, 2, 3])
+    np.testing.assert_array_equal(ds['OZONE'].values, [[31.0, 32.0, 33.0], [41.0, 42.0, 43.0]])
+    np.testing.assert_array_equal(ds['PM2.5'].values[:, :2], [[6.0, 7.0], [16.0, 17.0]])
+    assert np.all(np.isnan(ds['PM2.5'].values[:, 2]))
+    assert ds['OZONE'].attrs['units'] == 'PPB'
+    assert ds['PM2.5'].attrs['units'] == 'UG/M3'
+    np.testing.assert_array_equal(ds['AQI'].values, [[10, 20, 30], [10, 20, 30]])
+    np.testing.assert_array_equal(ds['raw_concentration'].values[:, 0], [31.5, 41.5])
+    assert ds['time'].values[1] == np.datetime64('2022-05-01T01:00')
+
+    # Lines without a site name or time are dropped instead of overwriting a site
+    missing = pd.DataFrame(
+        {
+            'latitude': [1.0, 2.0, 3.0, 4.0],
+            'longitude': [-1.0, -2.0, -3.0, -4.0],
+            'time': ['2022-05-01T00:00', '2022-05-01T00:00', '2022-05-01T00:00', np.nan],
+            'parameter': ['PM2.5'] * 4,
+            'concentration': [10.0, 20.0, 30.0, 40.0],
+            'unit': ['UG/M3'] * 4,
+            'raw_concentration': [10.5, 20.5, 30.5, 40.5],
+            'AQI': [1, 2, 3, 4],
+            'category': [1, 1, 1, 1],
+            'site_name': ['A', 'B', np.nan, 'A'],
+            'site_agency': ['Agency'] * 4,
+            'aqs_id': [1, 2, 3, 4],
+            'full_aqs_id': [8401, 8402, 8403, 8404],
+        }
+    )
+    ds = act.discovery.airnow._bounded_obs_to_dataset(missing)
+    assert list(ds['sites'].values) == ['A', 'B']
+    assert ds['time'].size == 1
+    np.testing.assert_array_equal(ds['latitude'].values, [1.0, 2.0])
+    np.testing.assert_array_equal(ds['PM2.5'].values, [[10.0, 20.0]])
@@ -113,3 +113,111 @@ def test_arm_doi():
 
     doi = act.discovery.get_arm_doi('test', startdate, enddate)
     assert 'No DOI Found' in doi
+
+
+def test_download_armdata_local_server(tmp_path, monkeypatch):
+    import http.server
+    import json
+    import threading
+    from urllib.parse import parse_qs, urlparse
+
+    files = {
+        'sgpmetE13.b1.20200101.000000.cdf': bytes(range(256)) * 40,
+        'sgpmetE13.b1.20200102.000000.cdf': bytes(range(128)) * 50,
+        'sgpmetE13.b1.20200103.000000.cdf': b'This data file is not available',
+        'sgpmetE13.b1.20200104.000000.cdf': None,
+    }
+    requested = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path.endswith('query'):
+                body = json.dumps({'status': 'success', 'files': list(files)}).encode()
+                self.send_response(200)
+            else:
+                fname = query['file'][0]
+                data = files[fname]
+                requested.append((fname, self.headers.get('Range')))
+                if data is None:
+                    self.send_error(500)
+                    return
+                rng = self.headers.get('Range')
+                if rng is not None:
+                    start = int(rng.split('=')[1].split('-')[0])
+                    body = data[start:]
+                    self.send_response(206)
+                else:
+                    body = data
+                    self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        act.discovery.arm, 'ARM_LIVE_URL', f'http://127.0.0.1:{server.server_port}/'
+    )
+    monkeypatch.setattr(act.discovery.arm, 'get_arm_doi', lambda *args: 'doi')
+
+    try:
+        outdir = str(tmp_path)
+        results, report = act.discovery.arm.download_arm_data(
+            'user',
+            'token',
+            'sgpmetE13.b1',
+            '2020-01-01',
+            '2020-01-03',
+            output=outdir,
+            max_workers=3,
+            chunk_size=100,
+            return_report=True,
+        )
+        names = list(files)
+        assert results == [os.path.join(outdir, fname) for fname in names[:2]]
+        for fname in names[:2]:
+            with open(os.path.join(outdir, fname), 'rb') as fh:
+                assert fh.read() == files[fname]
+            assert report[fname]['status'] == 'downloaded'
+            assert report[fname]['bytes'] == len(files[fname])
+        assert report[names[2]]['status'] == 'unavailable'
+        assert not os.path.isfile(os.path.join(outdir, names[2]))
+
+        # A failed file is reported and does not stop the other downloads
+        assert report[names[3]]['status'] == 'failed'
+        assert '500' in report[names[3]]['error']
+        assert not os.path.isfile(os.path.join(outdir, names[3]))
+
+        # Complete files are skipped and partial files are resumed
+        os.remove(os.path.join(outdir, names[1]))
+        with open(os.path.join(outdir, names[1] + '.partial'), 'wb') as fh:
+            fh.write(files[names[1]][:1000])
+        requested.clear()
+        results, report = act.discovery.arm.download_arm_data(
+            'user',
+            'token',
+            'sgpmetE13.b1',
+            '2020-01-01',
+            '2020-01-03',
+            output=outdir,
+            max_workers=2,
+            return_report=True,
+        )
+        assert len(results) == 2
+        assert report[names[0]]['status'] == 'skipped'
+        assert report[names[0]]['bytes'] == 0
+        assert report[names[1]]['status'] == 'downloaded'
+        assert report[names[1]]['bytes'] == len(files[names[1]]) - 1000
+        assert (names[1], 'bytes=1000-') in requested
+        with open(os.path.join(outdir, names[1]), 'rb') as fh:
+            assert fh.read() == files[names[1]]
+        assert not os.path.isfile(os.path.join(outdir, names[1] + '.partial'))
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -29,3 +29,108 @@ def test_get_region():
         )
     asos_keys = sorted(list(my_asoses.keys()))
     assert asos_keys == my_keys
+
+
+def test_get_asos_local_server(tmp_path, monkeypatch):
+    import http.server
+    import json
+    import threading
+    from urllib.parse import parse_qs, urlparse
+
+    columns = (
+        'station,valid,lon,lat,tmpf,dwpf,relh,drct,sknt,alti,mslp,vsby,gust,'
+        'skyc1,skyc2,skyc3,skyc4,skyl1,skyl2,skyl3,skyl4,wxcodes,'
+        'ice_accretion_1hr,ice_accretion_3hr,ice_accretion_6hr,'
+        'peak_wind_gust,peak_wind_drct,metar'
+    )
+
+    def station_csv(sid, speeds):
+        lines = ['#DEBUG: header'] * 5 + [columns]
+        for minute, speed in enumerate(speeds):
+            lines.append(
+                f'{sid},2020-02-04 02:{minute:02d},-87.9,41.9,30.0,20.0,66.0,270.0,{speed},'
+                f'30.1,1015.0,10.0,M,CLR,M,M,M,M,M,M,M,M,M,M,M,M,M,{sid} METAR'
+            )
+        return '\n'.join(lines) + '\n'
+
+    stations = {
+        'AAA': (41.9, -87.9, station_csv('AAA', [10.0, 12.0, 14.0])),
+        'BBB': (42.0, -88.0, station_csv('BBB', [5.0, 6.0])),
+        'CCC': (42.1, -88.1, '#DEBUG: header\n' * 5 + columns + '\n'),
+        'FAR': (10.0, -10.0, station_csv('FAR', [1.0])),
+    }
+    network_requests = []
+    station_requests = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.endswith('.geojson'):
+                network_requests.append(url.path)
+                features = []
+                # Station AAA is in both networks
+                for sid, (lat, lon, _) in stations.items():
+                    if url.path.endswith('AWOS.geojson') and sid != 'AAA':
+                        continue
+                    features.append(
+                        {
+                            'geometry': {'coordinates': [lon, lat]},
+                            'properties': {'sid': sid, 'elevation': 200.0},
+                        }
+                    )
+                body = json.dumps({'features': features}).encode()
+            else:
+                sid = parse_qs(url.query)['station'][0]
+                station_requests.append(sid)
+                # The first request for BBB fails and is retried
+                if sid == 'BBB' and station_requests.count(sid) == 1:
+                    body = b'ERROR: Service is busy'
+                else:
+                    body = stations[sid][2].encode()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_port}/'
+    monkeypatch.setattr(act.discovery.asos, 'ASOS_SERVICE_URL', url + 'asos.py?')
+    monkeypatch.setattr(act.discovery.asos, 'ASOS_NETWORK_URL', url)
+    monkeypatch.setattr(act.discovery.asos, '_DOWNLOAD_BACKOFF', 0.0)
+
+    try:
+        time_window = [datetime(2020, 2, 4, 2, 0), datetime(2020, 2, 4, 3, 0)]
+        with pytest.warns(UserWarning, match='No data available at station CCC'):
+            my_asoses = act.discovery.get_asos_data(
+                time_window,
+                lat_range=(41.5, 42.5),
+                lon_range=(-88.5, -87.5),
+                regions='IL',
+                max_workers=4,
+                cache_dir=str(tmp_path),
+            )
+        assert list(my_asoses.keys()) == ['AAA', 'BBB']
+        np.testing.assert_array_equal(my_asoses['AAA']['sknt'].values, [10.0, 12.0, 14.0])
+        np.testing.assert_array_equal(my_asoses['BBB']['sknt'].values, [5.0, 6.0])
+        assert my_asoses['AAA']['time'].values[1] == np.datetime64('2020-02-04T02:01')
+        assert np.all(np.isnan(my_asoses['AAA']['gust'].values))
+        assert sorted(station_requests) == ['AAA', 'BBB', 'BBB', 'CCC']
+        assert len(network_requests) == 2
+
+        # Network metadata are read from the cache on the second call
+        station_requests.clear()
+        my_asoses = act.discovery.get_asos_data(
+            time_window, station='AAA', regions='IL', cache_dir=str(tmp_path)
+        )
+        assert list(my_asoses.keys()) == ['AAA']
+        assert my_asoses['AAA'].attrs['elevation'] == '200.000000 meter'
+        assert station_requests == ['AAA']
+        assert len(network_requests) == 2
+    finally:
+        server.shutdown()
+        server.server_close()
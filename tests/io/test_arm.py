@@ -1,7 +1,10 @@
+import shutil
 import tempfile
 from pathlib import Path
 
+import dask.array
 import numpy as np
+import xarray as xr
 
 import act
 from act.tests import sample_files
@@ -144,6 +147,119 @@ def test_read_arm_netcdf_mfdataset():
     del met_ds
 
 
+def test_read_arm_netcdf_lazy():
+    met_ds = act.io.arm.read_arm_netcdf(act.tests.EXAMPLE_MET_WILDCARD)
+    lazy_ds = act.io.arm.read_arm_netcdf(
+        act.tests.EXAMPLE_MET_WILDCARD, lazy=True, chunks={'time': 720}
+    )
+    assert isinstance(lazy_ds['temp_mean'].data, dask.array.Array)
+    assert isinstance(lazy_ds['time_offset'].data, dask.array.Array)
+    assert set(lazy_ds['temp_mean'].chunks[0]) == {720}
+    assert np.issubdtype(lazy_ds['time_offset'].dtype, np.datetime64)
+    assert lazy_ds.attrs['_file_dates'] == met_ds.attrs['_file_dates']
+    np.testing.assert_array_equal(lazy_ds['time'].values, met_ds['time'].values)
+    np.testing.assert_array_equal(lazy_ds['time_offset'].values, met_ds['time_offset'].values)
+    np.testing.assert_array_equal(lazy_ds['temp_mean'].values, met_ds['temp_mean'].values)
+
+    lazy_ds = act.io.arm.read_arm_netcdf(
+        act.tests.EXAMPLE_MET_WILDCARD, lazy=True, keep_variables='temp_mean'
+    )
+    assert list(lazy_ds.data_vars) == ['temp_mean']
+    met_ds.close()
+    lazy_ds.close()
+
+
+def test_read_arm_netcdf_time_range():
+    ds = act.io.arm.read_arm_netcdf(
+        act.tests.EXAMPLE_MET_WILDCARD,
+        start_time='2019-01-03T10:00:00',
+        end_time='2019-01-04T02:00:00',
+    )
+    assert ds.attrs['_file_dates'] == ['20190103', '20190104']
+    assert ds['time'].values[0] == np.datetime64('2019-01-03T10:00:00')
+    assert ds['time'].values[-1] == np.datetime64('2019-01-04T02:00:00')
+    ds.close()
+
+    ds = act.io.arm.read_arm_netcdf(act.tests.EXAMPLE_MET_WILDCARD, end_time='2019-01-01T12:00:00')
+    assert ds.attrs['_file_dates'] == ['20190101']
+    assert ds['time'].values[-1] == np.datetime64('2019-01-01T12:00:00')
+    ds.close()
+
+    # File names not following ARM standards use the time range from the file
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        for ii, filename in enumerate(act.tests.EXAMPLE_MET_WILDCARD):
+            shutil.copy(filename, Path(tmpdirname, f'met_{ii}.nc'))
+        ds = act.io.arm.read_arm_netcdf(
+            str(Path(tmpdirname, 'met_*.nc')),
+            start_time='2019-01-05T10:00:00',
+            end_time='2019-01-05T12:00:00',
+        )
+        assert ds.attrs['_file_dates'] == ['20190105']
+        assert ds['time'].size == 121
+        ds.close()
+
+
+def _double_temp_mean(ds):
+    ds['temp_mean_double'] = ds['temp_mean'] * 2
+    return ds
+
+
+def test_read_arm_netcdf_max_workers():
+    met_ds = act.io.arm.read_arm_netcdf(act.tests.EXAMPLE_MET_WILDCARD)
+    met_ds.load()
+    pool_ds = act.io.arm.read_arm_netcdf(act.tests.EXAMPLE_MET_WILDCARD, max_workers=2)
+    xr.testing.assert_identical(met_ds, pool_ds)
+
+    pool_ds = act.io.arm.read_arm_netcdf(
+        act.tests.EXAMPLE_MET_WILDCARD, max_workers=2, keep_variables='temp_mean'
+    )
+    assert list(pool_ds.data_vars) == ['temp_mean']
+    assert pool_ds.attrs['_file_dates'] == met_ds.attrs['_file_dates']
+
+    # Preprocess and combine keywords are applied the same as open_mfdataset()
+    kwargs = {
+        'preprocess': _double_temp_mean,
+        'attrs_file': sorted(act.tests.EXAMPLE_MET_WILDCARD)[-1],
+        'data_vars': 'minimal',
+    }
+    met_ds = act.io.arm.read_arm_netcdf(act.tests.EXAMPLE_MET_WILDCARD, **kwargs)
+    met_ds.load()
+    pool_ds = act.io.arm.read_arm_netcdf(act.tests.EXAMPLE_MET_WILDCARD, max_workers=2, **kwargs)
+    xr.testing.assert_identical(met_ds, pool_ds)
+    assert 'temp_mean_double' in pool_ds
+
+    with np.testing.assert_raises(ValueError):
+        act.io.arm.read_arm_netcdf(act.tests.EXAMPLE_MET_WILDCARD, max_workers=2, lazy=True)
+
+    pool_ds = act.io.arm.read_arm_netcdf(['./randomfile.nc'], max_workers=2, return_None=True)
+    assert pool_ds is None
+
+
+def test_get_file_info():
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        index_file = Path(tmpdirname, 'index.json')
+        info = act.io.arm.get_file_info(act.tests.EXAMPLE_MET1, index_file=index_file)
+        assert index_file.is_file()
+        assert info['variables']['temp_mean'] == ['time']
+        assert info['dimensions']['time'] == 1440
+        assert info['time_range'] == [
+            '2019-01-01T00:00:00.000000000',
+            '2019-01-01T23:59:00.000000000',
+        ]
+
+        info = act.io.arm.get_file_info(act.tests.EXAMPLE_MET_WILDCARD, index_file=index_file)
+        assert len(info) == 7
+        assert info[-1]['time_range'][0] == '2019-01-07T00:00:00.000000000'
+
+    # Without an index file nothing is written next to the data
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        filename = Path(tmpdirname, 'met.nc')
+        shutil.copy(act.tests.EXAMPLE_MET1, filename)
+        info = act.io.arm.get_file_info(filename)
+        assert info['dimensions']['time'] == 1440
+        assert list(Path(tmpdirname).iterdir()) == [filename]
+
+
 def test_io_dod():
     dims = {'time': 1440, 'drop_diameter': 50}
 
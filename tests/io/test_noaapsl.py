@@ -1,5 +1,6 @@
 import numpy as np
 import pytest
+import xarray as xr
 
 import act
 from act.io import read_psl_surface_met, read_psl_wind_profiler_temperature
@@ -127,9 +128,14 @@ def test_read_psl_fmcw_moment():
     )
     ds = act.io.noaapsl.read_psl_radar_fmcw_moment([result[-1]])
     assert 'range' in ds
-    np.testing.assert_almost_equal(ds['reflectivity_uncalibrated'].mean(), 2.37, decimal=2)
+    # The second record of the file was skipped by earlier versions of the reader
+    assert np.isfinite(ds['reflectivity_uncalibrated'].values[1]).any()
+    np.testing.assert_almost_equal(
+        ds['reflectivity_uncalibrated'].drop_isel(time=1).mean(), 2.37, decimal=2
+    )
     assert ds['range'].max() == 10040.0
-    assert len(ds['time'].values) == 115
+    assert len(ds['time'].values) == 116
+    assert ds['time'].dtype == np.dtype('datetime64[ns]')
 
 
 def test_read_psl_sband_moment():
@@ -138,6 +144,108 @@ def test_read_psl_sband_moment():
     )
     ds = act.io.noaapsl.read_psl_radar_sband_moment([result[-1]])
     assert 'range' in ds
-    np.testing.assert_almost_equal(ds['reflectivity_uncalibrated'].mean(), 1.00, decimal=2)
+    # The second record of the file was skipped by earlier versions of the reader
+    assert np.isfinite(ds['reflectivity_uncalibrated'].values[1]).any()
+    np.testing.assert_almost_equal(
+        ds['reflectivity_uncalibrated'].drop_isel(time=1).mean(), 1.00, decimal=2
+    )
     assert ds['range'].max() == 9997.0
-    assert len(ds['time'].values) == 37
+    assert len(ds['time'].values) == 38
+
+
+def test_read_psl_radar_moment_synthetic(tmp_path):
+    n_gates = 20
+    rng = np.random.default_rng(0)
+    files = []
+    for ii in range(2):
+        lines = [' kps  3896 -10698  2857  2835000000']
+        for jj in range(50):
+            lines.append(f'   0.0  90.0  1 22 227 0{6 + ii} {jj:02d} 30')
+            lines.append(f'  100  40  105  60  {n_gates}  1  10  256  1')
+            for gate in range(n_gates):
+                values = ' '.join(f'{value:8.2f}' for value in rng.normal(size=5))
+                lines.append(f'{values} {gate}')
+        files.append(str(tmp_path / f'kps2222{ii}.txt'))
+        with open(files[-1], 'w') as fh:
+            fh.write('\n'.join(lines) + '\n')
+
+    ds = act.io.noaapsl.read_psl_radar_fmcw_moment(files)
+    assert ds.sizes['file'] == 2
+    assert ds.sizes['time'] == 100
+    assert ds.sizes['range'] == n_gates - 1
+    assert ds['range'].values[-1] == 105.0 + 60.0 * (n_gates - 2)
+    assert ds['time'].dtype == np.dtype('datetime64[ns]')
+    assert ds['time'].values[1] == np.datetime64('2022-08-15T06:01:30')
+    assert ds['time'].values[-1] == np.datetime64('2022-08-15T07:49:30')
+    np.testing.assert_array_equal(ds['qc_variable'].values[0], np.arange(n_gates - 1))
+    np.testing.assert_allclose(
+        ds['reflectivity_uncalibrated'].values,
+        ds['snr'].values + 40.0 * np.log10(ds['range'].values / 1000.0),
+    )
+
+    ds_parallel = act.io.noaapsl.read_psl_radar_sband_moment(files, max_workers=2)
+    xr.testing.assert_identical(ds, ds_parallel)
+
+
+def test_read_psl_wind_profiler_multiple_files(tmp_path):
+    rng = np.random.default_rng(0)
+    files = []
+    for ii in range(2):
+        lines = ['CTD Wind Profiler']
+        for jj in range(6):
+            n_gates = 10 + jj % 2
+            lines += [
+                'CTD',
+                'WINDS  C  5.1',
+                '  34.66  -87.35  187.0',
+                f' 21  5  {5 + ii} 15 {jj * 5:2d}  1  0',
+                f'  24  3  {n_gates}',
+                '  1  1  1  1  1',
+                '  50  50  50  50  708  708  50  50',
+                f'  20.9  20.9  0  4000  4000  {n_gates}  {n_gates}  708  708',
+                '  38.0  90.0  38.0  74.7  308.0  74.7',
+                '  HT  SPD  DIR  RAD  CNT  SNR  QC  RAD  CNT  SNR  QC  RAD  CNT  SNR  QC',
+            ]
+            for gate in range(n_gates):
+                values = ' '.join(f'{value:.1f}' for value in rng.normal(size=14))
+                lines.append(f'  {0.151 + 0.1 * gate:.3f} {values}')
+            lines.append('$')
+        # Missing values are encoded as 999999
+        values = lines[-4].split()
+        lines[-4] = '  ' + ' '.join(values[:1] + ['999999'] + values[2:])
+        files.append(str(tmp_path / f'ctd2112{5 + ii}.15w'))
+        with open(files[-1], 'w') as fh:
+            fh.write('\n'.join(lines) + '\n')
+
+    ds_low, ds_hi = act.io.noaapsl.read_psl_wind_profiler(files, transpose=False)
+    assert ds_low['SPD'].shape == (6, 10)
+    assert ds_hi['SPD'].shape == (6, 11)
+    assert ds_low['time'].values[3] == np.datetime64('2021-05-06T15:00:01')
+    assert ds_low['HT'].attrs['units'] == 'km'
+    assert ds_low.attrs['number_of_range_gates'] == 10
+    assert np.isnan(ds_hi['SPD'].values[-1, -3])
+    assert set(ds_low.data_vars) == {
+        'SPD',
+        'DIR',
+        'RAD1',
+        'RAD2',
+        'RAD3',
+        'CNT1',
+        'CNT2',
+        'CNT3',
+        'SNR1',
+        'SNR2',
+        'SNR3',
+        'QC1',
+        'QC2',
+        'QC3',
+    }
+
+    for ds, ds_single in zip(
+        (ds_low, ds_hi), act.io.noaapsl.read_psl_wind_profiler(files[0], transpose=False)
+    ):
+        xr.testing.assert_identical(ds.isel(time=slice(0, 3)), ds_single)
+
+    ds_parallel = act.io.noaapsl.read_psl_wind_profiler(files, transpose=False, max_workers=2)
+    xr.testing.assert_identical(ds_low, ds_parallel[0])
+    xr.testing.assert_identical(ds_hi, ds_parallel[1])
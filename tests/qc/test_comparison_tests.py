@@ -85,9 +85,14 @@ def test_compare_time_series_trends():
     ds2 = ds2.assign_coords({'time': time})
     ds2['time'].attrs = time_attrs
 
-    ds.qcfilter.compare_time_series_trends(
+    result = ds.qcfilter.compare_time_series_trends(
         var_name=var_name, comp_dataset=ds2, time_step=60, time_match_threshhold=50
     )
+    assert result['time_shift'] == 3600
+    assert result['time_shifts'].size == result['time_shift_scores'].size == 121
+    assert result['time_shifts'][0] == -3600
+    assert result['time_shift_scores'][-1] == 0.0
+    assert np.all(result['time_shift_scores'][:-1] > 0.0)
 
     test_description = (
         'Time shift detected with Minimum Difference test. Comparison of '
@@ -227,6 +227,34 @@ def test_qc_summary_scalar():
     assert 'flag_values' in ds[f'qc_{var_names[1]}'].attrs.keys()
 
 
+def test_qc_summary_dask():
+    ds = read_arm_netcdf(EXAMPLE_MET1, keep_variables=['temp_mean', 'rh_mean'])
+    for var_name in ['temp_mean', 'rh_mean']:
+        for ii, assessment in enumerate(['Bad', 'Suspect', 'Indeterminate', 'Incorrect']):
+            ds.qcfilter.add_test(
+                var_name,
+                index=np.arange(ii * 50, ii * 50 + 100),
+                test_meaning=f'Testing {assessment}',
+                test_assessment=assessment,
+            )
+
+    ds_dask = ds.chunk({'time': 300})
+    result = ds.qcfilter.create_qc_summary(normalize_assessment=False)
+    result_dask = ds_dask.qcfilter.create_qc_summary(normalize_assessment=False)
+
+    for var_name in ['temp_mean', 'rh_mean']:
+        qc_var_name = f'qc_{var_name}'
+        assert result_dask[qc_var_name].chunks == ds_dask[var_name].chunks
+        assert result_dask[qc_var_name].dtype == result[qc_var_name].dtype
+        np.testing.assert_array_equal(result_dask[qc_var_name].values, result[qc_var_name].values)
+        assert result[qc_var_name].attrs['flag_values'] == [0, 1, 2, 3, 4]
+        # Bad takes precedence over the other assessments
+        np.testing.assert_array_equal(result[qc_var_name].values[:100], 4)
+        np.testing.assert_array_equal(result[qc_var_name].values[100:150], 2)
+        np.testing.assert_array_equal(result[qc_var_name].values[150:250], 3)
+        assert np.sum(result[qc_var_name].values[250:]) == 0
+
+
 @pytest.mark.big
 @pytest.mark.skipif('ARCHIVE_DATA' not in environ, reason="Running outside ADC system.")
 def test_qc_summary_big_data():
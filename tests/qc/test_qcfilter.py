@@ -9,7 +9,7 @@ import xarray as xr
 
 from act.io.arm import read_arm_netcdf
 from act.qc.arm import add_dqr_to_qc
-from act.qc.qcfilter import parse_bit, set_bit, unset_bit
+from act.qc.qcfilter import parse_bit, set_bit, unpack_bits, unset_bit
 from act.tests import EXAMPLE_MET1, EXAMPLE_METE40, EXAMPLE_IRT25m20s
 
 try:
@@ -488,3 +488,171 @@ def test_qc_data_type():
     assert ds[expected_qc_var_name].attrs['flag_masks'][0].dtype == np.uint64
 
     ds.qcfilter.add_test(var_name, index=[1], test_meaning='Fourth test', recycle=True)
+
+
+def test_qcfilter_dask():
+    data = np.arange(100.0).reshape(20, 5)
+    ds = xr.Dataset(
+        {'data': (('time', 'height'), data, {'units': '1', 'long_name': 'Data'})},
+        coords={'time': pd.date_range('2020-01-01', periods=20, freq='min'), 'height': range(5)},
+    )
+    ds_dask = ds.chunk({'time': 4})
+
+    for dset in [ds, ds_dask]:
+        dset.qcfilter.add_less_test('data', 10, test_assessment='Bad')
+        dset.qcfilter.add_greater_test('data', 90, test_assessment='Suspect', use_dask=True)
+        dset.qcfilter.add_test('data', index=[1, 3, -1], test_meaning='Rows', test_assessment='Bad')
+        dset.qcfilter.add_test(
+            'data', index=np.where(data == 55.0), test_meaning='Point', test_assessment='Bad'
+        )
+        dset.qcfilter.unset_test('data', index=[3], test_number=3)
+
+    # QC variable stays a dask array and gives the same answer as numpy
+    assert isinstance(ds_dask['qc_data'].data, da.Array)
+    assert ds_dask['qc_data'].data.chunks == ds_dask['data'].data.chunks
+    np.testing.assert_array_equal(ds_dask['qc_data'].values, ds['qc_data'].values)
+    assert np.sum(ds['qc_data'].values == 0) == 80
+
+    for test_number in range(1, 5):
+        np.testing.assert_array_equal(
+            ds_dask.qcfilter.get_qc_test_mask('data', test_number),
+            ds.qcfilter.get_qc_test_mask('data', test_number),
+        )
+
+    mask = ds_dask.qcfilter.get_qc_test_mask('data', 1, return_dask=True)
+    assert isinstance(mask, da.Array)
+    assert np.sum(mask.compute()) == 10
+
+    nan_data = ds_dask.qcfilter.get_masked_data(
+        'data', rm_assessments='Bad', return_nan_array=True, return_dask=True
+    )
+    assert isinstance(nan_data, da.Array)
+    np.testing.assert_array_equal(
+        nan_data.compute(),
+        ds.qcfilter.get_masked_data('data', rm_assessments='Bad', return_nan_array=True),
+    )
+    masked = ds_dask.qcfilter.get_masked_data('data', rm_tests=[1, 2], return_inverse=True)
+    np.testing.assert_array_equal(
+        masked.mask, ds.qcfilter.get_masked_data('data', rm_tests=[1, 2], return_inverse=True).mask
+    )
+
+    # datafilter keeps the data as a lazy dask array
+    ds_dask.qcfilter.datafilter(rm_assessments='Bad')
+    ds.qcfilter.datafilter(rm_assessments='Bad')
+    assert isinstance(ds_dask['data'].data, da.Array)
+    np.testing.assert_array_equal(ds_dask['data'].values, ds['data'].values)
+    assert np.isnan(ds_dask['data'].values[-1, 0])
+
+
+def test_get_masked_data_combined_tests():
+    ds = xr.Dataset(
+        {'data': ('time', np.arange(100.0), {'units': '1', 'long_name': 'Data'})},
+        coords={'time': pd.date_range('2020-01-01', periods=100, freq='min')},
+    )
+    test_numbers = []
+    for ii, assessment in enumerate(['Bad', 'Suspect', 'Bad', 'Indeterminate']):
+        result = ds.qcfilter.add_test(
+            'data',
+            index=np.arange(ii * 10, ii * 10 + 15),
+            test_meaning=f'Test {ii}',
+            test_assessment=assessment,
+        )
+        test_numbers.append(result['test_number'])
+
+    expected = np.zeros(ds['data'].shape, dtype=bool)
+    for test_number in test_numbers[:3]:
+        expected |= ds.qcfilter.get_qc_test_mask('data', test_number)
+
+    mask = ds.qcfilter.get_masked_data('data', rm_tests=test_numbers[:3], return_mask_only=True)
+    np.testing.assert_array_equal(mask, expected)
+    mask = ds.qcfilter.get_masked_data(
+        'data', rm_assessments=['Bad', 'Suspect'], return_mask_only=True
+    )
+    np.testing.assert_array_equal(mask, expected)
+    assert np.sum(mask) == 35
+    data = ds.qcfilter.get_masked_data(
+        'data', rm_assessments=['Bad', 'Suspect'], return_nan_array=True, return_inverse=True
+    )
+    assert np.all(np.isnan(data[35:])) and not np.any(np.isnan(data[:35]))
+
+    # Flag values use the same single pass
+    flag_qc = np.zeros(100, dtype=np.int32)
+    flag_qc[:5] = 1
+    flag_qc[5:8] = 2
+    flag_qc[8:10] = 3
+    ds['qc_flag'] = (
+        'time',
+        flag_qc,
+        {
+            'flag_values': [1, 2, 3],
+            'flag_meanings': ['one', 'two', 'three'],
+            'flag_assessments': ['Bad', 'Suspect', 'Bad'],
+            'standard_name': 'quality_flag',
+        },
+    )
+    ds['flag_data'] = ('time', np.arange(100.0), {'ancillary_variables': 'qc_flag'})
+    mask = ds.qcfilter.get_masked_data('flag_data', rm_assessments='Bad', return_mask_only=True)
+    assert np.sum(mask) == 7
+    assert np.all(mask[:5]) and np.all(mask[8:10])
+
+
+def test_unpack_bits():
+    data = np.array([0, 1, 6, set_bit(0, 33), -1], dtype=np.int64)
+    bits = unpack_bits(data)
+    assert bits.shape == (5, 64)
+    for ii, value in enumerate(data[:4]):
+        np.testing.assert_array_equal(np.where(bits[ii])[0] + 1, parse_bit(value))
+    assert np.all(bits[4])
+
+    bits = unpack_bits(np.array([[1, 4], [2, 7]], dtype='>i2'), num_bits=3)
+    assert bits.shape == (2, 2, 3)
+    np.testing.assert_array_equal(bits[1, 1], [True, True, True])
+    np.testing.assert_array_equal(bits[0, 1], [False, False, True])
+
+    with np.testing.assert_raises(ValueError):
+        unpack_bits(np.array([1], dtype=np.uint8), num_bits=9)
+
+
+def test_get_qc_test_statistics():
+    time = pd.date_range('2020-01-01', periods=240, freq='min')
+    ds = xr.Dataset(
+        {
+            'data': ('time', np.arange(240.0), {'units': '1', 'long_name': 'Data'}),
+            'data_2d': (('time', 'height'), np.ones((240, 3)), {'units': '1'}),
+        },
+        coords={'time': time},
+    )
+    ds.qcfilter.add_less_test('data', 30.0, test_assessment='Bad')
+    ds.qcfilter.add_greater_test('data', 179.0, test_assessment='Suspect')
+    ds.qcfilter.add_test('data_2d', index=np.arange(50, 70), test_meaning='Rows')
+    ds = ds.chunk({'time': 50})
+
+    stats = ds.qcfilter.get_qc_test_statistics(freq='1h', chunk_size=40)
+    assert list(stats.columns) == [
+        'variable',
+        'qc_variable',
+        'test_number',
+        'test_meaning',
+        'test_assessment',
+        'time',
+        'failed',
+        'total',
+        'fraction',
+    ]
+    assert len(stats) == 12
+    data_stats = stats[stats['variable'] == 'data']
+    np.testing.assert_array_equal(data_stats['test_number'], [1, 2] * 4)
+    np.testing.assert_array_equal(data_stats['failed'], [30, 0, 0, 0, 0, 0, 0, 60])
+    np.testing.assert_array_equal(data_stats['total'], [60] * 8)
+    np.testing.assert_allclose(data_stats['fraction'].values[0], 0.5)
+    assert data_stats['time'].values[2] == np.datetime64('2020-01-01T01:00')
+
+    stats_2d = stats[stats['variable'] == 'data_2d']
+    np.testing.assert_array_equal(stats_2d['failed'], [30, 30, 0, 0])
+    np.testing.assert_array_equal(stats_2d['total'], [180] * 4)
+
+    # Whole dataset totals match the binned totals
+    stats = ds.qcfilter.get_qc_test_statistics(variables='data')
+    assert 'time' not in stats.columns
+    np.testing.assert_array_equal(stats['failed'], [30, 60])
+    np.testing.assert_array_equal(stats['total'], [240, 240])
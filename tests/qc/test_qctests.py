@@ -505,3 +505,91 @@ def test_add_step_change_test():
     assert np.all(np.where(index)[0] == [419, 420])
 
     del ds
+
+
+def test_step_change_cusum(monkeypatch):
+    import xarray as xr
+
+    from act.qc import qctests
+
+    # Reference loop matching the original test with float64 accumulators
+    cusum_loop = getattr(qctests._cusum_loop, 'py_func', qctests._cusum_loop)
+    rng = np.random.default_rng(0)
+    data = np.cumsum(rng.normal(size=(500, 4)), axis=0)
+    data[200:, 1] += 8.0
+    data[rng.random(data.shape) < 0.05] = np.nan
+    data[:, 3] = np.nan
+    expected = cusum_loop(data, np.nanmean(data[:, :3], axis=0).tolist() + [np.nan], 1.5)
+
+    monkeypatch.setattr(qctests, 'NUMBA_AVAILABLE', False)
+    np.testing.assert_allclose(qctests._cusum(data, 1.5), expected, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(qctests._cusum(data[:, 1], 1.5), expected[:, 1], rtol=0, atol=1e-9)
+
+    starts = np.zeros(10, dtype=bool)
+    starts[[2, 3, 8]] = True
+    assert np.all(np.where(qctests._dilate_flags(starts, 2))[0] == [2, 3, 4, 8, 9])
+    assert np.all(np.where(qctests._dilate_flags(starts, 10))[0] == np.arange(2, 10))
+    assert not np.any(qctests._dilate_flags(starts, 0))
+
+    # Each height of 2D data is tested the same as 1D data
+    time = np.arange('2020-01-01', '2020-01-02', dtype='datetime64[m]')
+    data = np.sin(np.arange(time.size) / 200.0)[:, None] * np.ones((1, 3))
+    data[300:, 0] += 5
+    data[900:, 2] -= 10
+    ds = xr.Dataset(
+        {'temp': (('time', 'height'), data), 'temp_1d': ('time', data[:, 2])},
+        coords={'time': time, 'height': [10.0, 20.0, 30.0]},
+    )
+    ds.qcfilter.add_step_change_test('temp', n_flagged=3)
+    ds.qcfilter.add_step_change_test('temp_1d', n_flagged=3)
+    index = ds.qcfilter.get_qc_test_mask(var_name='temp', test_number=1)
+    assert np.all(np.where(index[:, 0])[0] == [299, 300, 301])
+    assert not np.any(index[:, 1])
+    assert np.all(np.where(index[:, 2])[0] == [899, 900, 901])
+    np.testing.assert_array_equal(
+        index[:, 2], ds.qcfilter.get_qc_test_mask(var_name='temp_1d', test_number=1)
+    )
+
+
+def test_apply_tests():
+    ds_1 = read_arm_netcdf(EXAMPLE_MET1)
+    ds_1.clean.cleanup()
+    ds_2 = ds_1.copy(deep=True)
+    tests = {
+        'temp_mean': [
+            {'test': 'missing_value'},
+            {'test': 'less', 'limit_value': -0.5},
+            {'test': 'greater', 'limit_value': 0.5, 'test_assessment': 'Suspect'},
+            {'test': 'greater_equal', 'limit_value': None},
+            {'test': 'outside', 'limit_value_lower': -1, 'limit_value_upper': 1},
+        ],
+        'rh_mean': [
+            {'test': 'less_equal', 'limit_value': 75, 'prepend_text': 'arm'},
+            {'test': 'inside', 'limit_value_lower': 80, 'limit_value_upper': 85, 'test_number': 6},
+            {'test': 'not_equal_to', 'limit_value': 80, 'test_assessment': 'Indeterminate'},
+            {'test': 'equal_to', 'limit_value': 90.0, 'limit_attr_name': 'special_value'},
+        ],
+    }
+
+    expected = {}
+    for var_name, var_tests in tests.items():
+        expected[var_name] = []
+        for test in var_tests:
+            kwargs = {key: value for key, value in test.items() if key != 'test'}
+            method = getattr(ds_1.qcfilter, f'add_{test["test"]}_test')
+            expected[var_name].append(method(var_name, **kwargs))
+
+    results = ds_2.qcfilter.apply_tests(tests)
+    assert results == expected
+    assert results['temp_mean'][3] is None
+    assert results['rh_mean'][1]['test_number'] == 6
+    for var_name in ['temp_mean', 'qc_temp_mean', 'rh_mean', 'qc_rh_mean']:
+        np.testing.assert_array_equal(ds_1[var_name].values, ds_2[var_name].values)
+        assert ds_1[var_name].dtype == ds_2[var_name].dtype
+        assert ds_1[var_name].attrs.keys() == ds_2[var_name].attrs.keys()
+        for attr_name, value in ds_1[var_name].attrs.items():
+            np.testing.assert_array_equal(value, ds_2[var_name].attrs[attr_name])
+
+    ds_3 = ds_1.copy(deep=True)
+    with np.testing.assert_raises(ValueError):
+        ds_3.qcfilter.apply_tests({'temp_mean': [{'test': 'birds'}]})
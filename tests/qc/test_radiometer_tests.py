@@ -1,7 +1,11 @@
 import numpy as np
 
 from act.io.arm import read_arm_netcdf
-from act.qc.radiometer_tests import fft_shading_test
+from act.qc.radiometer_tests import (
+    _fft_shading_windows,
+    fft_shading_test,
+    fft_shading_test_process,
+)
 from act.tests import EXAMPLE_MFRSR
 
 
@@ -11,3 +15,24 @@ def test_fft_shading_test():
     ds = fft_shading_test(ds)
     qc_data = ds['qc_diffuse_hemisp_narrowband_filter4']
     assert np.nansum(qc_data.values) == 7164
+
+
+def test_fft_shading_windows():
+    ds = read_arm_netcdf(EXAMPLE_MFRSR)
+    data = ds['diffuse_hemisp_narrowband_filter4'].values
+    windows = np.lib.stride_tricks.sliding_window_view(data, 60)[::7]
+    windows = windows[np.all(np.isfinite(windows) & (windows != -9999.0), axis=1)]
+    kwargs = {
+        'shad_freq_lower': [0.008, 0.017],
+        'shad_freq_upper': [0.0105, 0.0195],
+        'ratio_thresh': [3.15, 1.2],
+        'time_interval': 20.0,
+    }
+
+    shading, fft, freq = _fft_shading_windows(windows, **kwargs)
+    for ii, window in enumerate(windows):
+        result = fft_shading_test_process(None, window, is_sunny=True, **kwargs)
+        assert shading[ii] == result['shading']
+        np.testing.assert_array_equal(fft[ii], result['fft'])
+        np.testing.assert_array_equal(freq[ii], result['freq'])
+    ds.close()
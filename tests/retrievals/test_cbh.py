@@ -1,3 +1,5 @@
+import numpy as np
+
 import act
 
 
@@ -17,3 +19,37 @@ def test_generic_sobel_cbh():
     assert cbh[500] == 615.0
     assert cbh[1000] == 555.0
     ceil.close()
+
+
+def test_generic_sobel_cbh_layers_and_dask():
+    ceil = act.io.arm.read_arm_netcdf(act.tests.sample_files.EXAMPLE_CEIL1)
+    ceil = ceil.resample(time='1min').nearest()
+    kwargs = {
+        'variable': 'backscatter',
+        'height_dim': 'range',
+        'var_thresh': 1000.0,
+        'fill_na': 0.0,
+        'edge_thresh': 5,
+    }
+    cbh = act.retrievals.cbh.generic_sobel_cbh(ceil.copy(), **kwargs)['cbh_sobel_backscatter']
+
+    # Chunked dask data gives the same answer as in memory data
+    dask_ds = ceil.copy().chunk({'time': 100})
+    dask_cbh = act.retrievals.cbh.generic_sobel_cbh(dask_ds, **kwargs)['cbh_sobel_backscatter']
+    np.testing.assert_array_equal(dask_cbh.values, cbh.values)
+
+    # Multiple layers with the first layer matching the single layer result
+    layer_ds = act.retrievals.cbh.generic_sobel_cbh(ceil.copy(), num_layers=3, **kwargs)
+    layers = layer_ds['cbh_sobel_backscatter'].values
+    assert layers.shape == (cbh.size, 3)
+    np.testing.assert_array_equal(layers[:, 0], cbh.values)
+    assert np.all(np.isnan(layers[:, 1]) | (layers[:, 1] > layers[:, 0]))
+
+    # Time varying heights give the same answer as the 1D height
+    height = np.tile(ceil['range'].values, (ceil['time'].size, 1))
+    ceil['range_2d'] = (('time', 'range'), height, {'units': 'm'})
+    height_ds = act.retrievals.cbh.generic_sobel_cbh(
+        ceil.copy(), **{**kwargs, 'height_dim': 'range_2d'}
+    )
+    np.testing.assert_array_equal(height_ds['cbh_sobel_backscatter'].values, cbh.values)
+    ceil.close()
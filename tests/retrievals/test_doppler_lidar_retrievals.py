@@ -21,3 +21,30 @@ def test_doppler_lidar_winds():
     assert np.round(np.nansum(result['wind_speed'].values)).astype(int) == 2854
     assert np.round(np.nansum(result['wind_direction'].values)).astype(int) == 64986
     dl_ds.close()
+
+
+def test_solve_ppi_winds():
+    # Two synthetic PPI scans with known winds and three range gates
+    azimuth = np.radians(np.tile(np.arange(0, 360, 15), (2, 1)))
+    elevation = np.full(azimuth.shape, np.radians(60.0))
+    u_wind, v_wind, w_wind = 3.0, -4.0, 0.5
+    radial = (
+        np.sin(azimuth) * np.cos(elevation) * u_wind
+        + np.cos(azimuth) * np.cos(elevation) * v_wind
+        + np.sin(elevation) * w_wind
+    )
+    doppler = np.repeat(radial[:, :, np.newaxis], 3, axis=2)
+    snr = np.ones(doppler.shape)
+    # Too few good samples at the last range gate of the second scan
+    snr[1, 3:, 2] = 0.0
+
+    winds = act.retrievals.doppler_lidar.solve_ppi_winds(elevation, azimuth, snr, doppler)
+    assert winds['wind_speed'].shape == (2, 3)
+    np.testing.assert_allclose(winds['wind_speed'][0], 5.0)
+    wdir = np.degrees(np.arctan2(u_wind, v_wind) + np.pi)
+    np.testing.assert_allclose(winds['wind_direction'][0], wdir)
+    np.testing.assert_allclose(winds['residual'][0], 0.0, atol=1e-10)
+    np.testing.assert_allclose(winds['correlation'][0], 1.0)
+    assert np.isfinite(winds['wind_speed'][1, :2]).all()
+    assert np.isnan(winds['wind_speed'][1, 2])
+    assert np.isnan(winds['correlation'][1, 2])
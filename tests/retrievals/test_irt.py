@@ -1,4 +1,5 @@
 import numpy as np
+from scipy.optimize import brentq
 
 import act
 
@@ -10,3 +11,35 @@ def test_sst():
     np.testing.assert_almost_equal(ds['sea_surface_temperature'].values[-1], 279.291, decimal=3)
     assert np.round(np.nansum(ds['sea_surface_temperature'].values)).astype(int) == 6699
     ds.close()
+
+
+def test_invert_irt_radiance():
+    temperature = np.array([180.0, 230.25, 278.9, 301.123, np.nan])
+    for units in ['cm', 'm']:
+        radiance = act.retrievals.irt_band_radiance(temperature, units=units)
+        assert radiance.shape == temperature.shape
+        np.testing.assert_allclose(
+            radiance[2], act.retrievals.sum_function_irt(temperature[2], 0, units=units)
+        )
+        result = act.retrievals.invert_irt_radiance(radiance, units=units)
+        np.testing.assert_allclose(result, temperature, atol=0.1, equal_nan=True)
+
+        # Same steps as the scalar root find
+        expected = [
+            brentq(act.retrievals.sum_function_irt, 150.0, 350.0, args=(rad, units), xtol=0.1)
+            for rad in radiance[:-1]
+        ]
+        np.testing.assert_array_equal(result[:-1], expected)
+
+    # Radiances outside of the temperature range are set to NaN
+    radiance = act.retrievals.irt_band_radiance([240.0, 280.0])
+    result = act.retrievals.invert_irt_radiance(radiance, temp_low=250.0, temp_high=350.0)
+    assert np.isnan(result[0])
+    np.testing.assert_allclose(result[1], 280.0, atol=0.1)
+
+    sst = act.retrievals.irt.sst_from_radiance(np.array([280.0, np.nan]), np.array([240.0, 240.0]))
+    assert np.isnan(sst[1])
+    assert sst[0] > 280.0
+    np.testing.assert_allclose(
+        act.retrievals.irt.process_sst_data(280.0, 240.0, 0.986, 500, 250.0, 350.0, 0.1), sst[0]
+    )
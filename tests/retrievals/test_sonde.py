@@ -1,4 +1,5 @@
 import numpy as np
+import xarray as xr
 
 import act
 
@@ -62,6 +63,54 @@ def test_calculate_precipitable_water():
     sonde_ds.close()
 
 
+def test_precipitable_water_from_profiles():
+    sonde_ds = act.io.arm.read_arm_netcdf(act.tests.sample_files.EXAMPLE_SONDE1)
+    temp = sonde_ds['tdry'].values[:-1]
+    rh = sonde_ds['rh'].values[:-1]
+    pres = sonde_ds['pres'].values[:-1]
+    sonde_ds.close()
+
+    pwv = act.retrievals.precipitable_water_from_profiles(temp, rh, pres)
+    np.testing.assert_almost_equal(pwv, 0.8028, decimal=3)
+
+    # Stack of soundings padded with NaN to a common length
+    num = temp.size // 2
+    stack = np.full((3, temp.size), np.nan)
+    temp_stack, rh_stack, pres_stack = stack.copy(), stack.copy(), stack.copy()
+    for ii, size in enumerate([temp.size, num, 0]):
+        temp_stack[ii, :size] = temp[:size]
+        rh_stack[ii, :size] = rh[:size]
+        pres_stack[ii, :size] = pres[:size]
+
+    pwv = act.retrievals.precipitable_water_from_profiles(
+        temp_stack, rh_stack, pres_stack, skipna=True
+    )
+    assert pwv.shape == (3,)
+    np.testing.assert_almost_equal(pwv[0], 0.8028, decimal=3)
+    np.testing.assert_almost_equal(
+        pwv[1], act.retrievals.precipitable_water_from_profiles(temp[:num], rh[:num], pres[:num])
+    )
+    assert np.isnan(pwv[2])
+
+    pwv = act.retrievals.precipitable_water_from_profiles(
+        temp_stack.T, rh_stack.T, pres_stack.T, axis=0, skipna=True
+    )
+    np.testing.assert_almost_equal(pwv[0], 0.8028, decimal=3)
+
+    # A missing level makes the result missing unless skipna is set
+    temp_missing = temp.copy()
+    temp_missing[10] = np.nan
+    assert np.isnan(act.retrievals.precipitable_water_from_profiles(temp_missing, rh, pres))
+    pwv = act.retrievals.precipitable_water_from_profiles(temp_missing, rh, pres, skipna=True)
+    assert 0.0 < pwv < 0.8028
+    pwv = act.retrievals.precipitable_water_from_profiles(temp_stack, rh_stack, pres_stack)
+    np.testing.assert_almost_equal(pwv[0], 0.8028, decimal=3)
+    assert np.isnan(pwv[1:]).all()
+
+    sat_vap_pres = act.retrievals.arden_buck_saturation_vapor_pressure(np.array([-10.0, 0.0, 20.0]))
+    np.testing.assert_allclose(sat_vap_pres, [0.25995, 0.61121, 2.33834], rtol=1e-4)
+
+
 def test_calculate_pbl_liu_liang():
     files = act.tests.sample_files.EXAMPLE_TWP_SONDE_20060121.copy()
     files2 = act.tests.sample_files.EXAMPLE_SONDE1
@@ -132,3 +181,92 @@ def test_calculate_heffter_pbl():
     np.testing.assert_almost_equal(ds['potential_temperature_ss'].values[4], 298.4, 1)
     assert np.sum(ds['bottom_inversion'].values) == 7426
     assert np.sum(ds['top_inversion'].values) == 7903
+
+
+def test_calculate_sonde_batch():
+    files = act.tests.sample_files.EXAMPLE_TWP_SONDE_20060121.copy()
+    files.sort()
+
+    sondes = []
+    for file in files[:3]:
+        ds = act.io.arm.read_arm_netcdf(file)
+        ds['tdry'].attrs['units'] = 'degree_Celsius'
+        sondes.append(ds)
+
+    # Make one launch fail Liu-Liang preprocessing
+    sondes[2] = sondes[2].where(sondes[2]['alt'].load() < 1000.0, drop=True)
+
+    batch_ds = act.retrievals.calculate_sonde_batch(
+        sondes,
+        retrievals=('liu_liang', 'heffter'),
+        retrieval_kwargs={'liu_liang': {'smooth_height': 10}},
+        max_workers=2,
+    )
+    assert batch_ds['time'].size == 3
+    assert np.all(np.diff(batch_ds['time'].values) > np.timedelta64(0, 's'))
+    np.testing.assert_array_almost_equal(
+        batch_ds['pblht_liu_liang'].values[:2], [1038.4, 1079.0], decimal=1
+    )
+    assert list(batch_ds['pblht_regime_liu_liang'].values) == ['NRL', 'NRL', '']
+    assert batch_ds['pblht_liu_liang'].attrs['units'] == 'm'
+    assert np.isnan(batch_ds['pblht_liu_liang'].values[2])
+    assert np.isnan(batch_ds['pblht_heffter'].values[2])
+    assert batch_ds['retrieval_error'].values[0] == ''
+    assert 'liu_liang' in batch_ds['retrieval_error'].values[2]
+
+    # Concatenated launches are split on time gaps
+    serial_ds = act.retrievals.calculate_sonde_batch(
+        xr.concat(sondes[:2], dim='time'), retrievals=('heffter',)
+    )
+    assert serial_ds['time'].size == 2
+    np.testing.assert_array_equal(
+        serial_ds['pblht_heffter'].values, batch_ds['pblht_heffter'].values[:2]
+    )
+
+    # Launches that can not be read or are empty are recorded with a missing time
+    error_ds = act.retrievals.calculate_sonde_batch(
+        [sondes[0], './randomfile.cdf', sondes[1].isel(time=slice(0, 0))],
+        retrievals=('heffter',),
+    )
+    assert error_ds['time'].size == 3
+    assert np.isnat(error_ds['time'].values[1:]).all()
+    assert np.isnan(error_ds['pblht_heffter'].values[1:]).all()
+    assert error_ds['retrieval_error'].values[0] == ''
+    assert error_ds['retrieval_error'].values[2] == 'read: No data in launch'
+
+    with np.testing.assert_raises(ValueError):
+        act.retrievals.calculate_sonde_batch(sondes, retrievals=('bogus',))
+
+    for ds in sondes:
+        ds.close()
+
+
+def test_calculate_sonde_batch_synthetic():
+    rng = np.random.default_rng(0)
+    alt = np.linspace(10.0, 10000.0, 1000)
+    sondes = []
+    for ii in range(12):
+        start = np.datetime64('2022-01-01T00:00') + np.timedelta64(6 * ii, 'h')
+        tdry = 25.0 - 6.5e-3 * alt + rng.normal(0, 0.2, alt.size)
+        sondes.append(
+            xr.Dataset(
+                {
+                    'alt': ('time', alt, {'units': 'm'}),
+                    'pres': ('time', 1013.25 * np.exp(-alt / 8000.0), {'units': 'hPa'}),
+                    'tdry': ('time', tdry, {'units': 'degree_Celsius'}),
+                    'wspd': ('time', 2.0 + alt / 1000.0, {'units': 'm/s'}),
+                },
+                coords={'time': start + np.arange(alt.size).astype('timedelta64[s]')},
+            )
+        )
+
+    serial_ds = act.retrievals.calculate_sonde_batch(sondes, retrievals=('liu_liang', 'heffter'))
+    assert serial_ds['time'].size == 12
+    assert np.all(serial_ds['retrieval_error'].values == '')
+    assert np.all(np.isfinite(serial_ds['pblht_heffter'].values))
+
+    # The process pool returns the same results as the serial loop
+    batch_ds = act.retrievals.calculate_sonde_batch(
+        sondes, retrievals=('liu_liang', 'heffter'), max_workers=4
+    )
+    xr.testing.assert_identical(batch_ds, serial_ds)
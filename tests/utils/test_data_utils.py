@@ -1,6 +1,7 @@
 import importlib
 
 import numpy as np
+import pint
 import pytest
 import xarray as xr
 from numpy.testing import assert_almost_equal
@@ -162,6 +163,45 @@ def test_convert_units():
     del ds
 
 
+def test_convert_units_conversion_plan():
+    data = np.array([-40.0, 0.0, 100.0], dtype=np.float32)
+    result = act.utils.data_utils.convert_units(data, 'degC', 'degF')
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, [-40.0, 32.0, 212.0])
+    np.testing.assert_array_equal(data, [-40.0, 0.0, 100.0])
+
+    data = np.array([1, 20, 300], dtype=np.int32)
+    result = act.utils.data_utils.convert_units(data, 'm', 'cm')
+    assert result.dtype == np.int32
+    np.testing.assert_array_equal(result, [100, 2000, 30000])
+
+    plan = act.utils.data_utils._get_conversion_plan('degC', 'K')
+    assert plan == (1.0, 273.15)
+    assert act.utils.data_utils._get_unit_registry() is act.utils.data_utils._get_unit_registry()
+
+    # Failed conversions raise a new exception each time
+    errors = []
+    for _ in range(2):
+        with np.testing.assert_raises(pint.errors.DimensionalityError) as context:
+            act.utils.data_utils.convert_units(data, 'm', 'degC')
+        errors.append(context.exception)
+    assert errors[0] is not errors[1]
+    assert str(errors[0]) == str(errors[1])
+    with np.testing.assert_raises(pint.errors.UndefinedUnitError):
+        act.utils.data_utils.convert_units(data, 'm', 'not_a_real_unit_string')
+
+    ds = xr.Dataset(
+        {
+            f'temp_{ii}': ('time', np.arange(10, dtype=np.float64), {'units': 'degC'})
+            for ii in range(20)
+        }
+    )
+    ds.utils.change_units(desired_unit='K')
+    for var_name in ds.data_vars:
+        assert ds[var_name].attrs['units'] == 'K'
+        np.testing.assert_allclose(ds[var_name].values, np.arange(10) + 273.15)
+
+
 def test_ts_weighted_average():
     ds = act.io.arm.read_arm_netcdf(act.tests.sample_files.EXAMPLE_MET_WILDCARD)
     cf_ds = {
@@ -605,3 +645,63 @@ def test_convert_2d_to_1d():
     # Check the results
     assert 'var' in result
     np.testing.assert_array_equal(result['var'].values, [1, 3, 5])
+
+
+def test_rolling_mean_std():
+    import warnings
+
+    import dask.array as da
+    import pandas as pd
+
+    from act.utils.data_utils import rolling_mean_std
+
+    rng = np.random.default_rng(0)
+    data = 1.0e5 + rng.normal(scale=0.01, size=1000)
+    data[100:150] = 1.0e5
+    data[[3, 400, 401, 402, 999]] = np.nan
+
+    def window_std(data, window, center, min_periods, ddof=0):
+        shift = (window - 1) // 2 if center else 0
+        padded = np.pad(data, (window - 1 - shift, shift), constant_values=np.nan)
+        windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            std = np.nanstd(windows, axis=1, ddof=ddof)
+        std[np.isfinite(windows).sum(axis=1) < min_periods] = np.nan
+        return std
+
+    for window in [1, 10, 25]:
+        for center in [False, True]:
+            for min_periods in [1, window]:
+                mean, std = rolling_mean_std(data, window, center=center, min_periods=min_periods)
+                rolling = pd.Series(data).rolling(window, center=center, min_periods=min_periods)
+                np.testing.assert_allclose(mean, rolling.mean().values, rtol=1e-12)
+
+                # pandas accumulates rounding error in the rolling variance with a
+                # large offset so compare the standard deviation to each window directly.
+                expected = window_std(data, window, center, min_periods)
+                np.testing.assert_allclose(std, expected, atol=1e-12)
+
+    # Constant data gives a standard deviation of exactly zero
+    _, std = rolling_mean_std(data, 10, center=True, min_periods=1)
+    assert np.all(std[105:145] == 0.0)
+
+    # Multi-dimensional data along any axis and dask arrays with overlapping chunks
+    data_2d = np.stack([data, data[::-1]], axis=1)
+    mean, std = rolling_mean_std(data_2d, 10, axis=0, center=True, min_periods=2, ddof=1)
+    mean_t, std_t = rolling_mean_std(data_2d.T, 10, axis=-1, center=True, min_periods=2, ddof=1)
+    np.testing.assert_array_equal(mean, mean_t.T)
+    np.testing.assert_array_equal(std, std_t.T)
+    np.testing.assert_allclose(
+        std[:, 1], window_std(data[::-1], 10, True, min_periods=2, ddof=1), atol=1e-12
+    )
+
+    dask_mean, dask_std = rolling_mean_std(
+        da.from_array(data_2d, chunks=(64, 1)), 10, center=True, min_periods=2, ddof=1
+    )
+    assert isinstance(dask_std, da.Array)
+    np.testing.assert_allclose(dask_mean.compute(), mean, rtol=1e-12)
+    np.testing.assert_allclose(dask_std.compute(), std, atol=1e-9)
+
+    with pytest.raises(ValueError):
+        rolling_mean_std(data, 0)
@@ -53,6 +53,38 @@ def test_reduce_time_ranges():
     assert len(result) == 2
 
 
+def test_time_ranges_to_mask():
+    time_ranges = np.array(
+        [
+            ['2020-01-01T03:00', '2020-01-01T05:00'],
+            ['2020-01-01T02:00', '2020-01-01T04:00'],
+            ['2020-01-01T08:00', '2020-01-01T08:00'],
+            ['2020-01-01T10:00', 'NaT'],
+            ['2020-01-01T12:00', '2020-01-01T11:00'],
+        ],
+        dtype='datetime64[m]',
+    )
+    result = act.utils.merge_time_ranges(time_ranges)
+    assert result.shape == (2, 2)
+    assert result[0, 0] == np.datetime64('2020-01-01T02:00')
+    assert result[0, 1] == np.datetime64('2020-01-01T05:00')
+
+    time = np.arange('2020-01-01', '2020-01-02', dtype='datetime64[h]')
+    mask = act.utils.time_ranges_to_mask(time, time_ranges)
+    assert np.all(np.flatnonzero(mask) == [2, 3, 4, 5, 8])
+
+    # Unsorted times with a finer resolution than the time ranges
+    rng = np.random.default_rng(0)
+    time = rng.permutation(np.arange('2020-01-01', '2020-01-02', dtype='datetime64[s]'))
+    mask = act.utils.time_ranges_to_mask(time, time_ranges)
+    expected = np.zeros(time.size, dtype=bool)
+    for start, end in time_ranges[:3]:
+        expected |= (time >= start) & (time <= end)
+    assert np.array_equal(mask, expected)
+
+    assert not np.any(act.utils.time_ranges_to_mask(time, []))
+
+
 def test_date_parser():
     datestring = '20111001'
     output_format = '%Y/%m/%d'
@@ -64,6 +64,38 @@ def test_solar_azimuth_elevation():
     assert np.isclose(np.nanmean(azimuth), 232.0655, atol=0.001)
     assert np.isclose(np.nanmean(distance), 0.985, atol=0.001)
 
+    # Cached results are copies
+    elevation[:] = 0.0
+    elevation, _, _ = act.utils.geo_utils.get_solar_azimuth_elevation(
+        latitude=ds['lat'].values[0],
+        longitude=ds['lon'].values[0],
+        time=ds['time'].values,
+    )
+    assert np.isclose(np.nanmean(elevation), 10.5648, atol=0.001)
+
+    # Analytic backend agrees with skyfield
+    for temperature, pressure in [('standard', 'standard'), (None, None)]:
+        sf_result = act.utils.geo_utils.get_solar_azimuth_elevation(
+            latitude=ds['lat'].values[0],
+            longitude=ds['lon'].values[0],
+            time=ds['time'].values,
+            library='skyfield',
+            temperature_C=temperature,
+            pressure_mbar=pressure,
+        )
+        noaa_result = act.utils.geo_utils.get_solar_azimuth_elevation(
+            latitude=ds['lat'].values[0],
+            longitude=ds['lon'].values[0],
+            time=ds['time'].values,
+            library='noaa',
+            temperature_C=temperature,
+            pressure_mbar=pressure,
+        )
+        np.testing.assert_allclose(noaa_result[0], sf_result[0], atol=0.02)
+        np.testing.assert_allclose(noaa_result[1], sf_result[1], atol=0.02)
+        np.testing.assert_allclose(noaa_result[2], sf_result[2], atol=1e-4)
+    ds.close()
+
 
 def test_get_sunrise_sunset_noon():
     ds = act.io.arm.read_arm_netcdf(act.tests.EXAMPLE_NAV)
@@ -177,3 +209,19 @@ def test_is_sun_visible():
         date_time=datetime(2019, 11, 25, 13, 30, 00),
     )
     assert result == [True]
+
+    for dawn_dusk in [False, True]:
+        result = act.utils.geo_utils.is_sun_visible(
+            latitude=ds['lat'].values,
+            longitude=ds['lon'].values,
+            date_time=ds['time'].values,
+            dawn_dusk=dawn_dusk,
+        )
+        noaa_result = act.utils.geo_utils.is_sun_visible(
+            latitude=ds['lat'].values,
+            longitude=ds['lon'].values,
+            date_time=ds['time'].values,
+            dawn_dusk=dawn_dusk,
+            library='noaa',
+        )
+        np.testing.assert_array_equal(noaa_result, result)